@@ -1,13 +1,134 @@
 # /config/custom_components/molad_yiddish/__init__.py
 """Molad Yiddish integration."""
+import asyncio
+from datetime import date
+import hashlib
+import os
+
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .binary_sensor import async_holiday_selection, async_update_holiday_selection
+from .const import (
+    CONF_HOLIDAY_SENSORS,
+    CONF_KIDDUSH_LEVANA_DAYS,
+    CONF_PERFORMANCE_PROFILE,
+    DATA_MODEL,
+    DATA_REFRESH,
+    DATA_TEMPLATES,
+    DATA_YAHRZEITS,
+    DOMAIN,
+    SIGNAL_OPTIONS_UPDATED,
+)
+from .molad_lib.ical import export_ical
+from .molad_lib.kiddush_levana import DEFAULT_MINHAG_DAYS
+from .molad_lib.learning import CYCLES, learning_schedule
+from .molad_lib.options import Options
+from .molad_lib.profiles import DEFAULT_PROFILE
+from .molad_lib.yahrzeit import KINDS, YAHRZEIT, Anniversary
+from .molad_lib.zmanim import zmanim_for_days
+from .templates import async_setup_templates
+from .yahrzeit_sensor import YahrzeitTracker, occurrence_dict
+from .zmanim_sensor import location_from_hass
 
 PLATFORMS = [Platform.SENSOR, Platform.BINARY_SENSOR]
 
+SERVICE_GET_ZMANIM = "get_zmanim"
+GET_ZMANIM_SCHEMA = vol.Schema(
+    {
+        vol.Optional("date"): cv.date,
+        vol.Optional("days", default=7): vol.All(vol.Coerce(int), vol.Range(min=1, max=31)),
+        vol.Optional("entry_id"): cv.string,
+    }
+)
+
+SERVICE_EXPORT_ICAL = "export_ical"
+EXPORT_ICAL_SCHEMA = vol.Schema(
+    {
+        vol.Optional("path"): cv.string,
+        vol.Optional("start_year"): vol.All(vol.Coerce(int), vol.Range(min=1900, max=2200)),
+        vol.Optional("years", default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=30)),
+        vol.Optional("entry_id"): cv.string,
+    }
+)
+
+SERVICE_ADD_YAHRZEIT = "add_yahrzeit"
+ADD_YAHRZEIT_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required("name"): cv.string,
+            vol.Optional("kind", default=YAHRZEIT): vol.In(KINDS),
+            vol.Optional("date"): cv.date,
+            vol.Optional("after_sunset", default=False): cv.boolean,
+            vol.Optional("hebrew_year"): vol.All(vol.Coerce(int), vol.Range(min=3761)),
+            vol.Optional("hebrew_month"): vol.All(vol.Coerce(int), vol.Range(min=1, max=13)),
+            vol.Optional("hebrew_day"): vol.All(vol.Coerce(int), vol.Range(min=1, max=30)),
+        }
+    ),
+    cv.has_at_least_one_key("date", "hebrew_year"),
+)
+
+SERVICE_REMOVE_YAHRZEIT = "remove_yahrzeit"
+REMOVE_YAHRZEIT_SCHEMA = vol.Schema({vol.Required("name"): cv.string})
+
+SERVICE_NEXT_YAHRZEIT = "next_yahrzeit"
+NEXT_YAHRZEIT_SCHEMA = vol.Schema(
+    {
+        vol.Optional("date"): cv.date,
+        vol.Optional("count", default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+    }
+)
+
+SERVICE_LEARNING_SCHEDULE = "learning_schedule"
+LEARNING_SCHEDULE_SCHEMA = vol.Schema(
+    {
+        vol.Required("cycle"): vol.In(CYCLES),
+        vol.Optional("date"): cv.date,
+        vol.Optional("days", default=7): vol.All(vol.Coerce(int), vol.Range(min=1, max=400)),
+    }
+)
+
+# Options applied to the running entities; any other change reloads the entry
+LIVE_OPTIONS = ("strip_nikud", "candlelighting_offset", "havdalah_offset")
+
+SERVICES = (
+    SERVICE_GET_ZMANIM,
+    SERVICE_EXPORT_ICAL,
+    SERVICE_ADD_YAHRZEIT,
+    SERVICE_REMOVE_YAHRZEIT,
+    SERVICE_NEXT_YAHRZEIT,
+    SERVICE_LEARNING_SCHEDULE,
+)
+
+
+def _entry_opts(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """The entry's options, with defaults filled in."""
+    return {
+        "strip_nikud": entry.options.get("strip_nikud", False),
+        "candlelighting_offset": entry.options.get("candlelighting_offset", 15),
+        "havdalah_offset": entry.options.get("havdalah_offset", 72),
+        CONF_PERFORMANCE_PROFILE: entry.options.get(
+            CONF_PERFORMANCE_PROFILE, DEFAULT_PROFILE
+        ),
+        CONF_KIDDUSH_LEVANA_DAYS: entry.options.get(
+            CONF_KIDDUSH_LEVANA_DAYS, DEFAULT_MINHAG_DAYS
+        ),
+        # as the options form shows it, so saving the form unchanged is no change
+        CONF_HOLIDAY_SENSORS: async_holiday_selection(hass, entry),
+    }
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Molad Yiddish from a config entry."""
@@ -16,30 +137,214 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # Store user options in hass.data for sensor use
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = {
-        "strip_nikud": entry.options.get("strip_nikud", False),
-        "candlelighting_offset": entry.options.get("candlelighting_offset", 15),
-        "havdalah_offset": entry.options.get("havdalah_offset", 72),
-    }
+    hass.data[DOMAIN][entry.entry_id] = _entry_opts(hass, entry)
+
+    # Anniversaries are shared by all entries, loaded once
+    if DATA_YAHRZEITS not in hass.data:
+        tracker = YahrzeitTracker(hass)
+        await tracker.async_load()
+        hass.data[DATA_YAHRZEITS] = tracker
+
+    if not hass.services.has_service(DOMAIN, SERVICE_GET_ZMANIM):
+        _async_register_services(hass)
+
+    # hebrew_date() / parsha() / ... in templates, shared by all entries
+    if DATA_TEMPLATES not in hass.data:
+        hass.data[DATA_TEMPLATES] = async_setup_templates(hass)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
 
+def _service_opts(hass: HomeAssistant, call: ServiceCall) -> dict:
+    """The options of the entry a service call is for.
+
+    entry_id picks the entry; it may be left out only while one is loaded.
+    """
+    entries = hass.data[DOMAIN]
+    entry_id = call.data.get("entry_id")
+    if entry_id is not None:
+        if entry_id not in entries:
+            raise HomeAssistantError(f"No loaded {DOMAIN} entry {entry_id}")
+        return entries[entry_id]
+    if len(entries) != 1:
+        raise HomeAssistantError(
+            f"{len(entries)} {DOMAIN} entries are loaded: pass entry_id"
+        )
+    return next(iter(entries.values()))
+
+
+def _async_register_services(hass: HomeAssistant) -> None:
+    """Register the integration's services (once, shared by all entries)."""
+
+    async def _async_get_zmanim(call: ServiceCall) -> ServiceResponse:
+        """Return the zmanim of the requested days, computed in one batch."""
+        opts = _service_opts(hass, call)
+        start: date = call.data.get("date") or dt_util.now().date()
+        batch = zmanim_for_days(
+            start,
+            call.data["days"],
+            location_from_hass(hass),
+            opts["candlelighting_offset"],
+            opts["havdalah_offset"],
+        )
+        return {"days": [{"date": z.day.isoformat(), **z.as_dict()} for z in batch]}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_ZMANIM,
+        _async_get_zmanim,
+        schema=GET_ZMANIM_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    # one export at a time: calls for the same file share its cache
+    export_lock = asyncio.Lock()
+
+    async def _async_export_ical(call: ServiceCall) -> ServiceResponse:
+        """Write the .ics export, regenerating only the years whose inputs changed."""
+        opts = _service_opts(hass, call)
+        path = call.data.get("path") or hass.config.path("www", f"{DOMAIN}.ics")
+        if not hass.config.is_allowed_path(path):
+            raise HomeAssistantError(f"Cannot write to {path}: not an allowed path")
+        # each output file keeps its own year cache, so exports with different
+        # locations or offsets do not evict each other's years
+        key = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:12]
+        async with export_lock:
+            result = await hass.async_add_executor_job(
+                export_ical,
+                path,
+                location_from_hass(hass),
+                Options(opts["candlelighting_offset"], opts["havdalah_offset"]),
+                call.data.get("start_year") or dt_util.now().year,
+                call.data["years"],
+                hass.config.path(".storage", f"{DOMAIN}_ical", key),
+            )
+        return {
+            "path": result.path,
+            "years": result.years,
+            "regenerated": result.regenerated,
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_ICAL,
+        _async_export_ical,
+        schema=EXPORT_ICAL_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def _async_add_yahrzeit(call: ServiceCall) -> None:
+        """Track a yahrzeit, birthday or bar / bas mitzvah."""
+        data = call.data
+        if "hebrew_year" in data:
+            if "hebrew_month" not in data or "hebrew_day" not in data:
+                raise HomeAssistantError("hebrew_year needs hebrew_month and hebrew_day")
+            try:
+                anniversary = Anniversary.from_hebrew(
+                    data["name"], data["hebrew_year"], data["hebrew_month"],
+                    data["hebrew_day"], data["kind"],
+                )
+            except ValueError as err:
+                raise HomeAssistantError(str(err)) from err
+        else:
+            anniversary = Anniversary.from_gregorian(
+                data["name"], data["date"], data["after_sunset"], data["kind"]
+            )
+        await hass.data[DATA_YAHRZEITS].async_add(anniversary)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_ADD_YAHRZEIT, _async_add_yahrzeit, schema=ADD_YAHRZEIT_SCHEMA
+    )
+
+    async def _async_remove_yahrzeit(call: ServiceCall) -> None:
+        """Stop tracking every anniversary of the given name."""
+        if not await hass.data[DATA_YAHRZEITS].async_remove(call.data["name"]):
+            raise HomeAssistantError(f"No yahrzeit called {call.data['name']}")
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_REMOVE_YAHRZEIT, _async_remove_yahrzeit, schema=REMOVE_YAHRZEIT_SCHEMA
+    )
+
+    async def _async_next_yahrzeit(call: ServiceCall) -> ServiceResponse:
+        """Return the next anniversaries on or after the date (default today)."""
+        day: date = call.data.get("date") or dt_util.now().date()
+        upcoming = await hass.data[DATA_YAHRZEITS].async_next(day, call.data["count"])
+        return {"upcoming": [occurrence_dict(when, anniversary) for when, anniversary in upcoming]}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_NEXT_YAHRZEIT,
+        _async_next_yahrzeit,
+        schema=NEXT_YAHRZEIT_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def _async_learning_schedule(call: ServiceCall) -> ServiceResponse:
+        """Return a cycle's portions for the requested days, for printing."""
+        start: date = call.data.get("date") or dt_util.now().date()
+        schedule = learning_schedule(call.data["cycle"], start, call.data["days"])
+        return {
+            "cycle": call.data["cycle"],
+            "days": [
+                {
+                    "date": day.isoformat(),
+                    "portion": portion.text,
+                    "cycle_number": portion.number,
+                    "day_of_cycle": portion.day,
+                }
+                for day, portion in schedule
+            ],
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_LEARNING_SCHEDULE,
+        _async_learning_schedule,
+        schema=LEARNING_SCHEDULE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
 async def _async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Called when config entry options are updated."""
+    old = hass.data[DOMAIN][entry.entry_id]
+    new = _entry_opts(hass, entry)
+    changed = {key for key in new if new[key] != old.get(key)}
+    if not changed:
+        return
     # Update stored options
-    hass.data[DOMAIN][entry.entry_id] = {
-        "strip_nikud": entry.options.get("strip_nikud", False),
-        "candlelighting_offset": entry.options.get("candlelighting_offset", 15),
-        "havdalah_offset": entry.options.get("havdalah_offset", 72),
-    }
-    # Reload the integration to apply new options
-    await hass.config_entries.async_reload(entry.entry_id)
+    hass.data[DOMAIN][entry.entry_id] = new
+    if changed - set(LIVE_OPTIONS):
+        # the profile, the Kiddush Levana minhag and the holiday sensor
+        # selection shape the entities: reload
+        if CONF_HOLIDAY_SENSORS in changed:
+            async_update_holiday_selection(hass, new[CONF_HOLIDAY_SENSORS])
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    # Offsets and nikud: the same entities recompute in place
+    async_dispatcher_send(
+        hass,
+        f"{SIGNAL_OPTIONS_UPDATED}_{entry.entry_id}",
+        Options(
+            new["candlelighting_offset"],
+            new["havdalah_offset"],
+            strip_nikud=new["strip_nikud"],
+            kiddush_levana_days=new[CONF_KIDDUSH_LEVANA_DAYS],
+        ),
+    )
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     # Remove stored data
     hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+    hass.data.get(DATA_MODEL, {}).pop(entry.entry_id, None)
+    if not hass.data.get(DOMAIN):
+        for service in SERVICES:
+            hass.services.async_remove(DOMAIN, service)
+        hass.data.pop(DATA_YAHRZEITS, None)
+        hass.data.pop(DATA_REFRESH, None)
+        if remove_templates := hass.data.pop(DATA_TEMPLATES, None):
+            remove_templates()
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
@@ -1,111 +1,132 @@
 # /config/custom_components/molad_yiddish/binary_sensor.py
 from __future__ import annotations
 import logging
-from datetime import datetime, timedelta
+from collections.abc import Iterable
+from datetime import datetime, time, timedelta
 
 from homeassistant.const import STATE_ON
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.event import (
-    async_track_time_interval,
-    async_track_state_change_event,
+    async_track_point_in_time,
     async_track_time_change,
     async_track_sunset,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.util import dt as dt_util
 from zoneinfo import ZoneInfo
 
 from astral import LocationInfo
-from astral.sun import sun
-from hdate import HDateInfo
-from pyluach.hebrewcal import HebrewDate as PHebrewDate
 
-from .const import DOMAIN
+from .const import (
+    CONF_HOLIDAY_SENSORS,
+    CONF_KIDDUSH_LEVANA_DAYS,
+    DEFAULT_HOLIDAY_SENSORS,
+    DOMAIN,
+)
+from .kiddush_levana_sensor import KiddushLevanaSensor
+from .model import HOLIDAY_FLAGS, EntryModel, get_model
+from .molad_lib.melacha import MelachaTable
+from .molad_lib.rules import HOLIDAY_RULES
+from .molad_lib.options import Options
+from .molad_lib.schedule import EREV_DATES, erev_state, next_erev_change
+from .refresh import (
+    async_refresh_on_options,
+    async_refresh_when_started,
+    async_write_batched,
+)
+from .zmanim_sensor import location_from_hass
 
 _LOGGER = logging.getLogger(__name__)
 
 
 
 
-# ─── Your override map ────────────────────────────────────────────────────────
-SLUG_OVERRIDES: dict[str, str] = {
-    "א׳ סליחות":             "alef_selichot",
-    "ערב ראש השנה":          "erev_rosh_hashana",
-    "ראש השנה א׳":           "rosh_hashana_1",
-    "ראש השנה ב׳":           "rosh_hashana_2",
-    "ראש השנה א׳ וב׳":       "rosh_hashana_1_2",
-    "צום גדליה":             "tzom_gedalia",
-    "שלוש עשרה מדות":        "shlosha_asar_midot",
-    "ערב יום כיפור":          "erev_yom_kippur",
-    "יום הכיפורים":          "yom_kippur",
-    "ערב סוכות":             "erev_sukkot",
-    "סוכות א׳":              "sukkot_1",
-    "סוכות ב׳":              "sukkot_2",
-    "סוכות א׳ וב׳":           "sukkot_1_2",
-    "א׳ דחול המועד סוכות":     "chol_hamoed_sukkot_1",
-    "ב׳ דחול המועד סוכות":     "chol_hamoed_sukkot_2",
-    "ג׳ דחול המועד סוכות":      "chol_hamoed_sukkot_3",
-    "ד׳ דחול המועד סוכות":      "chol_hamoed_sukkot_4",    
-    "חול המועד סוכות":       "chol_hamoed_sukkot",
-    "הושענא רבה":            "hoshanah_rabbah",
-    "שמיני עצרת":            "shemini_atzeret",
-    "שמחת תורה":             "simchat_torah",
-    "ערב חנוכה":             "erev_chanukah",
-    "חנוכה":                 "chanukah",
-    "שובבים":               "shovavim",
-    "שובבים ת\"ת":          "shovavim_tet",
-    "צום עשרה בטבת":         "tzom_asara_betevet",
-    "ט\"ו בשבט":             "tu_bishvat",
-    "תענית אסתר":            "taanit_esther",
-    "פורים":                "purim",
-    "שושן פורים":           "shushan_purim",
-    "ליל בדיקת חמץ":        "leil_bedikat_chametz",
-    "ערב פסח":              "erev_pesach",
-    "פסח א׳":               "pesach_1",
-    "פסח ב׳":               "pesach_2",
-    "פסח א׳ וב׳":           "pesach_1_2",
-    "חול המועד פסח":        "chol_hamoed_pesach",
-    "שביעי של פסח":         "pesach_seventh",
-    "אחרון של פסח":         "pesach_last",
-    "ל\"ג בעומר":            "lag_baomer",
-    "ערב שבועות":           "erev_shavuot",
-    "שבועות א׳":            "shavuot_1",
-    "שבועות ב׳":            "shavuot_2",
-    "שבועות א׳ וב׳":        "shavuot_1_2",
-    "צום שבעה עשר בתמוז":   "tzom_17_tammuz",
-    "תשעה באב":             "tzom_9_av",
-    "תשעה באב נדחה":        "tzom_9_av_deferred",
-    "ראש חודש":             "rosh_chodesh",
-}
+# ─── Your override map (the rule table's slugs) ───────────────────────────────
+SLUG_OVERRIDES: dict[str, str] = HOLIDAY_RULES.slugs
 
 # ─── The fixed dynamic‐attribute binary sensor ────────────────────────────────
 
 
+def _holiday_unique_id(slug: str) -> str:
+    return f"yiddish_holiday_{slug}"
+
+
+@callback
+def async_update_holiday_selection(hass: HomeAssistant, selected: Iterable[str]) -> None:
+    """Enable the selected holiday binary sensors and disable the others.
+
+    Only sensors the integration itself disabled are enabled again, so one
+    the user turned off stays off.
+    """
+    registry = er.async_get(hass)
+    selected = set(selected)
+    for slug in SLUG_OVERRIDES.values():
+        entity_id = registry.async_get_entity_id(
+            "binary_sensor", DOMAIN, _holiday_unique_id(slug)
+        )
+        if entity_id is None:
+            continue
+        disabled_by = registry.async_get(entity_id).disabled_by
+        if slug in selected and disabled_by is er.RegistryEntryDisabler.INTEGRATION:
+            registry.async_update_entity(entity_id, disabled_by=None)
+        elif slug not in selected and disabled_by is None:
+            registry.async_update_entity(
+                entity_id, disabled_by=er.RegistryEntryDisabler.INTEGRATION
+            )
+
+
+@callback
+def async_holiday_selection(hass: HomeAssistant, entry: ConfigEntry) -> list[str]:
+    """The entry's holiday sensor selection, as the options form shows it.
+
+    Entries created before the option existed have every holiday sensor
+    registered and enabled, so their selection is read from the entity
+    registry; a new entry with nothing registered yet starts from the default.
+    """
+    if CONF_HOLIDAY_SENSORS in entry.options:
+        return list(entry.options[CONF_HOLIDAY_SENSORS])
+    registry = er.async_get(hass)
+    registered = {
+        reg.unique_id: reg
+        for reg in er.async_entries_for_config_entry(registry, entry.entry_id)
+        if reg.domain == "binary_sensor"
+    }
+    slugs = [
+        slug for slug in SLUG_OVERRIDES.values()
+        if _holiday_unique_id(slug) in registered
+    ]
+    if not slugs:
+        return list(DEFAULT_HOLIDAY_SENSORS)
+    return [
+        slug for slug in slugs
+        if registered[_holiday_unique_id(slug)].disabled_by is None
+    ]
+
+
 class HolidayAttributeBinarySensor(RestoreEntity, BinarySensorEntity):
-    """Mirrors one attribute from sensor.molad_yiddish_holiday, with restore-on-reboot."""
+    """Mirrors one holiday flag from the entry model, with restore-on-reboot."""
 
-    def __init__(self, hass: HomeAssistant, attr_name: str) -> None:
+    _attr_should_poll = False
+
+    def __init__(self, attr_name: str, model: EntryModel, enabled: bool = True) -> None:
         super().__init__()
-        self.hass = hass
         self.attr_name = attr_name
+        self._model = model
+        # unselected flags are registered disabled and never added to hass
+        self._attr_entity_registry_enabled_default = enabled
         # display info
         slug = SLUG_OVERRIDES.get(attr_name) or (
             attr_name.lower().replace(" ", "_")
                       .replace("׳", "").replace('"', "")
         )
-        self._attr_unique_id = f"yiddish_holiday_{slug}"
+        self._attr_unique_id = _holiday_unique_id(slug)
         self.entity_id = f"binary_sensor.yiddish_holiday_{slug}"
         self._attr_icon = "mdi:checkbox-marked-circle-outline"
         self._attr_extra_state_attributes = {}
 
-    def _schedule_update(self, *_args) -> None:
-        """Thread-safe scheduling of async_update on the event loop."""
-        self.hass.loop.call_soon_threadsafe(
-            lambda: self.hass.async_create_task(self.async_update())
-        )
-
     async def async_added_to_hass(self) -> None:
         # 1) restore last known state
         await super().async_added_to_hass()
@@ -113,115 +134,92 @@ class HolidayAttributeBinarySensor(RestoreEntity, BinarySensorEntity):
         if last:
             self._attr_is_on = (last.state == STATE_ON)
 
-        # 2) one immediate sync if source exists
-        if self.hass.states.get("sensor.molad_yiddish_holiday"):
-            await self.async_update()
-
-        # 3a) update on attribute change events
-        async_track_state_change_event(
-            self.hass,
-            "sensor.molad_yiddish_holiday",
-            self._schedule_update,
+        # 2) follow the holiday flag the holiday sensor publishes
+        self.async_on_remove(self._model.async_want(HOLIDAY_FLAGS, self.attr_name))
+        self.async_on_remove(
+            self._model.async_subscribe([HOLIDAY_FLAGS], self._handle_flags)
         )
 
-        # 3b) poll once a minute
-        async_track_time_interval(
-            self.hass,
-            self._schedule_update,
-            timedelta(minutes=1),
-        )
+    @callback
+    def _handle_flags(self) -> None:
+        is_on = bool(self._model.get(HOLIDAY_FLAGS, {}).get(self.attr_name, False))
+        if is_on != self._attr_is_on:
+            self._attr_is_on = is_on
+            async_write_batched(self)
 
     async def async_update(self, now=None) -> None:
-        src = self.hass.states.get("sensor.molad_yiddish_holiday")
-        self._attr_is_on = bool(src and src.attributes.get(self.attr_name, False))
+        if self._model.has(HOLIDAY_FLAGS):
+            self._attr_is_on = bool(self._model.get(HOLIDAY_FLAGS).get(self.attr_name, False))
 
 
 class ErevHolidaySensor(RestoreEntity, BinarySensorEntity):
-    """True on specific Erev‐days from alos ha-shachar until candle-lighting, with restore-on-reboot."""
+    """True on specific Erev‐days from alos ha-shachar until candle-lighting, with restore-on-reboot.
+
+    A single point-in-time timer fires at the next alos / candle-lighting of
+    an Erev day (or at midnight, where the attributes move to the new day),
+    so the state flips at the exact instant in every performance profile.
+    """
 
     _attr_name = "Molad Yiddish Erev"
     _attr_unique_id = "molad_yiddish_erev"
     _attr_icon = "mdi:weather-sunset-up"
+    _attr_should_poll = False
 
     # (Hebrew month, day) of Erev‐Yom‐Tov dates
-    _EREV_DATES = {
-        (6, 29),  # ערב ראש השנה
-        (7, 9),   # ערב יום כיפור
-        (7, 14),  # ערב סוכות
-        (7, 21),  # הושענא רבה
-        (9, 24),  # ערב חנוכה
-        (1, 14),  # ערב פסח
-        (3, 5),   # ערב שבועות
-    }
+    _EREV_DATES = EREV_DATES
 
     def __init__(self, hass: HomeAssistant, candle_offset: int) -> None:
         super().__init__()
         self.hass = hass
-        self._candle = candle_offset
-        self._tz = ZoneInfo(hass.config.time_zone)
-        self._loc = LocationInfo(
-            latitude=hass.config.latitude,
-            longitude=hass.config.longitude,
-            timezone=hass.config.time_zone,
-        )
+        self._options = Options(candle_offset=candle_offset)
+        self._location = location_from_hass(hass)
+        self._unsub_timer = None
         self._attr_extra_state_attributes: dict[str, any] = {}
 
-    def _schedule_update(self, *_args) -> None:
-        """Thread-safe scheduling of async_update on the event loop."""
-        self.hass.loop.call_soon_threadsafe(
-            lambda: self.hass.async_create_task(self.async_update())
-        )
-
     async def async_added_to_hass(self) -> None:
-        # 1) restore last known state
+        # restore the last state; the first computation runs once HA has started
         await super().async_added_to_hass()
         last = await self.async_get_last_state()
         if last:
             self._attr_is_on = (last.state == STATE_ON)
-
-        # 2) immediate first update
-        await self.async_update()
-
-        # 3) poll every minute safely
-        async_track_time_interval(
-            self.hass,
-            self._schedule_update,
-            timedelta(minutes=1),
+        self.async_on_remove(self._cancel_timer)
+
+    def _cancel_timer(self) -> None:
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    async def async_apply_options(self, options: Options) -> bool:
+        if options.candle_offset == self._options.candle_offset:
+            return False
+        self._options = self._options._replace(candle_offset=options.candle_offset)
+        return True
+
+    async def _update_state(self, now: datetime | None = None) -> None:
+        now = (now or dt_util.now()).astimezone(self._location.tz)
+        self._attr_is_on, self._attr_extra_state_attributes = erev_state(
+            now, self._location, self._options
         )
+        self.async_write_ha_state()
 
-    async def async_update(self, now: datetime | None = None) -> None:
-        now = (now or datetime.now(self._tz)).astimezone(self._tz)
-        today = now.date()
+        self._cancel_timer()
+        self._unsub_timer = async_track_point_in_time(
+            self.hass, self._update_state, next_erev_change(now, self._location, self._options)
+        )
 
-        s = sun(self._loc.observer, date=today, tzinfo=self._tz)
-        alos = s["dawn"]
-        sunset = s["sunset"]
 
-        # holiday vs Shabbos
-        hd = PHebrewDate.from_pydate(today)
-        is_erev_holiday = (hd.month, hd.day) in self._EREV_DATES
-        candle_time = sunset - timedelta(minutes=self._candle)
-        is_erev_shabbos = (today.weekday() == 4) and (now < candle_time)
-        is_erev = is_erev_holiday or is_erev_shabbos
+class MeluchaProhibitionSensor(RestoreEntity, BinarySensorEntity):
+    """True from candle-lighting until havdalah on Shabbos & multi-day Yom Tov.
 
-        self._attr_is_on = is_erev and (alos <= now < candle_time)
-
-        self._attr_extra_state_attributes = {
-            "now": now.isoformat(),
-            "is_erev_holiday": is_erev_holiday,
-            "is_erev_shabbos": is_erev_shabbos,
-            "alos": alos.isoformat(),
-            "candle_time": candle_time.isoformat(),
-            "window_start": alos.isoformat(),
-            "window_end": candle_time.isoformat(),
-        }
-        
-class MeluchaProhibitionSensor(BinarySensorEntity):
-    """True from candle-lighting until havdalah on Shabbos & multi-day Yom Tov."""
+    A single point-in-time timer fires at the next window boundary of the
+    year's MelachaTable (or at midnight, for the "today" attribute), so the
+    state flips at the exact instant in every performance profile.
+    """
 
     _attr_name = "Molad Yiddish Melucha Prohibition"
     _attr_unique_id = "molad_yiddish_melucha"
     _attr_icon = "mdi:briefcase-variant-off"
+    _attr_should_poll = False
 
     def __init__(self, hass, candle_offset: int, havdalah_offset: int) -> None:
         super().__init__()
@@ -235,89 +233,73 @@ class MeluchaProhibitionSensor(BinarySensorEntity):
             longitude=hass.config.longitude,
             timezone=hass.config.time_zone,
         )
+        self._table: MelachaTable | None = None
+        self._unsub_timer = None
         self._attr_extra_state_attributes = {}
 
     async def async_added_to_hass(self) -> None:
-        # immediate update + poll every minute
-        await self.async_update()
-        async_track_time_interval(self.hass, self.async_update, timedelta(minutes=1))
+        # restore the last state; the first computation (which builds the
+        # year's table) runs once HA has started
+        await super().async_added_to_hass()
+        last = await self.async_get_last_state()
+        if last:
+            self._attr_is_on = last.state == STATE_ON
+        self.async_on_remove(self._cancel_timer)
+
+    def _cancel_timer(self) -> None:
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    async def async_apply_options(self, options: Options) -> bool:
+        """Take the new offsets; the year's table built under the old ones is dropped."""
+        offsets = (options.candle_offset, options.havdalah_offset)
+        if offsets == (self._candle, self._havdalah):
+            return False
+        self._candle, self._havdalah = offsets
+        self._table = None
+        return True
+
+    async def _async_get_table(self, year: int) -> MelachaTable:
+        """Return the merged Shabbos / Yom Tov spans for *year*, built once per year."""
+        if self._table is None or self._table.year != year:
+            self._table = await self.hass.async_add_executor_job(
+                MelachaTable,
+                year, self._loc, self._tz, self._candle, self._havdalah, self._diaspora,
+            )
+        return self._table
+
+    async def _update_state(self, now: datetime | None = None) -> None:
+        now = (now or dt_util.now()).astimezone(self._tz)
+        table = await self._async_get_table(now.year)
+        span, nxt = table.lookup(now)
+        in_window = span is not None
+        # outside a window, describe the coming one
+        shown = span or nxt
 
-    async def async_update(self, now=None) -> None:
-        # 1) get correct current time in local tz
-        now = dt_util.now().astimezone(self._tz)
-        today = now.date()
-
-        # 2) compute sunset + candle-lighting threshold for today
-        s_today = sun(self._loc.observer, date=today, tzinfo=self._tz)
-        sunset_today = s_today["sunset"]
-        candle_time = sunset_today - timedelta(minutes=self._candle)
-
-        # 3) decide which Gregorian date to check for festival
-        check_date = today + timedelta(days=1) if now >= candle_time else today
-        hd = HDateInfo(check_date, diaspora=self._diaspora)
-        is_yomtov = hd.is_yom_tov
-
-        # 4) find festival span (start_date…end_date)
-        if is_yomtov:
-            # multi-day Yom Tov: expand around check_date
-            start_date = check_date
-            while HDateInfo(start_date - timedelta(days=1), diaspora=self._diaspora).is_yom_tov:
-                start_date -= timedelta(days=1)
-            end_date = check_date
-            while HDateInfo(end_date + timedelta(days=1), diaspora=self._diaspora).is_yom_tov:
-                end_date += timedelta(days=1)
-            festival_name = HDateInfo(start_date, diaspora=self._diaspora).holidays[0].name
-        else:
-            # Shabbos as two-day festival (Fri→Sat)
-            wd = today.weekday()  # Mon=0…Fri=4,Sat=5
-            if wd == 5 and now < (sunset_today + timedelta(minutes=self._havdalah)):
-                # still Sat before havdalah: started Fri
-                start_date = today - timedelta(days=1)
-            else:
-                # upcoming Fri
-                days_to_friday = (4 - wd) % 7
-                start_date = today + timedelta(days=days_to_friday)
-            end_date = start_date + timedelta(days=1)
-            festival_name = "Shabbos"
-
-        # 5) compute the candle window:
-        #    - for multi-day Yom Tov, use the eve *before* the first day
-        #    - for Shabbos, use that Friday itself
-        if is_yomtov:
-            eve_date = start_date - timedelta(days=1)
-        else:
-            eve_date = start_date
-
-        # sunset on that eve/friday and on the final day
-        s_eve   = sun(self._loc.observer, date=eve_date,   tzinfo=self._tz)["sunset"]
-        s_final = sun(self._loc.observer, date=end_date,   tzinfo=self._tz)["sunset"]
-
-        window_start = s_eve   - timedelta(minutes=self._candle)
-        window_end   = s_final + timedelta(minutes=self._havdalah)
-        in_window    = window_start <= now < window_end
-        
-        # only show “Shabbos” when we’re actually in that Fri→Sat window
-        if festival_name == "Shabbos" and not in_window:
-            festival_name = None
-
-
-
-        # 6) set state & attributes
         self._attr_is_on = in_window
         self._attr_extra_state_attributes = {
-            "now":            now.isoformat(),
-            "today":          str(today),
-            "check_date":     str(check_date),
-            "festival_name":  festival_name,
-            "is_yomtov":      is_yomtov,
-            "is_shabbos": (festival_name == "Shabbos" and in_window),
-            "candle_eve":     eve_date.isoformat(),
-            "sunset_eve":     s_eve.isoformat(),
-            "sunset_final":   s_final.isoformat(),
-            "window_start":   window_start.isoformat(),
-            "window_end":     window_end.isoformat(),
-            "in_window":      in_window,
+            "today":             str(now.date()),
+            "festival_name":     span.name if span else None,
+            "is_yomtov":         bool(span and span.is_yomtov),
+            "is_shabbos":        bool(span and not span.is_yomtov),
+            "candle_eve":        shown.eve.isoformat() if shown else None,
+            "sunset_eve":        shown.sunset_eve.isoformat() if shown else None,
+            "sunset_final":      shown.sunset_final.isoformat() if shown else None,
+            "window_start":      shown.start.isoformat() if shown else None,
+            "window_end":        shown.end.isoformat() if shown else None,
+            "next_window_start": nxt.start.isoformat() if nxt else None,
+            "in_window":         in_window,
         }
+        self.async_write_ha_state()
+
+        # the next boundary, or midnight for "today" (and a new year's table)
+        midnight = datetime.combine(now.date() + timedelta(days=1), time(), self._tz)
+        boundary = table.next_change(now)
+        self._cancel_timer()
+        self._unsub_timer = async_track_point_in_time(
+            self.hass, self._update_state, min(boundary, midnight) if boundary else midnight
+        )
 
 
 async def async_setup_entry(
@@ -326,15 +308,23 @@ async def async_setup_entry(
     async_add_entities,
 ) -> None:
     opts = hass.data[DOMAIN][entry.entry_id]
+    model = get_model(hass, entry.entry_id)
     candle = opts["candlelighting_offset"]
     havdalah = opts["havdalah_offset"]
 
     entities: list[BinarySensorEntity] = [
         MeluchaProhibitionSensor(hass, candle, havdalah),
         ErevHolidaySensor(hass, candle),
+        KiddushLevanaSensor(hass, havdalah, opts[CONF_KIDDUSH_LEVANA_DAYS]),
     ]
-    for name in SLUG_OVERRIDES:
-        entities.append(HolidayAttributeBinarySensor(hass, name))
-
-    async_add_entities(entities, update_before_add=True)
+    selected = set(opts[CONF_HOLIDAY_SENSORS])
+    for name, slug in SLUG_OVERRIDES.items():
+        entities.append(HolidayAttributeBinarySensor(name, model, slug in selected))
+
+    # Entities come up from their restored state; the first real computation
+    # runs in one batch once Home Assistant has started
+    async_add_entities(entities)
+    entry.async_on_unload(async_refresh_when_started(hass, entities))
+    # Offset changes are applied to the same entities (see refresh.py)
+    entry.async_on_unload(async_refresh_on_options(hass, entry.entry_id, entities))
 
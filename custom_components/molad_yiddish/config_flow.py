@@ -4,8 +4,18 @@
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
+from homeassistant.helpers import config_validation as cv
 
-from .const import DOMAIN
+from .binary_sensor import async_holiday_selection
+from .const import (
+    CONF_HOLIDAY_SENSORS,
+    CONF_KIDDUSH_LEVANA_DAYS,
+    CONF_PERFORMANCE_PROFILE,
+    DOMAIN,
+)
+from .molad_lib.kiddush_levana import DEFAULT_MINHAG_DAYS, MINHAG_DAYS
+from .molad_lib.profiles import DEFAULT_PROFILE, PROFILES
+from .molad_lib.rules import HOLIDAY_RULES
 
 # Default offsets (minutes)
 DEFAULT_CANDLELIGHT_OFFSET = 15
@@ -61,6 +71,24 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                             "havdalah_offset", DEFAULT_HAVDALAH_OFFSET
                         ),
                     ): int,
+                    vol.Optional(
+                        CONF_PERFORMANCE_PROFILE,
+                        default=self._config_entry.options.get(
+                            CONF_PERFORMANCE_PROFILE, DEFAULT_PROFILE
+                        ),
+                    ): vol.In(list(PROFILES)),
+                    vol.Optional(
+                        CONF_KIDDUSH_LEVANA_DAYS,
+                        default=self._config_entry.options.get(
+                            CONF_KIDDUSH_LEVANA_DAYS, DEFAULT_MINHAG_DAYS
+                        ),
+                    ): vol.In(MINHAG_DAYS),
+                    vol.Optional(
+                        CONF_HOLIDAY_SENSORS,
+                        default=async_holiday_selection(self.hass, self._config_entry),
+                    ): cv.multi_select(
+                        {slug: name for name, slug in HOLIDAY_RULES.slugs.items()}
+                    ),
                 }
             )
             return self.async_show_form(step_id="init", data_schema=schema)
@@ -1,2 +1,48 @@
 # Constants for the Molad Yiddish integration
 DOMAIN = "molad_yiddish"
+
+# Option selecting the update profile (see molad_lib.profiles)
+CONF_PERFORMANCE_PROFILE = "performance_profile"
+
+# Option: days after the molad Kiddush Levana starts (3 or 7)
+CONF_KIDDUSH_LEVANA_DAYS = "kiddush_levana_days"
+
+# Option: slugs of the holiday binary sensors enabled when first registered;
+# the others are created disabled (see binary_sensor.py)
+CONF_HOLIDAY_SENSORS = "holiday_sensors"
+# the Yom Tov days and the fasts
+DEFAULT_HOLIDAY_SENSORS: tuple[str, ...] = (
+    "rosh_hashana_1_2",
+    "yom_kippur",
+    "sukkot_1_2",
+    "shemini_atzeret",
+    "simchat_torah",
+    "pesach_1_2",
+    "pesach_seventh",
+    "pesach_last",
+    "shavuot_1_2",
+    "tzom_gedalia",
+    "tzom_asara_betevet",
+    "taanit_esther",
+    "tzom_17_tammuz",
+    "tzom_9_av",
+    "tzom_9_av_deferred",
+)
+
+# hass.data key of the per-entry EntryModel (see model.py)
+DATA_MODEL = f"{DOMAIN}_model"
+
+# hass.data key of the shared YahrzeitTracker (see yahrzeit_sensor.py)
+DATA_YAHRZEITS = f"{DOMAIN}_yahrzeits"
+
+# hass.data key of the callback removing the template functions (see templates.py)
+DATA_TEMPLATES = f"{DOMAIN}_templates"
+
+# hass.data key of the shared refresh timers and batched state writer (see refresh.py)
+DATA_REFRESH = f"{DOMAIN}_refresh"
+
+# Bus event fired at each halachic transition (see transition_events.py)
+EVENT_TRANSITION = f"{DOMAIN}_transition"
+
+# Dispatcher signal (suffixed with the entry id) carrying live option changes
+SIGNAL_OPTIONS_UPDATED = f"{DOMAIN}_options_updated"
@@ -0,0 +1,104 @@
+# custom_components/molad_yiddish/day_mode_sensor.py
+"""
+Enum sensor with one state for the whole Shabbos / Yom Tov cycle: weekday,
+erev_shabbos, erev_yom_tov, shabbos, yom_tov, chol_hamoed, fast, motzei.
+
+The sensor keeps a DayModeTimeline (rebuilt in the executor when fewer than
+_REBUILD_MARGIN remain before its horizon) and arms a single point-in-time
+timer for the next change, so an automation needs one state trigger and the
+sensor writes only when the mode actually changes.  Until the first
+computation (after Home Assistant has started) it shows its restored state.
+"""
+from __future__ import annotations
+
+import datetime
+from datetime import timedelta
+import logging
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.util import dt as dt_util
+
+from .molad_lib.day_mode import DAY_MODES, MODE_LABELS, DayModeTimeline, build_day_modes
+from .molad_lib.options import Options
+from .refresh import restored_attributes
+from .zmanim_sensor import location_from_hass
+
+_LOGGER = logging.getLogger(__name__)
+
+# Rebuild the timeline once fewer than this many days remain before its horizon
+_REBUILD_MARGIN = timedelta(days=7)
+
+
+class DayModeSensor(RestoreEntity, SensorEntity):
+    """What kind of time it is now, and what comes next."""
+
+    _attr_name = "Molad Yiddish Day Mode"
+    _attr_unique_id = "molad_yiddish_day_mode"
+    _attr_icon = "mdi:calendar-clock"
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = list(DAY_MODES)
+    _attr_should_poll = False
+
+    def __init__(self, hass: HomeAssistant, candle_offset: int, havdalah_offset: int) -> None:
+        super().__init__()
+        self.hass = hass
+        self._location = location_from_hass(hass)
+        self._options = Options(candle_offset, havdalah_offset)
+        self._timeline: DayModeTimeline | None = None
+        self._unsub_timer = None
+        self._attr_native_value = None
+        self._attr_extra_state_attributes = {}
+
+    async def async_added_to_hass(self) -> None:
+        # restore the last state; the first computation runs once HA has started
+        await super().async_added_to_hass()
+        last = await self.async_get_last_state()
+        if last and last.state in DAY_MODES:
+            self._attr_native_value = last.state
+            self._attr_extra_state_attributes = restored_attributes(last)
+        self.async_on_remove(self._cancel_timer)
+
+    def _cancel_timer(self) -> None:
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    async def async_apply_options(self, options: Options) -> bool:
+        """Take the new offsets; the timeline built under the old ones is dropped."""
+        old, self._options = self._options, self._options.with_offsets(options)
+        if self._options == old:
+            return False
+        self._timeline = None
+        return True
+
+    async def _update_state(self, now: datetime.datetime | None = None) -> None:
+        now = now or dt_util.now()
+        if self._timeline is None or now + _REBUILD_MARGIN >= self._timeline.horizon:
+            self._timeline = await self.hass.async_add_executor_job(
+                build_day_modes,
+                now.astimezone(self._location.tz).date(),
+                self._location,
+                self._options,
+            )
+        current = self._timeline.at(now)
+
+        self._attr_native_value = current.mode
+        self._attr_extra_state_attributes = {
+            "label": MODE_LABELS[current.mode],
+            "since": current.since.isoformat() if current.since else None,
+            "next_mode": current.next_mode,
+            "next_label": MODE_LABELS.get(current.next_mode),
+            "next_start": current.next_start.isoformat() if current.next_start else None,
+        }
+        self.async_write_ha_state()
+
+        # next change, or the rebuild point when none is left before the horizon
+        self._cancel_timer()
+        self._unsub_timer = async_track_point_in_time(
+            self.hass,
+            self._update_state,
+            current.next_start or self._timeline.horizon - _REBUILD_MARGIN,
+        )
@@ -0,0 +1,23 @@
+# /config/custom_components/molad_yiddish/diagnostics.py
+"""Diagnostics for Molad Yiddish (options, calendar and template cache statistics)."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .molad_lib import lookup
+from .molad_lib.convert import cache_stats
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    return {
+        "options": dict(hass.data.get(DOMAIN, {}).get(entry.entry_id, {})),
+        "conversion_cache": cache_stats(),
+        "template_cache": lookup.cache_stats(),
+    }
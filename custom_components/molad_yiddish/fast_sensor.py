@@ -0,0 +1,139 @@
+# custom_components/molad_yiddish/fast_sensor.py
+"""
+Timestamp sensors for the start and end of the current or next fast.
+
+UpcomingFast computes the fast once and arms a single point-in-time timer
+at its end; the frontend renders any countdown from the timestamps, so the
+sensors are only written when one fast gives way to the next.  Until the
+fast is first computed (after Home Assistant has started) the sensors show
+their restored values.
+"""
+from __future__ import annotations
+
+import datetime
+import logging
+
+from homeassistant.components.sensor import RestoreSensor, SensorDeviceClass
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+from .molad_lib.fasts import Fast, next_fast
+from .molad_lib.options import Options
+from .zmanim_sensor import location_from_hass
+
+_LOGGER = logging.getLogger(__name__)
+
+# Fast attribute → (entity name, icon)
+FAST_SENSORS: dict[str, tuple[str, str]] = {
+    "start": ("Fast Start", "mdi:food-off"),
+    "end":   ("Fast End",   "mdi:food"),
+}
+
+
+class UpcomingFast:
+    """Owns the current/next fast and the single timer that advances it."""
+
+    def __init__(self, hass: HomeAssistant, candle_offset: int, havdalah_offset: int) -> None:
+        self.hass = hass
+        self._location = location_from_hass(hass)
+        self._candle = candle_offset
+        self._havdalah = havdalah_offset
+        self._entities: list[FastTimeSensor] = []
+        self._unsub_timer = None
+        self.fast: Fast | None = None
+        self.ready = False
+
+    def register(self, entity: FastTimeSensor) -> None:
+        self._entities.append(entity)
+
+    async def async_start(self) -> None:
+        await self._async_refresh(dt_util.now())
+        self.ready = True
+        self._write_entities()
+
+    @callback
+    def _write_entities(self) -> None:
+        for entity in self._entities:
+            if entity.hass is not None:
+                entity.async_write_ha_state()
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    async def async_apply_options(self, options: Options) -> bool:
+        """Find the fast again under the new offsets and re-arm."""
+        offsets = (options.candle_offset, options.havdalah_offset)
+        if offsets == (self._candle, self._havdalah):
+            return False
+        self._candle, self._havdalah = offsets
+        if self.ready:
+            self.async_stop()
+            await self.async_start()
+        return True
+
+    async def _async_refresh(self, now: datetime.datetime) -> None:
+        self.fast = await self.hass.async_add_executor_job(
+            next_fast, now, self._location, self._candle, self._havdalah
+        )
+        if self.fast is None:
+            _LOGGER.warning("No upcoming fast found after %s", now)
+            return
+        self._unsub_timer = async_track_point_in_time(
+            self.hass, self._handle_fast_end, self.fast.end
+        )
+
+    async def _handle_fast_end(self, now: datetime.datetime) -> None:
+        self._unsub_timer = None
+        await self._async_refresh(now)
+        self._write_entities()
+
+
+class FastTimeSensor(RestoreSensor):
+    """When the current or next fast starts or ends."""
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_should_poll = False
+
+    def __init__(self, upcoming: UpcomingFast, key: str) -> None:
+        super().__init__()
+        self._upcoming = upcoming
+        self._key = key
+        name, icon = FAST_SENSORS[key]
+        self._attr_name = name
+        self._attr_icon = icon
+        self._attr_unique_id = f"molad_yiddish_fast_{key}"
+        self._restored: datetime.datetime | None = None
+        self._restored_attrs: dict[str, str | None] = {}
+        upcoming.register(self)
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        last = await self.async_get_last_sensor_data()
+        if last:
+            self._restored = last.native_value
+        last_state = await self.async_get_last_state()
+        if last_state:
+            self._restored_attrs = {
+                key: last_state.attributes.get(key) for key in ("fast_name", "fast_day")
+            }
+
+    @property
+    def native_value(self) -> datetime.datetime | None:
+        if not self._upcoming.ready:
+            return self._restored
+        fast = self._upcoming.fast
+        return getattr(fast, self._key) if fast else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, str | None]:
+        if not self._upcoming.ready:
+            return self._restored_attrs
+        fast = self._upcoming.fast
+        return {
+            "fast_name": fast.name if fast else None,
+            "fast_day": fast.day.isoformat() if fast else None,
+        }
@@ -1,110 +1,102 @@
 from __future__ import annotations
 import datetime
-from datetime import timedelta
-from zoneinfo import ZoneInfo
 
-from homeassistant.core import HomeAssistant
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.components.sensor import SensorEntity
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.util import dt as dt_util
 
+from .model import (
+    DAY_LABEL,
+    HOLIDAY_FLAGS,
+    PARSHA,
+    ROSH_CHODESH_TODAY,
+    SPECIAL_SHABBOS,
+    EntryModel,
+)
+from .molad_lib.profiles import Profile
+from .molad_lib.rules import HOLIDAY_RULES
+from .refresh import async_track_refresh, async_write_batched
 
-class FullYiddishDisplaySensor(SensorEntity):
+
+class FullYiddishDisplaySensor(RestoreEntity, SensorEntity):
     """
-    Combines Yiddish day label, parsha, holiday (from YOUR list via molad_yiddish_holiday attrs),
+    Combines Yiddish day label, parsha, holiday (from YOUR list of the holiday flags),
     R"Chodesh, and special Shabbos into one filtered string matching the original card formatting.
+    Reads the entry model and is recomputed whenever one of those fields changes.
     """
     _attr_name = "Molad Yiddish Full Display"
     _attr_unique_id = "molad_yiddish_full_display"
+    _attr_should_poll = False
 
     # ONLY show these holidays
-    ALLOWED_HOLIDAYS: set[str] = {
-        "א׳ סליחות",
-        "ערב ראש השנה",
-        "ראש השנה א׳",
-        "ראש השנה ב׳",
-        "צום גדליה",
-        "שלוש עשרה מדות",
-        "ערב יום כיפור",
-        "יום הכיפורים",
-        "ערב סוכות",
-        "סוכות א׳",
-        "סוכות ב׳",
-        "א׳ דחול המועד סוכות",
-        "ב׳ דחול המועד סוכות",
-        "ג׳ דחול המועד סוכות",
-        "ד׳ דחול המועד סוכות",
-        "הושענא רבה",
-        "שמיני עצרת",
-        "שמחת תורה",
-        "ערב חנוכה",
-        "חנוכה",
-        "צום עשרה בטבת",
-        "ט\"ו בשבט",
-        "תענית אסתר",
-        "פורים",
-        "שושן פורים",
-        "ליל בדיקת חמץ",
-        "ערב פסח",
-        "פסח א׳",
-        "פסח ב׳",
-        "חול המועד פסח",
-        "שביעי של פסח",
-        "אחרון של פסח",
-        "ל\"ג בעומר",
-        "ערב שבועות",
-        "שבועות א׳",
-        "שבועות ב׳",
-        "צום שבעה עשר בתמוז",
-        "תשעה באב",
-        "תשעה באב נדחה",
-    }
-
-    def __init__(self, hass: HomeAssistant) -> None:
+    ALLOWED_HOLIDAYS: frozenset[str] = frozenset(HOLIDAY_RULES.allowed)
+
+    # Model fields the display is composed of
+    FIELDS = (DAY_LABEL, PARSHA, HOLIDAY_FLAGS, ROSH_CHODESH_TODAY, SPECIAL_SHABBOS)
+
+    def __init__(self, hass: HomeAssistant, profile: Profile, model: EntryModel) -> None:
         super().__init__()
         self.hass = hass
+        self._model = model
         self._state = ""
-        async_track_time_interval(hass, self.async_update, timedelta(minutes=1))
+        self._refresh_interval = profile.minute_interval
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(async_track_refresh(self.hass, self, self._refresh_interval))
+        last = await self.async_get_last_state()
+        if last and last.state not in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+            self._state = last.state
+        self.async_on_remove(self._model.async_subscribe(self.FIELDS, self._handle_model))
+
+    @callback
+    def _handle_model(self) -> None:
+        self._compose(dt_util.now())
+        async_write_batched(self)
 
     @property
     def native_value(self) -> str:
         return self._state
 
     async def async_update(self, now: datetime.datetime | None = None) -> None:
-        tz = ZoneInfo(self.hass.config.time_zone)
-        now = now or datetime.datetime.now(tz)
+        self._compose(now or dt_util.now())
+
+    @callback
+    def _compose(self, now: datetime.datetime) -> None:
+        model = self._model
+        if not model.has(DAY_LABEL):
+            # nothing computed yet: keep the restored text
+            return
 
         # 1) Day label
-        day = self.hass.states.get("sensor.yiddish_day_label")
-        text = day.state if day and day.state else ""
+        text = model.get(DAY_LABEL) or ""
 
         # 2) Parsha (skip if “none”/empty)
-        parsha = self.hass.states.get("sensor.molad_yiddish_parsha")
-        if parsha:
-            st = parsha.state.strip().lower()
-            if st and st != "none":
-                text += f" {parsha.state}"
-
-        # 3) Holiday via molad_yiddish_holiday attrs
-        hol = self.hass.states.get("sensor.molad_yiddish_holiday")
+        parsha = model.get(PARSHA) or ""
+        if parsha.strip().lower() not in ("", "none"):
+            text += f" {parsha}"
+
+        # 3) Holiday from the holiday flags
         picked = None
-        if hol:
-            for name, val in hol.attributes.items():
-                if val is True and name in self.ALLOWED_HOLIDAYS:
-                    picked = name
-                    break
+        for name, val in (model.get(HOLIDAY_FLAGS) or {}).items():
+            if val is True and name in self.ALLOWED_HOLIDAYS:
+                picked = name
+                break
         if picked:
             text += f" - {picked}"
 
         # 4) Rosh Chodesh
-        rosh = self.hass.states.get("sensor.rosh_chodesh_today_yiddish")
-        if rosh and rosh.state != "Not Rosh Chodesh Today":
-            text += f" ~ {rosh.state}"
+        rosh = model.get(ROSH_CHODESH_TODAY)
+        if rosh:
+            text += f" ~ {rosh}"
 
         # 5) Special Shabbos after Fri-13:00 or any Sat
-        special = self.hass.states.get("sensor.special_shabbos_yiddish")
-        if special and special.state not in ("No data", ""):
+        special = model.get(SPECIAL_SHABBOS)
+        if special:
             wd, hr = now.weekday(), now.hour
             if (wd == 4 and hr >= 13) or wd == 5:
-                text += f" ~ {special.state}"
+                text += f" ~ {special}"
 
         self._state = text
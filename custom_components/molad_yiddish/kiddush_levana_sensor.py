@@ -0,0 +1,98 @@
+# custom_components/molad_yiddish/kiddush_levana_sensor.py
+"""
+Binary sensor that is on while Kiddush Levana may be said.
+
+The window is computed once per month from the absolute molad instant; a
+single point-in-time timer is armed at its start and, once open, at its
+end, where the next month's window is computed.  Nothing polls.  Until the
+first computation (after Home Assistant has started) the sensor shows its
+restored state.
+"""
+from __future__ import annotations
+
+import datetime
+import logging
+
+from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.const import STATE_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.util import dt as dt_util
+
+from .molad_lib.kiddush_levana import KiddushLevana, kiddush_levana
+from .molad_lib.options import Options
+from .refresh import restored_attributes
+from .zmanim_sensor import location_from_hass
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class KiddushLevanaSensor(RestoreEntity, BinarySensorEntity):
+    """On from 3 (or 7) days after the molad until the middle of the month."""
+
+    _attr_name = "Molad Yiddish Kiddush Levana"
+    _attr_unique_id = "molad_yiddish_kiddush_levana"
+    _attr_icon = "mdi:moon-waxing-crescent"
+    _attr_should_poll = False
+
+    def __init__(
+        self, hass: HomeAssistant, havdalah_offset: int, minhag_days: int
+    ) -> None:
+        super().__init__()
+        self.hass = hass
+        self._location = location_from_hass(hass)
+        self._options = Options(havdalah_offset=havdalah_offset, kiddush_levana_days=minhag_days)
+        self._window: KiddushLevana | None = None
+        self._unsub_timer = None
+        self._attr_is_on = False
+        self._attr_extra_state_attributes = {}
+
+    async def async_added_to_hass(self) -> None:
+        # restore the last state; the first computation runs once HA has started
+        await super().async_added_to_hass()
+        last = await self.async_get_last_state()
+        if last:
+            self._attr_is_on = last.state == STATE_ON
+            self._attr_extra_state_attributes = restored_attributes(last)
+        self.async_on_remove(self._cancel_timer)
+
+    def _cancel_timer(self) -> None:
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    async def async_apply_options(self, options: Options) -> bool:
+        """Take the new havdalah offset; the window found under the old one is dropped."""
+        if options.havdalah_offset == self._options.havdalah_offset:
+            return False
+        self._options = self._options._replace(havdalah_offset=options.havdalah_offset)
+        self._window = None
+        return True
+
+    async def _update_state(self, now: datetime.datetime | None = None) -> None:
+        now = now or dt_util.now()
+        if self._window is None or now >= self._window.end:
+            self._window = await self.hass.async_add_executor_job(
+                kiddush_levana, now, self._location, self._options
+            )
+        window = self._window
+
+        self._attr_is_on = window.is_open(now)
+        motzei = [m.isoformat() for m in window.motzei_shabbos]
+        self._attr_extra_state_attributes = {
+            "molad": window.molad.isoformat(),
+            "window_start": window.start.isoformat(),
+            "window_end": window.end.isoformat(),
+            "minhag_days": self._options.kiddush_levana_days,
+            "motzei_shabbos": motzei,
+            "first_motzei_shabbos": motzei[0] if motzei else None,
+            "motzei_shabbos_in_window": bool(motzei),
+        }
+        self.async_write_ha_state()
+
+        # next flip: the window opening, else its closing
+        self._cancel_timer()
+        self._unsub_timer = async_track_point_in_time(
+            self.hass, self._update_state, window.start if now < window.start else window.end
+        )
@@ -0,0 +1,74 @@
+# custom_components/molad_yiddish/learning_sensor.py
+"""
+Today's Daf Yomi, Mishnah Yomis and Rambam.
+
+The portion is a table lookup (see molad_lib.learning), so each sensor just
+recomputes it once a day, right after midnight.  Until the first
+computation (after Home Assistant has started) it shows its restored state.
+"""
+from __future__ import annotations
+
+import datetime
+
+from homeassistant.components.sensor import SensorEntity
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.util import dt as dt_util
+
+from .molad_lib.helper import int_to_hebrew
+from .molad_lib.learning import DAF_YOMI, MISHNAH_YOMIS, RAMBAM, learning_portion
+from .refresh import restored_attributes
+
+# key → (name, icon)
+LEARNING_SENSORS = {
+    DAF_YOMI: ("Daf Yomi", "mdi:book-open-variant"),
+    MISHNAH_YOMIS: ("Mishnah Yomis", "mdi:book-open-page-variant-outline"),
+    RAMBAM: ("Rambam Yomi", "mdi:book-education-outline"),
+}
+
+
+class LearningSensor(RestoreEntity, SensorEntity):
+    """Today's portion of one learning cycle, e.g. "בכורות ל״א"."""
+
+    _attr_should_poll = False
+
+    def __init__(self, cycle: str) -> None:
+        super().__init__()
+        name, icon = LEARNING_SENSORS[cycle]
+        self._cycle = cycle
+        self._attr_name = f"Molad Yiddish {name}"
+        self._attr_unique_id = f"molad_yiddish_{cycle}"
+        self._attr_icon = icon
+        self._attr_native_value = None
+        self._attr_extra_state_attributes = {}
+
+    async def async_added_to_hass(self) -> None:
+        # restore the last state; the first computation runs once HA has started
+        await super().async_added_to_hass()
+        last = await self.async_get_last_state()
+        if last and last.state not in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+            self._attr_native_value = last.state
+            self._attr_extra_state_attributes = restored_attributes(last)
+        self.async_on_remove(
+            async_track_time_change(
+                self.hass, self._handle_midnight, hour=0, minute=0, second=5
+            )
+        )
+
+    async def _handle_midnight(self, now: datetime.datetime) -> None:
+        await self._update_state()
+
+    async def _update_state(self) -> None:
+        portion = learning_portion(self._cycle, dt_util.now().date())
+        if portion is None:
+            return
+        self._attr_native_value = portion.text
+        self._attr_extra_state_attributes = {
+            "cycle": portion.number,
+            "cycle_hebrew": int_to_hebrew(portion.number),
+            "day_of_cycle": portion.day,
+            "book": portion.units[0].book,
+            "units": [list(unit) for unit in portion.units],
+        }
+        self.async_write_ha_state()
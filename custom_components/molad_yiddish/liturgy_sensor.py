@@ -0,0 +1,143 @@
+# custom_components/molad_yiddish/liturgy_sensor.py
+"""
+Sensors for what is said in davening today: Tachanun, Hallel, Yaaleh
+Veyavo, Al HaNissim, Mashiv Haruach / Morid HaTal and Tal Umatar.
+
+DailyLiturgy looks the liturgical day up in the precomputed year table and
+arms a single point-in-time timer at the sunset where the next different
+day begins; when it fires, only the sensors whose text changed are
+written.  Until the first lookup (after Home Assistant has started) the
+sensors show their restored values.
+"""
+from __future__ import annotations
+
+import datetime
+import logging
+
+from homeassistant.components.sensor import RestoreSensor
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+from .molad_lib.liturgy import Liturgy, liturgy, liturgy_texts, next_change
+from .molad_lib.options import Options
+from .zmanim_sensor import location_from_hass
+
+_LOGGER = logging.getLogger(__name__)
+
+# Liturgy field → (entity name, icon)
+LITURGY_SENSORS: dict[str, tuple[str, str]] = {
+    "tachanun":       ("Tachanun",        "mdi:book-open-variant"),
+    "hallel":         ("Hallel",          "mdi:music-clef-treble"),
+    "yaaleh_veyavo":  ("Yaaleh Veyavo",   "mdi:calendar-plus"),
+    "al_hanissim":    ("Al HaNissim",     "mdi:candelabra"),
+    "mashiv_haruach": ("Mashiv Haruach",  "mdi:weather-windy"),
+    "tal_umatar":     ("Tal Umatar",      "mdi:weather-pouring"),
+}
+
+
+class DailyLiturgy:
+    """Owns today's Liturgy and the single timer that advances it."""
+
+    def __init__(self, hass: HomeAssistant, candle_offset: int, havdalah_offset: int) -> None:
+        self.hass = hass
+        self._location = location_from_hass(hass)
+        self._options = Options(candle_offset, havdalah_offset)
+        self._entities: dict[str, LiturgySensor] = {}
+        self._unsub_timer = None
+        self.value: Liturgy | None = None
+        self.texts: dict[str, str] = {}
+        self.ready = False
+
+    def register(self, entity: LiturgySensor) -> None:
+        self._entities[entity.key] = entity
+
+    async def async_start(self) -> None:
+        await self._async_refresh(dt_util.now())
+        self.ready = True
+        for entity in self._entities.values():
+            if entity.hass is not None:
+                entity.async_write_ha_state()
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    async def async_apply_options(self, options: Options) -> bool:
+        """Look today up again under the new offsets and re-arm."""
+        old, self._options = self._options, self._options.with_offsets(options)
+        if self._options == old or not self.ready:
+            return False
+        self.async_stop()
+        await self.async_start()
+        return True
+
+    def _compute(
+        self, now: datetime.datetime
+    ) -> tuple[Liturgy, datetime.datetime | None]:
+        return (
+            liturgy(now, self._location, self._options),
+            next_change(now, self._location, self._options),
+        )
+
+    async def _async_refresh(self, now: datetime.datetime) -> set[str]:
+        """Look *now* up and re-arm; returns the keys whose text changed."""
+        self.value, change = await self.hass.async_add_executor_job(self._compute, now)
+        old, self.texts = self.texts, liturgy_texts(self.value)
+        if change is None:
+            _LOGGER.warning("No liturgy change found after %s", now)
+        else:
+            self._unsub_timer = async_track_point_in_time(
+                self.hass, self._handle_change, change
+            )
+        return {key for key, text in self.texts.items() if old.get(key) != text}
+
+    async def _handle_change(self, now: datetime.datetime) -> None:
+        self._unsub_timer = None
+        for key in await self._async_refresh(now):
+            entity = self._entities.get(key)
+            if entity is not None and entity.hass is not None:
+                entity.async_write_ha_state()
+
+
+class LiturgySensor(RestoreSensor):
+    """Whether (or which form of) one insertion is said today."""
+
+    _attr_should_poll = False
+
+    def __init__(self, daily: DailyLiturgy, key: str) -> None:
+        super().__init__()
+        self._daily = daily
+        self.key = key
+        name, icon = LITURGY_SENSORS[key]
+        self._attr_name = name
+        self._attr_icon = icon
+        self._attr_unique_id = f"molad_yiddish_liturgy_{key}"
+        self._restored: str | None = None
+        self._restored_attrs: dict[str, bool | str | None] = {}
+        daily.register(self)
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        last = await self.async_get_last_sensor_data()
+        if last:
+            self._restored = last.native_value
+        last_state = await self.async_get_last_state()
+        if last_state:
+            self._restored_attrs = {"value": last_state.attributes.get("value")}
+
+    @property
+    def native_value(self) -> str | None:
+        if not self._daily.ready:
+            return self._restored
+        return self._daily.texts.get(self.key)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, bool | str | None]:
+        if not self._daily.ready:
+            return self._restored_attrs
+        # the raw value for automations: a bool, or full / half / none for Hallel
+        value = self._daily.value
+        return {"value": getattr(value, self.key) if value else None}
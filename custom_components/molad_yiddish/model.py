@@ -0,0 +1,104 @@
+# custom_components/molad_yiddish/model.py
+"""
+Typed results shared by the entities of one config entry.
+
+Source entities publish what they computed into the entry's EntryModel
+(e.g. the molad's Rosh Chodesh nightfalls as datetimes, the full holiday
+flag dict) instead of composites reading it back from the state machine.
+Composite entities subscribe to the fields they depend on.
+
+Setting a field notifies its subscribers synchronously, and a composite
+publishes its own field from that callback, so derived values are always
+recomputed before whatever depends on them (molad → Rosh Chodesh today →
+full display) and nobody sees a stale or half-updated set of fields.
+
+Entities reading single keys of a dict field declare them (async_want), so
+the source can skip computing keys nobody reads (e.g. the flags of disabled
+holiday binary sensors).
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+import datetime
+from typing import Any, NamedTuple
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DATA_MODEL
+
+# Fields (value type)
+MOLAD = "molad"                            # MoladState
+DAY_LABEL = "day_label"                    # str
+PARSHA = "parsha"                          # str ("none" on a Yom Tov Shabbos)
+HOLIDAY_FLAGS = "holiday_flags"            # dict[str, bool | str | None]
+ROSH_CHODESH_TODAY = "rosh_chodesh_today"  # str, or None when not Rosh Chodesh
+SPECIAL_SHABBOS = "special_shabbos"        # str ("" when none)
+
+
+class MoladState(NamedTuple):
+    """What the molad sensor computed that others depend on."""
+
+    text: str
+    month_name: str
+    rosh_chodesh_nightfalls: tuple[datetime.datetime, ...]
+
+
+class EntryModel:
+    """Latest typed value of every field, with per-field subscriptions."""
+
+    def __init__(self) -> None:
+        self._values: dict[str, Any] = {}
+        self._subscribers: defaultdict[str, list[Callable[[], None]]] = defaultdict(list)
+        self._wanted: defaultdict[str, set[str]] = defaultdict(set)
+
+    def has(self, field: str) -> bool:
+        return field in self._values
+
+    def get(self, field: str, default: Any = None) -> Any:
+        return self._values.get(field, default)
+
+    @callback
+    def async_set(self, field: str, value: Any) -> None:
+        """Store *value* and, if it changed, notify the field's subscribers."""
+        if field in self._values and self._values[field] == value:
+            return
+        self._values[field] = value
+        for notify in list(self._subscribers[field]):
+            notify()
+
+    @callback
+    def async_subscribe(
+        self, fields: Iterable[str], notify: Callable[[], None]
+    ) -> CALLBACK_TYPE:
+        """Call *notify* whenever one of *fields* changes; returns the unsubscribe."""
+        fields = list(fields)
+        for field in fields:
+            self._subscribers[field].append(notify)
+
+        @callback
+        def _unsubscribe() -> None:
+            for field in fields:
+                self._subscribers[field].remove(notify)
+
+        return _unsubscribe
+
+    def wanted(self, field: str) -> frozenset[str]:
+        """The keys of dict *field* that some entity declared it reads."""
+        return frozenset(self._wanted[field])
+
+    @callback
+    def async_want(self, field: str, key: str) -> CALLBACK_TYPE:
+        """Declare that the caller reads *key* of *field*; returns the release."""
+        self._wanted[field].add(key)
+
+        @callback
+        def _release() -> None:
+            self._wanted[field].discard(key)
+
+        return _release
+
+
+def get_model(hass: HomeAssistant, entry_id: str) -> EntryModel:
+    """The entry's model, created on first use by either platform."""
+    return hass.data.setdefault(DATA_MODEL, {}).setdefault(entry_id, EntryModel())
@@ -1,4 +1,66 @@
-"""Vendored Molad helper library."""
+"""Vendored Molad helper library.
+
+Home Assistant independent: every public function takes an explicit
+``(now, location, options)`` (or a plain date) and returns plain values.
+"""
+from .day_mode import DayMode, DayModeTimeline, build_day_modes
+from .events import Transition, TransitionSchedule, build_transitions
+from .fasts import Fast, next_fast
 from .helper import MoladHelper
+from .holidays import holiday_flags, is_no_music, pick_holiday
+from .kiddush_levana import KiddushLevana, kiddush_levana
+from .learning import Portion, learning_portion, learning_schedule
+from .liturgy import Liturgy, liturgy
+from .options import Options
+from .rules import HOLIDAY_RULES, HolidayRule, RuleTable
+from .schedule import erev_state
+from .sfirah_helper import middos_text, omer_day, sefirah_text
+from .specials import get_special_shabbos_name
+from .weekly import parsha_name, perek_avot
+from .yahrzeit import Anniversary, AnniversaryIndex, anniversary_date
+from .yiddish import day_label, in_mevorchim_window, molad_announcement, yiddish_date
+from .zmanim import Location, Zmanim, compute_zmanim, zmanim_for_day
 
-__all__ = ["MoladHelper"]
+__all__ = [
+    "Anniversary",
+    "AnniversaryIndex",
+    "DayMode",
+    "DayModeTimeline",
+    "Fast",
+    "HOLIDAY_RULES",
+    "HolidayRule",
+    "KiddushLevana",
+    "Liturgy",
+    "Location",
+    "MoladHelper",
+    "Options",
+    "Portion",
+    "RuleTable",
+    "Transition",
+    "TransitionSchedule",
+    "Zmanim",
+    "anniversary_date",
+    "build_day_modes",
+    "build_transitions",
+    "compute_zmanim",
+    "day_label",
+    "erev_state",
+    "get_special_shabbos_name",
+    "holiday_flags",
+    "in_mevorchim_window",
+    "is_no_music",
+    "kiddush_levana",
+    "learning_portion",
+    "learning_schedule",
+    "liturgy",
+    "middos_text",
+    "molad_announcement",
+    "next_fast",
+    "omer_day",
+    "parsha_name",
+    "perek_avot",
+    "pick_holiday",
+    "sefirah_text",
+    "yiddish_date",
+    "zmanim_for_day",
+]
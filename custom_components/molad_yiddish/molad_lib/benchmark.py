@@ -0,0 +1,565 @@
+# custom_components/molad_yiddish/molad_lib/benchmark.py
+"""
+Benchmark of the update profiles.
+
+Replays a span of simulated time for every profile and, for each refresh
+the profile would schedule, runs the calendar / solar work the
+interval-refreshed sensors do.  Reported per simulated day:
+
+    * wake-ups   – timer callbacks of the refreshed sensors
+    * CPU ms     – process time spent in that calendar / solar work
+    * rows       – recorder rows, i.e. refreshes whose state or
+                   attributes differ from the previous ones (HA drops
+                   writes that change nothing)
+
+The Erev and melacha sensors are replayed at the boundaries their timers
+fire at, the same in every profile.  Home Assistant itself is not loaded,
+so the state machine and recorder overhead per row is not included; rows
+are the figure to compare.
+
+With --startup it instead times, from cold caches, the first computation of
+every sensor and shared table: the work that used to run inside platform
+setup (update_before_add) and now runs once Home Assistant has started.
+
+With --molad it counts the calendar calls MoladHelper makes for the hourly
+refreshes of the molad and upcoming-mevorchim sensors, with and without its
+per-Hebrew-month cache.
+
+With --loop-stall it replays the minute ticks of the minute-tier sensors on
+an asyncio loop and reports the longest loop stall (the longest time the
+loop ran without getting back to other work), unbatched – every sensor and
+holiday binary sensor computing and writing in the same iteration – and
+batched, as refresh.py does it: one sensor computed per iteration, only the
+flags that changed written, at most _WRITES_PER_ITERATION writes per
+iteration.  A state write is stood in for by serialising its state_changed
+event, as the recorder does; the state machine's own work is not included.
+
+With --footprint it builds 100 years of the precomputed tables (the
+liturgy year tables, MoladHelper's month facts and the melacha tables) and
+reports the memory the first 1, 10 and 100 years keep alive: each slice is
+unpickled under tracemalloc, so only the tables themselves are counted.
+Building the melacha tables takes a few minutes.
+
+From custom_components/molad_yiddish:
+
+    python -m molad_lib.benchmark --start 2025-03-01 --days 7
+    python -m molad_lib.benchmark --startup
+    python -m molad_lib.benchmark --molad --days 30
+    python -m molad_lib.benchmark --loop-stall --start 2025-03-07 --days 1
+    python -m molad_lib.benchmark --footprint
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from contextlib import contextmanager
+import datetime
+from datetime import timedelta
+import gc
+from itertools import islice
+import json
+import pickle
+import sys
+import time
+import tracemalloc
+
+from astral import LocationInfo
+from astral.sun import sun
+from pyluach.parshios import getparsha_string
+
+from . import convert, helper
+from .convert import hebrew_date, pyluach_date
+from .fasts import fast_for_day, next_fast
+from .helper import MoladHelper
+from .holidays import ALL_HOLIDAYS, holiday_flags
+from .liturgy import year_table
+from .options import Options
+from .melacha import MelachaTable
+from .profiles import DEFAULT_PROFILE, PROFILES, Profile
+from .schedule import EREV_DATES, build_schedule, next_erev_change
+from .zmanim import Location, zmanim_for_day
+
+# Default benchmark location (New York)
+_DEFAULT_LOCATION = Location(40.7128, -74.0060, "America/New_York")
+
+
+class _Model:
+    """The per-refresh work and published values of the refreshed sensors."""
+
+    def __init__(self, location: Location, profile: Profile, candle: int, havdalah: int) -> None:
+        self.location = location
+        self.profile = profile
+        self.candle = candle
+        self.havdalah = havdalah
+        self.tz = location.tz
+        self.loc = LocationInfo(
+            latitude=location.latitude, longitude=location.longitude,
+            timezone=location.time_zone,
+        )
+        self.molad = MoladHelper(None)
+        self._tables: dict[int, MelachaTable] = {}
+
+    def _sun(self, day: datetime.date) -> dict:
+        return sun(self.location.observer, date=day, tzinfo=self.tz)
+
+    def holiday(self, now: datetime.datetime) -> tuple:
+        today = now.date()
+        if now >= self._sun(today)["sunset"] - timedelta(minutes=self.candle):
+            today += timedelta(days=1)
+        hd = pyluach_date(today)
+        hebrew_date(today)
+        dawn = self._sun(today)["dawn"]
+        self._sun(today - timedelta(days=1))
+        parsha = getparsha_string(hd)
+        fast = fast_for_day(today, self.location, self.candle, self.havdalah)
+        return (hd, now >= dawn, parsha, fast.end if fast else None)
+
+    def erev(self, now: datetime.datetime) -> tuple:
+        today = now.date()
+        s = self._sun(today)
+        hd = hebrew_date(today)
+        candle_time = s["sunset"] - timedelta(minutes=self.candle)
+        is_erev = (hd.month, hd.day) in EREV_DATES or today.weekday() == 4
+        return (is_erev and s["dawn"] <= now < candle_time, today)
+
+    def erev_next(self, now: datetime.datetime) -> datetime.datetime:
+        return next_erev_change(now, self.location, Options(self.candle, self.havdalah))
+
+    def _table(self, year: int) -> MelachaTable:
+        table = self._tables.get(year)
+        if table is None:
+            table = self._tables[year] = MelachaTable(
+                year, self.loc, self.tz, self.candle, self.havdalah
+            )
+        return table
+
+    def melacha(self, now: datetime.datetime) -> tuple:
+        span, nxt = self._table(now.year).lookup(now)
+        return (span is not None, (span or nxt).start if span or nxt else None, now.date())
+
+    def melacha_next(self, now: datetime.datetime) -> datetime.datetime:
+        midnight = datetime.datetime.combine(now.date() + timedelta(days=1), datetime.time(), self.tz)
+        boundary = self._table(now.year).next_change(now)
+        return min(boundary, midnight) if boundary else midnight
+
+    def full_display(self, now: datetime.datetime) -> tuple:
+        # composed from the entry model's fields; no calendar work of its own
+        return (now.date(), now.weekday() == 4 and now.hour >= 13)
+
+    def molad_sensor(self, now: datetime.datetime) -> tuple:
+        today = now.date()
+        base = today - timedelta(days=15) if hebrew_date(today).day < 3 else today
+        details = self.molad.get_molad(base)
+        return (details.molad.friendly, details.is_shabbos_mevorchim)
+
+    def day_label(self, now: datetime.datetime) -> tuple:
+        s = self._sun(now.date())
+        return (pyluach_date(now.date()), now >= s["sunset"] - timedelta(minutes=self.candle))
+
+
+_MINUTE_TIER = ("holiday", "full_display")
+_HOURLY_TIER = ("molad_sensor", "day_label")
+# Sensors refreshed only by a timer at their next boundary: (value, next boundary)
+_TIMED = {"erev": "erev_next", "melacha": "melacha_next"}
+
+
+def _ticks(start: datetime.datetime, end: datetime.datetime, step: timedelta):
+    t = start + step
+    while t < end:
+        yield t
+        t += step
+
+
+def run_profile(
+    profile: Profile,
+    start: datetime.date,
+    days: int,
+    location: Location = _DEFAULT_LOCATION,
+    candle: int = 15,
+    havdalah: int = 72,
+) -> dict[str, float]:
+    """Simulate *days* days of refreshes under *profile*; per-day averages."""
+    model = _Model(location, profile, candle, havdalah)
+    t0 = datetime.datetime.combine(start, datetime.time(), model.tz)
+    t1 = t0 + timedelta(days=days)
+
+    # (instant, sensor) of every refresh the profile schedules
+    refreshes: list[tuple[datetime.datetime, str]] = []
+    intervals = {name: profile.minute_interval for name in _MINUTE_TIER}
+    intervals.update({name: profile.hourly_interval for name in _HOURLY_TIER})
+    for name, step in intervals.items():
+        refreshes.extend((t, name) for t in _ticks(t0, t1, step))
+    # warm the per-year melacha tables outside the timed loop, as HA does in the executor
+    model.melacha(t0)
+    model.melacha(t1)
+    for name, next_change in _TIMED.items():
+        t = getattr(model, next_change)(t0)
+        while t < t1:
+            refreshes.append((t, name))
+            t = getattr(model, next_change)(t)
+    refreshes.sort(key=lambda item: item[0])
+
+    last: dict[str, tuple] = {}
+    rows = 0
+    cpu = time.process_time()
+    for now, name in refreshes:
+        value = getattr(model, name)(now)
+        if name in _TIMED:
+            # arming the next timer is part of the refresh
+            getattr(model, _TIMED[name])(now)
+        if value != last.get(name):
+            last[name] = value
+            rows += 1
+    cpu = time.process_time() - cpu
+
+    return {
+        "wakeups": len(refreshes) / days,
+        "cpu_ms": cpu * 1000 / days,
+        "rows": rows / days,
+    }
+
+
+def startup_cost(
+    start: datetime.date,
+    location: Location = _DEFAULT_LOCATION,
+    candle: int = 15,
+    havdalah: int = 72,
+) -> dict[str, float]:
+    """Milliseconds of the first computation of each piece, from cold caches."""
+    convert.cache_clear()
+    zmanim_for_day.cache_clear()
+    model = _Model(location, PROFILES[DEFAULT_PROFILE], candle, havdalah)
+    now = datetime.datetime.combine(start, datetime.time(12), model.tz)
+
+    steps = {
+        "calendar sensors": lambda: [
+            getattr(model, name)(now) for name in _MINUTE_TIER + _HOURLY_TIER + ("erev",)
+        ],
+        "melacha table": lambda: model.melacha(now),
+        "transition schedule": lambda: build_schedule(start, location, candle, havdalah),
+        "next fast": lambda: next_fast(now, location, candle, havdalah),
+        "zmanim": lambda: zmanim_for_day(start, location, candle, havdalah),
+    }
+    costs = {}
+    for name, step in steps.items():
+        t = time.perf_counter()
+        step()
+        costs[name] = (time.perf_counter() - t) * 1000
+    costs["total"] = sum(costs.values())
+    return costs
+
+
+# Calendar functions MoladHelper calls, counted by molad_calls()
+_COUNTED = ("hebrew_date", "to_gregorian", "is_leap_year")
+
+
+@contextmanager
+def _count_calls(counts: dict[str, int]):
+    """Count calls of the helper module's calendar functions and molad announcements."""
+    originals = {name: getattr(helper, name) for name in _COUNTED}
+    announce = helper.PMonth.molad_announcement
+
+    def counting(name, fn):
+        def wrapper(*args, **kwargs):
+            counts[name] += 1
+            return fn(*args, **kwargs)
+        return wrapper
+
+    for name, fn in originals.items():
+        counts[name] = 0
+        setattr(helper, name, counting(name, fn))
+    counts["molad_announcement"] = 0
+    helper.PMonth.molad_announcement = counting("molad_announcement", announce)
+    try:
+        yield counts
+    finally:
+        for name, fn in originals.items():
+            setattr(helper, name, fn)
+        helper.PMonth.molad_announcement = announce
+
+
+def molad_calls(start: datetime.date, days: int, cache_size: int) -> dict[str, float]:
+    """Calendar calls of *days* of hourly molad / upcoming-mevorchim refreshes."""
+    molad = helper.MoladHelper(None, cache_size=cache_size)
+    counts: dict[str, int] = {}
+    refreshes = 0
+    cpu = time.process_time()
+    with _count_calls(counts):
+        for hour in range(days * 24):
+            today = start + timedelta(days=hour // 24)
+            base = today - timedelta(days=15) if hebrew_date(today).day < 3 else today
+            molad.get_molad(base)    # MoladYiddishSensor
+            molad.get_molad(today)   # UpcomingShabbosMevorchimSensor
+            refreshes += 2
+    result: dict[str, float] = dict(counts)
+    result["cpu_ms"] = (time.process_time() - cpu) * 1000
+    result["refreshes"] = refreshes
+    return result
+
+
+# as refresh._WRITES_PER_ITERATION
+_WRITES_PER_ITERATION = 8
+
+
+def _write_state(entity_id: str, value) -> None:
+    """Stand-in for one state write: its state_changed event, serialised."""
+    json.dumps({"entity_id": entity_id, "new_state": value}, default=str)
+
+
+class _StallMonitor:
+    """Records the longest gap between two of its own loop iterations."""
+
+    def __init__(self) -> None:
+        self.max_stall = 0.0
+        self.running = True
+
+    async def run(self) -> None:
+        last = time.perf_counter()
+        while self.running:
+            await asyncio.sleep(0)
+            now = time.perf_counter()
+            self.max_stall = max(self.max_stall, now - last)
+            last = now
+
+
+async def _replay_ticks(
+    compute: dict, ticks: list[datetime.datetime], batched: bool
+) -> dict[str, float]:
+    loop = asyncio.get_running_loop()
+    monitor = _StallMonitor()
+    watcher = loop.create_task(monitor.run())
+    await asyncio.sleep(0)
+    writes = 0
+    flags: dict[str, bool] = {}
+    # longest stall within each tick
+    stalls: list[float] = []
+
+    for now in ticks:
+        monitor.max_stall = 0.0
+        if not batched:
+            # every sensor's own timer, all due in the same iteration
+            done = loop.create_future()
+
+            def run(name: str) -> None:
+                nonlocal writes
+                _write_state(name, compute[name](now))
+                writes += 1
+
+            def run_flag(name: str) -> None:
+                nonlocal writes
+                _write_state(name, compute["holiday"](now)[name])
+                writes += 1
+
+            for name in compute:
+                loop.call_soon(run, name)
+            for name in ALL_HOLIDAYS:
+                loop.call_soon(run_flag, name)
+            loop.call_soon(done.set_result, None)
+            await done
+            await asyncio.sleep(0)
+            stalls.append(monitor.max_stall)
+            continue
+
+        # one group timer: one sensor per iteration, then batched writes
+        pending: dict[str, object] = {}
+        for name, fn in compute.items():
+            value = fn(now)
+            pending[name] = value
+            if name == "holiday":
+                for flag in ALL_HOLIDAYS:
+                    if value[flag] != flags.get(flag):
+                        flags[flag] = value[flag]
+                        pending[flag] = value[flag]
+            await asyncio.sleep(0)
+        while pending:
+            for key in list(islice(pending, _WRITES_PER_ITERATION)):
+                _write_state(key, pending.pop(key))
+                writes += 1
+            await asyncio.sleep(0)
+        stalls.append(monitor.max_stall)
+
+    monitor.running = False
+    await watcher
+    stalls.sort()
+    return {
+        "median_ms": stalls[len(stalls) // 2] * 1000,
+        "max_ms": stalls[-1] * 1000,
+        "writes": writes / len(ticks),
+    }
+
+
+def loop_stall(
+    start: datetime.date,
+    days: int,
+    location: Location = _DEFAULT_LOCATION,
+    candle: int = 15,
+    havdalah: int = 72,
+) -> dict[str, dict[str, float]]:
+    """Loop stalls of *days* of minute ticks, unbatched and batched.
+
+    Per run: the median over the ticks of each tick's longest stall, the
+    longest stall overall and the state writes per tick.
+    """
+    options = Options(candle, havdalah)
+    tz = location.tz
+    t0 = datetime.datetime.combine(start, datetime.time(), tz)
+    ticks = list(_ticks(t0, t0 + timedelta(days=days), timedelta(minutes=1)))
+
+    def sensors() -> dict:
+        """The minute-tier computations, from cold caches."""
+        convert.cache_clear()
+        zmanim_for_day.cache_clear()
+        model = _Model(location, PROFILES[DEFAULT_PROFILE], candle, havdalah)
+        # the holiday sensor's flags, as read by the binary sensors within one tick
+        flags_at: dict[datetime.datetime, dict] = {}
+
+        def holiday(now: datetime.datetime) -> dict:
+            if now not in flags_at:
+                flags_at.clear()
+                flags_at[now] = holiday_flags(now, location, options)
+            return flags_at[now]
+
+        return {
+            "holiday": holiday,
+            "full_display": model.full_display,
+        }
+
+    # collector pauses would swamp the stalls being compared
+    gc.disable()
+    try:
+        return {
+            label: asyncio.run(_replay_ticks(sensors(), ticks, batched))
+            for label, batched in (("unbatched", False), ("batched", True))
+        }
+    finally:
+        gc.enable()
+
+
+# Years of precomputed tables measured by footprint()
+FOOTPRINT_YEARS = (1, 10, 100)
+
+
+def _traced_size(table: object) -> int:
+    """Bytes a fresh copy of *table* keeps alive, as traced by tracemalloc."""
+    blob = pickle.dumps(table)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        copy = pickle.loads(blob)
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del copy
+    return size
+
+
+def footprint(
+    start: datetime.date,
+    years: tuple[int, ...] = FOOTPRINT_YEARS,
+    location: Location = _DEFAULT_LOCATION,
+    candle: int = 15,
+    havdalah: int = 72,
+) -> dict[int, dict[str, float]]:
+    """KiB kept alive by each precomputed table, for each count of *years* from *start*."""
+    first = hebrew_date(start).year
+    count = max(years)
+    loc = LocationInfo(
+        latitude=location.latitude, longitude=location.longitude,
+        timezone=location.time_zone,
+    )
+
+    # built once, untraced: hdate makes the melacha tables slow to compute
+    # and tracemalloc would make that many times slower
+    molad = MoladHelper(None, cache_size=0)
+    tables = {
+        "liturgy": [year_table.__wrapped__(first + i) for i in range(count)],
+        "month facts": [
+            [molad.month_facts(convert.to_gregorian(year, month, 1))
+             for month in range(1, 14 if convert.is_leap_year(year) else 13)]
+            for year in range(first, first + count)
+        ],
+        "melacha": [
+            MelachaTable(start.year + i, loc, location.tz, candle, havdalah)
+            for i in range(count)
+        ],
+    }
+    convert.cache_clear()
+
+    results = {}
+    for n in years:
+        sizes = {name: _traced_size(table[:n]) / 1024 for name, table in tables.items()}
+        sizes["total"] = sum(sizes.values())
+        results[n] = sizes
+    return results
+
+
+def format_results(results: dict[str, dict[str, float]]) -> str:
+    lines = [f"{'profile':<10} {'wake-ups/day':>13} {'CPU ms/day':>11} {'rows/day':>9}"]
+    for name, r in results.items():
+        lines.append(
+            f"{name:<10} {r['wakeups']:>13.0f} {r['cpu_ms']:>11.0f} {r['rows']:>9.0f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m molad_lib.benchmark",
+        description="Compare the refresh cost of the performance profiles.",
+    )
+    parser.add_argument("--start", type=datetime.date.fromisoformat,
+                        default=datetime.date(2025, 3, 1))
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--startup", action="store_true",
+                        help="time the first computation instead of a span of refreshes")
+    parser.add_argument("--molad", action="store_true",
+                        help="count MoladHelper's calendar calls with and without its cache")
+    parser.add_argument("--loop-stall", action="store_true",
+                        help="longest event-loop stall of the minute ticks, unbatched / batched")
+    parser.add_argument("--footprint", action="store_true",
+                        help="memory kept by 1, 10 and 100 years of precomputed tables")
+    args = parser.parse_args(argv)
+
+    if args.footprint:
+        results = footprint(args.start)
+        names = list(results[FOOTPRINT_YEARS[0]])
+        print(f"{'years':<6} " + " ".join(f"{name + ' KiB':>16}" for name in names))
+        for years, r in results.items():
+            print(f"{years:<6} " + " ".join(f"{r[name]:>16.1f}" for name in names))
+        return 0
+
+    if args.molad:
+        print(f"{'MoladHelper':<10} {'get_molad':>10} " + " ".join(
+            f"{name:>18}" for name in _COUNTED + ("molad_announcement",)
+        ) + f" {'CPU ms':>7}")
+        for label, size in (("uncached", 0), ("cached", helper._MONTH_CACHE_SIZE)):
+            r = molad_calls(args.start, args.days, size)
+            print(f"{label:<10} {r['refreshes']:>10} " + " ".join(
+                f"{r[name]:>18}" for name in _COUNTED + ("molad_announcement",)
+            ) + f" {r['cpu_ms']:>7.1f}")
+        return 0
+
+    if args.loop_stall:
+        print(f"{'writes':<10} {'median tick stall ms':>21} {'max stall ms':>13} "
+              f"{'writes/tick':>12}")
+        for label, r in loop_stall(args.start, args.days).items():
+            print(f"{label:<10} {r['median_ms']:>21.3f} {r['max_ms']:>13.3f} "
+                  f"{r['writes']:>12.1f}")
+        return 0
+
+    if args.startup:
+        for name, ms in startup_cost(args.start).items():
+            print(f"{name:<20} {ms:>8.1f} ms")
+        return 0
+
+    results = {
+        name: run_profile(profile, args.start, args.days)
+        for name, profile in PROFILES.items()
+    }
+    print(format_results(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+# custom_components/molad_yiddish/molad_lib/convert.py
+"""
+Shared, memoized Hebrew date conversion layer.
+
+Every Gregorian → Hebrew conversion in the integration goes through here so
+that the many sensors converting the same date within one minute hit a
+bounded LRU cache instead of re-running hdate / pyluach arithmetic.
+
+Months use pyluach numbering throughout: 1 = Nissan … 12 = Adar (Adar I in
+a leap year), 13 = Adar II.
+"""
+from __future__ import annotations
+
+import datetime
+from functools import lru_cache
+
+from hdate import HDateInfo
+from hdate.converters import gdate_to_jdn
+from pyluach import dates as pdates
+
+_CACHE_SIZE = 1024
+
+
+def is_leap_year(year: int) -> bool:
+    """Return True if the Hebrew *year* has two Adars."""
+    return (7 * year + 1) % 19 < 7
+
+
+class HebDate:
+    """Immutable Hebrew date of one Gregorian day."""
+
+    __slots__ = ("year", "month", "day", "leap", "weekday", "jdn")
+
+    year: int
+    month: int
+    day: int
+    leap: bool
+    weekday: int  # Python convention: Monday=0 … Sunday=6
+    jdn: int
+
+    def __init__(
+        self, year: int, month: int, day: int, leap: bool, weekday: int, jdn: int
+    ) -> None:
+        for name, value in zip(self.__slots__, (year, month, day, leap, weekday, jdn)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, HebDate):
+            return NotImplemented
+        return self.jdn == other.jdn
+
+    def __hash__(self) -> int:
+        return hash(self.jdn)
+
+    def __repr__(self) -> str:
+        return f"HebDate({self.year}, {self.month}, {self.day})"
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def hebrew_date(gdate: datetime.date) -> HebDate:
+    """Return the HebDate of a Gregorian date."""
+    heb = pdates.HebrewDate.from_pydate(gdate)
+    return HebDate(
+        heb.year,
+        heb.month,
+        heb.day,
+        is_leap_year(heb.year),
+        gdate.weekday(),
+        gdate_to_jdn(gdate),
+    )
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def pyluach_date(gdate: datetime.date) -> pdates.HebrewDate:
+    """Return the pyluach HebrewDate of a Gregorian date (holiday/festival names)."""
+    return pdates.HebrewDate.from_pydate(gdate)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def date_info(gdate: datetime.date, diaspora: bool = True) -> HDateInfo:
+    """Return the hdate HDateInfo of a Gregorian date; treat it as read-only."""
+    return HDateInfo(gdate, diaspora=diaspora)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def to_gregorian(year: int, month: int, day: int) -> datetime.date:
+    """Return the Gregorian date of a Hebrew (year, month, day)."""
+    return pdates.HebrewDate(year, month, day).to_pydate()
+
+
+_CACHED = {
+    "hebrew_date": hebrew_date,
+    "pyluach_date": pyluach_date,
+    "date_info": date_info,
+    "to_gregorian": to_gregorian,
+}
+
+
+def cache_stats() -> dict[str, dict[str, int]]:
+    """Return hit/miss statistics of every conversion cache."""
+    stats = {}
+    for name, func in _CACHED.items():
+        info = func.cache_info()
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+        }
+    return stats
+
+
+def cache_clear() -> None:
+    """Drop every cached conversion."""
+    for func in _CACHED.values():
+        func.cache_clear()
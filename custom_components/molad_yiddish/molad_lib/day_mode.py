@@ -0,0 +1,183 @@
+# custom_components/molad_yiddish/molad_lib/day_mode.py
+"""
+One "day mode" for Shabbos / Yom Tov automations.
+
+build_day_modes() lays the windows the separate sensors describe (melacha
+spans, Erev, fasts, Chol HaMoed, Motzei) on one forward timeline, the
+strongest window winning where they overlap:
+
+    shabbos / yom_tov  >  fast  >  erev_shabbos / erev_yom_tov  >  motzei
+        >  chol_hamoed  >  weekday
+
+* shabbos / yom_tov: candle-lighting until havdalah, split at sunset between
+  the days of a merged span; a Shabbos that is also Yom Tov is shabbos.
+* erev_*: alos until candle-lighting of the day before a span.
+* fast: the fast's own start (alos, or candle-lighting the evening before)
+  until its end; Yom Kippur is yom_tov.
+* motzei: havdalah until midnight.
+* chol_hamoed: the civil days of Chol HaMoed.
+
+The timeline is a sorted list of (start, mode); the mode at an instant and
+the next change are one bisect, so a sensor needs one timer per change.
+"""
+from __future__ import annotations
+
+import datetime
+from bisect import bisect_right
+from datetime import timedelta
+from typing import NamedTuple
+
+from astral.sun import sun
+
+from .convert import date_info, pyluach_date
+from .fasts import fast_for_day
+from .melacha import build_spans
+from .options import Options
+
+WEEKDAY = "weekday"
+EREV_SHABBOS = "erev_shabbos"
+EREV_YOM_TOV = "erev_yom_tov"
+SHABBOS = "shabbos"
+YOM_TOV = "yom_tov"
+CHOL_HAMOED = "chol_hamoed"
+FAST = "fast"
+MOTZEI = "motzei"
+
+DAY_MODES = (
+    WEEKDAY, EREV_SHABBOS, EREV_YOM_TOV, SHABBOS, YOM_TOV, CHOL_HAMOED, FAST, MOTZEI
+)
+
+MODE_LABELS = {
+    WEEKDAY: "וואכנטאג",
+    EREV_SHABBOS: "ערב שבת",
+    EREV_YOM_TOV: "ערב יום טוב",
+    SHABBOS: "שבת קודש",
+    YOM_TOV: "יום טוב",
+    CHOL_HAMOED: "חול המועד",
+    FAST: "תענית",
+    MOTZEI: "מוצאי",
+}
+
+# Priority of each window where windows overlap (WEEKDAY is everything else)
+_PRIORITY = {
+    SHABBOS: 5, YOM_TOV: 5, FAST: 4, EREV_SHABBOS: 3, EREV_YOM_TOV: 3,
+    MOTZEI: 2, CHOL_HAMOED: 1,
+}
+
+# Days covered by a freshly built timeline
+DEFAULT_HORIZON_DAYS = 30
+
+# Days resolved before the start, so the mode in effect there has its real
+# start: every mode begins within a week (Shabbos comes round each week)
+_LOOKBACK_DAYS = 7
+
+_CHOL_HAMOED_HOLIDAYS = ("Pesach", "Succos")
+
+
+class DayMode(NamedTuple):
+    """The mode at an instant, when it began and what follows it."""
+
+    mode: str
+    since: datetime.datetime | None
+    next_mode: str | None
+    next_start: datetime.datetime | None
+
+
+class DayModeTimeline:
+    """(start, mode) changes in time order, valid until *horizon*."""
+
+    def __init__(
+        self,
+        changes: list[tuple[datetime.datetime, str]],
+        horizon: datetime.datetime,
+    ) -> None:
+        self.starts = [start for start, _ in changes]
+        self.modes = [mode for _, mode in changes]
+        self.horizon = horizon
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def at(self, now: datetime.datetime) -> DayMode:
+        """The mode at *now* and the next change (None past the horizon)."""
+        i = bisect_right(self.starts, now) - 1
+        mode = self.modes[i] if i >= 0 else WEEKDAY
+        since = self.starts[i] if i >= 0 else None
+        if i + 1 < len(self.starts):
+            return DayMode(mode, since, self.modes[i + 1], self.starts[i + 1])
+        return DayMode(mode, since, None, None)
+
+
+def _midnight(day: datetime.date, tz: datetime.tzinfo) -> datetime.datetime:
+    return datetime.datetime.combine(day, datetime.time(), tz)
+
+
+def build_day_modes(
+    start: datetime.date,
+    location,
+    options: Options,
+    days: int = DEFAULT_HORIZON_DAYS,
+    diaspora: bool = True,
+) -> DayModeTimeline:
+    """The day-mode timeline from midnight of *start* for *days* days.
+
+    Its first change is when the mode in effect at that midnight began, e.g.
+    Friday's candle-lighting for a timeline starting on Shabbos.
+    """
+    tz = location.tz
+    first = _midnight(start, tz)
+    origin = _midnight(start - timedelta(days=_LOOKBACK_DAYS), tz)
+    last_day = start + timedelta(days=days)
+    horizon = _midnight(last_day, tz)
+
+    # (start, end, mode) windows, resolved by _PRIORITY below
+    windows: list[tuple[datetime.datetime, datetime.datetime, str]] = []
+
+    # start back from the origin so a Yom Tov chain already under way is whole
+    spans = build_spans(
+        origin.date() - timedelta(days=4), last_day, location, tz,
+        options.candle_offset, options.havdalah_offset, diaspora,
+    )
+    for span in spans:
+        bound = span.start
+        day = span.first_day
+        while day <= span.last_day:
+            end = span.end if day == span.last_day else sun(
+                location.observer, date=day, tzinfo=tz
+            )["sunset"]
+            windows.append((bound, end, SHABBOS if day.weekday() == 5 else YOM_TOV))
+            bound = end
+            day += timedelta(days=1)
+        alos = sun(location.observer, date=span.eve, tzinfo=tz)["dawn"]
+        erev = EREV_YOM_TOV if (
+            span.first_day.weekday() != 5 and date_info(span.first_day, diaspora).is_yom_tov
+        ) else EREV_SHABBOS
+        windows.append((alos, span.start, erev))
+        windows.append((span.end, _midnight(span.last_day + timedelta(days=1), tz), MOTZEI))
+
+    day = origin.date() - timedelta(days=1)
+    while day <= last_day:
+        fast = fast_for_day(day, location, options.candle_offset, options.havdalah_offset)
+        if fast is not None:
+            windows.append((fast.start, fast.end, FAST))
+        if (
+            pyluach_date(day).holiday(israel=not diaspora) in _CHOL_HAMOED_HOLIDAYS
+            and not date_info(day, diaspora).is_yom_tov
+        ):
+            next_midnight = _midnight(day + timedelta(days=1), tz)
+            windows.append((_midnight(day, tz), next_midnight, CHOL_HAMOED))
+        day += timedelta(days=1)
+
+    # the mode after every boundary; consecutive repeats collapse
+    bounds = sorted({origin, *(t for w in windows for t in w[:2] if origin < t < horizon)})
+    changes: list[tuple[datetime.datetime, str]] = []
+    for bound in bounds:
+        mode = WEEKDAY
+        for begin, end, candidate in windows:
+            if begin <= bound < end and _PRIORITY[candidate] > _PRIORITY.get(mode, 0):
+                mode = candidate
+        if not changes or changes[-1][1] != mode:
+            changes.append((bound, mode))
+    # keep from the change in effect at the first midnight
+    keep = bisect_right([bound for bound, _ in changes], first) - 1
+    return DayModeTimeline(changes[keep:], horizon)
@@ -0,0 +1,120 @@
+# custom_components/molad_yiddish/molad_lib/events.py
+"""
+Forward schedule of the instants worth an event: alos, chatzos,
+candle-lighting, havdalah, the nightfall each day of Rosh Chodesh begins
+and the nightfall of each Omer count.
+
+build_transitions() computes every instant of a span of days once, merged
+into one time-ordered list, so whoever fires them needs a single timer for
+the first instant after now and one bisect to find it.
+"""
+from __future__ import annotations
+
+import datetime
+from bisect import bisect_right
+from datetime import timedelta
+from typing import Any, NamedTuple
+
+from .convert import hebrew_date
+from .melacha import build_spans, candle_lightings
+from .options import Options
+from .sfirah_helper import _raw_omer_day
+from .yiddish import hebrew_month_name
+from .zmanim import Location, zmanim_for_day
+
+ALOS = "alos"
+CHATZOS = "chatzos"
+CANDLE_LIGHTING = "candle_lighting"
+HAVDALAH = "havdalah"
+ROSH_CHODESH_START = "rosh_chodesh_start"
+OMER_NIGHTFALL = "omer_nightfall"
+
+TRANSITION_KINDS = (
+    ALOS, CHATZOS, CANDLE_LIGHTING, HAVDALAH, ROSH_CHODESH_START, OMER_NIGHTFALL
+)
+
+# Days covered by a freshly built schedule
+DEFAULT_HORIZON_DAYS = 14
+
+
+class Transition(NamedTuple):
+    """One instant and what happens at it."""
+
+    when: datetime.datetime
+    kind: str
+    details: dict[str, Any]
+
+    def as_event(self) -> dict[str, Any]:
+        """The event data: kind, ISO time and the details."""
+        return {"kind": self.kind, "time": self.when.isoformat(), **self.details}
+
+
+class TransitionSchedule:
+    """Every transition from *start* until *horizon*, in time order."""
+
+    def __init__(self, transitions: list[Transition], horizon: datetime.datetime) -> None:
+        self.transitions = sorted(transitions, key=lambda t: (t.when, t.kind))
+        self._times = [t.when for t in self.transitions]
+        self.horizon = horizon
+
+    def __len__(self) -> int:
+        return len(self.transitions)
+
+    def next_time(self, now: datetime.datetime) -> datetime.datetime | None:
+        """The first instant strictly after *now*, or None past the horizon."""
+        i = bisect_right(self._times, now)
+        return self._times[i] if i < len(self._times) else None
+
+    def between(self, after: datetime.datetime, until: datetime.datetime) -> list[Transition]:
+        """The transitions in (after, until]."""
+        return self.transitions[bisect_right(self._times, after):bisect_right(self._times, until)]
+
+
+def build_transitions(
+    start: datetime.date,
+    location: Location,
+    options: Options,
+    days: int = DEFAULT_HORIZON_DAYS,
+    diaspora: bool = True,
+) -> TransitionSchedule:
+    """The transitions of [start, start + days)."""
+    tz = location.tz
+    last = start + timedelta(days=days - 1)
+    transitions: list[Transition] = []
+
+    for span in build_spans(
+        start - timedelta(days=4), last + timedelta(days=1), location, tz,
+        options.candle_offset, options.havdalah_offset, diaspora,
+    ):
+        details = {"name": span.name, "yom_tov": span.is_yomtov}
+        for lighting in candle_lightings(
+            span, location, tz, options.candle_offset, options.havdalah_offset
+        ):
+            transitions.append(Transition(lighting, CANDLE_LIGHTING, details))
+        transitions.append(Transition(span.end, HAVDALAH, details))
+
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        z = zmanim_for_day(day, location, options.candle_offset, options.havdalah_offset)
+        transitions.append(Transition(z.alos, ALOS, {}))
+        transitions.append(Transition(z.chatzos, CHATZOS, {}))
+
+        # tonight begins the next Hebrew day
+        tomorrow = day + timedelta(days=1)
+        hd = hebrew_date(tomorrow)
+        month = hebrew_date(tomorrow + timedelta(days=1)) if hd.day == 30 else hd
+        # Rosh Hashana is not Rosh Chodesh
+        if hd.day in (1, 30) and month.month != 7:
+            after_30th = hd.day == 1 and hebrew_date(day).day == 30
+            transitions.append(Transition(z.tzeis, ROSH_CHODESH_START, {
+                "month": hebrew_month_name(month.month, month.year),
+                "day": 2 if after_30th else 1,
+                "days": 2 if hd.day == 30 or after_30th else 1,
+            }))
+        omer = _raw_omer_day(tomorrow)
+        if omer:
+            transitions.append(Transition(z.tzeis, OMER_NIGHTFALL, {"day": omer}))
+
+    end = datetime.datetime.combine(last + timedelta(days=1), datetime.time(), tz)
+    first = datetime.datetime.combine(start, datetime.time(), tz)
+    return TransitionSchedule([t for t in transitions if first <= t.when < end], end)
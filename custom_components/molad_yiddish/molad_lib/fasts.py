@@ -0,0 +1,106 @@
+# custom_components/molad_yiddish/molad_lib/fasts.py
+"""
+Fast-day engine: when each fast starts and ends.
+
+Computed once per fast as timezone-aware datetimes so that frontends can
+render a countdown themselves instead of the integration rewriting it
+every minute.
+"""
+from __future__ import annotations
+
+import datetime
+from datetime import timedelta
+
+from astral.sun import sun
+
+from .convert import pyluach_date
+
+# Fast names as used by HolidaySensor's attributes
+FAST_DAYS = (
+    "יום הכיפורים",
+    "צום גדליה",
+    "תענית אסתר",
+    "צום עשרה בטבת",
+    "צום שבעה עשר בתמוז",
+    "תשעה באב",
+    "תשעה באב נדחה",
+)
+
+# pyluach fast_day() names (already moved off Shabbos) → FAST_DAYS names
+_PYLUACH_FASTS = {
+    "Tzom Gedalia": "צום גדליה",
+    "10 of Teves": "צום עשרה בטבת",
+    "Taanis Esther": "תענית אסתר",
+    "17 of Tamuz": "צום שבעה עשר בתמוז",
+    "9 of Av": "תשעה באב",
+}
+
+# Fasts that begin the evening before; the others begin at alos
+EVENING_FASTS = ("יום הכיפורים", "תשעה באב", "תשעה באב נדחה")
+
+# How far ahead next_fast() searches; fasts are never further apart
+_SEARCH_DAYS = 200
+
+
+class Fast:
+    """One fast day with its start and end instants."""
+
+    __slots__ = ("name", "day", "start", "end")
+
+    def __init__(
+        self, name: str, day: datetime.date, start: datetime.datetime, end: datetime.datetime
+    ) -> None:
+        self.name = name
+        self.day = day
+        self.start = start
+        self.end = end
+
+
+def fast_name(day: datetime.date) -> str | None:
+    """The fast falling on *day* (daytime), or None."""
+    heb = pyluach_date(day)
+    if heb.month == 7 and heb.day == 10:
+        return "יום הכיפורים"
+    name = _PYLUACH_FASTS.get(heb.fast_day())
+    if name == "תשעה באב" and heb.day == 10:
+        return "תשעה באב נדחה"
+    return name
+
+
+def fast_for_day(
+    day: datetime.date,
+    location,
+    candle_offset: int,
+    havdalah_offset: int,
+) -> Fast | None:
+    """Return the Fast on *day*: candle-lighting or alos start, havdalah-offset end."""
+    name = fast_name(day)
+    if name is None:
+        return None
+    tz = location.tz
+    s = sun(location.observer, date=day, tzinfo=tz)
+    if name in EVENING_FASTS:
+        eve = sun(location.observer, date=day - timedelta(days=1), tzinfo=tz)
+        start = eve["sunset"] - timedelta(minutes=candle_offset)
+    else:
+        start = s["dawn"]
+    end = s["sunset"] + timedelta(minutes=havdalah_offset)
+    return Fast(name, day, start, end)
+
+
+def next_fast(
+    now: datetime.datetime,
+    location,
+    candle_offset: int,
+    havdalah_offset: int,
+) -> Fast | None:
+    """The fast in progress at *now*, or the next one to begin."""
+    day = now.astimezone(location.tz).date()
+    for offset in range(_SEARCH_DAYS):
+        candidate = day + timedelta(days=offset)
+        if fast_name(candidate) is None:
+            continue
+        fast = fast_for_day(candidate, location, candle_offset, havdalah_offset)
+        if fast.end > now:
+            return fast
+    return None
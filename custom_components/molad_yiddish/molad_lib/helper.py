@@ -6,14 +6,15 @@ Requires:
     pip install pyluach
 """
 
+from collections import OrderedDict
+from dataclasses import dataclass
 import datetime
 import logging
 
-import hdate
-import hdate.converters
-from hdate.hebrew_date import Months, HebrewDate
 from pyluach.hebrewcal import Month as PMonth
 
+from .convert import hebrew_date, is_leap_year, to_gregorian
+
 _LOGGER = logging.getLogger(__name__)
 
 # vendored replacement for removed hdate.hebrew_date.is_shabbat
@@ -23,140 +24,192 @@ def is_shabbat(gdate: datetime.date) -> bool:
     
 # Mapping from hdate.Months.name to pyluach month number (1=Nissan … 13=Adar II)
 _HD2PY = {
-    "NISSAN":   1, "IYYAR":    2, "SIVAN":    3,
+    "NISAN":    1, "IYYAR":    2, "SIVAN":    3,
     "TAMMUZ":   4, "AV":       5, "ELUL":     6,
-    "TISHREI":  7, "CHESHVAN": 8, "MARCHESHVAN": 8, 
-    "TEVET":   10, "SHEVAT":  11, "ADAR":    12,
+    "TISHREI":  7, "CHESHVAN": 8, "MARCHESHVAN": 8,
+    "TEVET":   10, "SHVAT":   11, "ADAR":    12,
     "KISLEV":   9, "ADAR_I":  12, "ADAR_II": 13,
 }
 
+# English month names (keys of sensor.MONTH_MAPPING) by pyluach month number
+_MONTH_NAMES = {
+    1: "Nissan", 2: "Iyar", 3: "Sivan", 4: "Tammuz", 5: "Av", 6: "Elul",
+    7: "Tishri", 8: "Cheshvan", 9: "Kislev", 10: "Tevet", 11: "Shvat",
+    12: "Adar", 13: "Adar II",
+}
+
+
+def _month_name(year: int, month: int) -> str:
+    if month == 12 and is_leap_year(year):
+        return "Adar I"
+    return _MONTH_NAMES[month]
+
+@dataclass(frozen=True, slots=True)
 class Molad:
-    def __init__(self, day, hours, minutes, am_or_pm, chalakim, friendly):
-        self.day      = day
-        self.hours    = hours
-        self.minutes  = minutes
-        self.am_or_pm = am_or_pm
-        self.chalakim = chalakim
-        self.friendly = friendly
+    day: str
+    hours: int
+    minutes: int
+    am_or_pm: str
+    chalakim: int
+    friendly: str
+
 
+@dataclass(frozen=True, slots=True)
 class RoshChodesh:
-    def __init__(self, month, text, days, gdays=None):
-        self.month = month
-        self.text  = text
-        self.days  = days
-        self.gdays = gdays
+    month: str
+    text: str
+    days: tuple[str, ...]
+    gdays: tuple[datetime.date, ...] | None = None
 
+
+@dataclass(frozen=True, slots=True)
 class MoladDetails:
-    def __init__(self, molad: Molad, is_shabbos_mevorchim: bool,
-                 is_upcoming_shabbos_mevorchim: bool, rosh_chodesh: RoshChodesh):
-        self.molad = molad
-        self.is_shabbos_mevorchim = is_shabbos_mevorchim
-        self.is_upcoming_shabbos_mevorchim = is_upcoming_shabbos_mevorchim
-        self.rosh_chodesh = rosh_chodesh
+    molad: Molad
+    is_shabbos_mevorchim: bool
+    is_upcoming_shabbos_mevorchim: bool
+    rosh_chodesh: RoshChodesh
 
-class MoladHelper:
 
-    def __init__(self, config):
-        self.config = config
+@dataclass(frozen=True, slots=True)
+class MonthFacts:
+    """What one Hebrew month announces: the next month's molad, Rosh Chodesh and mevorchim."""
+
+    year: int
+    month: int
+    molad: Molad
+    rosh_chodesh: RoshChodesh
+    # Shabbos Mevorchim of the coming month (None before Tishrei)
+    mevorchim: datetime.date | None
 
-    def get_actual_molad(self, date: datetime.date) -> Molad:
-        nxt = self.get_next_numeric_month_year(date)
-        year, cust_month = nxt["year"], nxt["month"]
 
-        hd_name = Months(cust_month).name.replace(" ", "_").upper()
-        py_month = _HD2PY[hd_name]
-        pm = PMonth(year, py_month)
-        ann = pm.molad_announcement()
+# Hebrew months kept per MoladHelper (two years' worth)
+_MONTH_CACHE_SIZE = 26
 
+
+class MoladHelper:
+
+    def __init__(self, config, cache_size: int = _MONTH_CACHE_SIZE):
+        self.config = config
+        self._cache_size = cache_size
+        self._months: OrderedDict[tuple[int, int], MonthFacts] = OrderedDict()
+        self.hits = self.misses = 0
+
+    def month_facts(self, date: datetime.date) -> MonthFacts:
+        """The facts of the Hebrew month *date* falls in, computed once per month."""
+        h = hebrew_date(date)
+        key = (h.year, h.month)
+        facts = self._months.get(key)
+        if facts is not None:
+            self.hits += 1
+            self._months.move_to_end(key)
+            return facts
+        self.misses += 1
+        facts = self._compute_month(h.year, h.month)
+        if self._cache_size:
+            self._months[key] = facts
+            if len(self._months) > self._cache_size:
+                self._months.popitem(last=False)
+        return facts
+
+    def cache_clear(self) -> None:
+        self._months.clear()
+        self.hits = self.misses = 0
+
+    def _compute_month(self, year: int, month: int) -> MonthFacts:
+        this_m = {"year": year, "month": month}
+        next_m = self._next_month(year, month)
+
+        # Molad of the coming month
+        ann = PMonth(next_m["year"], next_m["month"]).molad_announcement()
         wd = ann["weekday"]
         h24 = ann["hour"]
         mins = ann["minutes"]
         parts = ann["parts"]
-
         ampm = "am" if h24 < 12 else "pm"
         h12 = h24 % 12 or 12
         day_name = ["Sunday","Monday","Tuesday","Wednesday","Thursday","Friday","Shabbos"][wd-1]
         friendly = f"{day_name}, {h12}:{mins:02d} {ampm} and {parts} chalakim"
+        molad = Molad(day_name, h12, mins, ampm, parts, friendly)
+
+        # Rosh Chodesh: the 30th of this month (if it has one) and the 1st of the next
+        first_next = self.get_gdate(next_m, 1)
+        length = (first_next - self.get_gdate(this_m, 1)).days
+        days, gdays = [], []
+        if length >= 30:
+            g1 = first_next - datetime.timedelta(days=1)
+            days.append(self.get_day_of_week(g1))
+            gdays.append(g1)
+        days.append(self.get_day_of_week(first_next))
+        gdays.append(first_next)
+        text = " & ".join(days) if len(days) == 2 else days[0]
+        rosh_chodesh = RoshChodesh(
+            _month_name(next_m["year"], next_m["month"]), text, tuple(days), tuple(gdays)
+        )
 
-        return Molad(day_name, h12, mins, ampm, parts, friendly)
+        # The Shabbos before Rosh Chodesh; a week earlier when Rosh Chodesh is on
+        # Shabbos.  No mevorchim for Tishrei (Shabbos before Rosh Hashana).
+        mevorchim = None
+        if next_m["month"] != 7:
+            days_back = (gdays[0].weekday() - 5) % 7 or 7
+            mevorchim = gdays[0] - datetime.timedelta(days=days_back)
 
-    def get_numeric_month_year(self, date):
-        j = hdate.converters.gdate_to_jdn(date)
-        h = HebrewDate.from_jdn(j)
-        return {"year": h.year, "month": h.month.value}
+        return MonthFacts(year, month, molad, rosh_chodesh, mevorchim)
 
-    def get_next_numeric_month_year(self, date):
-        d = self.get_numeric_month_year(date)
-        y, m = d["year"], d["month"]
-        if m == 12 and not HebrewDate(y, m, 1).is_leap_year():
-            m, y = 1, y + 1
-        elif m == 13:
-            m, y = 1, y + 1
+    def get_actual_molad(self, date: datetime.date) -> Molad:
+        return self.month_facts(date).molad
+
+    def get_numeric_month_year(self, date):
+        """Hebrew year and month (pyluach numbering, 1=Nissan) of a Gregorian date."""
+        h = hebrew_date(date)
+        return {"year": h.year, "month": h.month}
+
+    @staticmethod
+    def _next_month(y: int, m: int) -> dict[str, int]:
+        if m == 6:
+            # Elul → Tishrei opens the next year
+            m, y = 7, y + 1
+        elif m == 13 or (m == 12 and not is_leap_year(y)):
+            m = 1
         else:
             m += 1
         return {"year": y, "month": m}
 
+    def get_next_numeric_month_year(self, date):
+        d = self.get_numeric_month_year(date)
+        return self._next_month(d["year"], d["month"])
+
     def get_gdate(self, numeric_date, day):
-        hd = hdate.HebrewDate(numeric_date["year"], numeric_date["month"], day)
-        jdn = hd.to_jdn()
-        return hdate.converters.jdn_to_gdate(jdn)
+        return to_gregorian(numeric_date["year"], numeric_date["month"], day)
 
     def get_day_of_week(self, g):
         wd = g.strftime("%A")
         return "Shabbos" if wd == "Saturday" else wd
 
     def get_rosh_chodesh_days(self, date) -> RoshChodesh:
-        this_m = self.get_numeric_month_year(date)
-        next_m = self.get_next_numeric_month_year(date)
-        mon = Months(next_m["month"]).name.title()
-
-        cm = Months(this_m["month"])
-        length = cm.days(this_m["year"]) if callable(cm.days) else cm.length
-
-        days, gdays = [], []
-        if length >= 30:
-            g1 = self.get_gdate(this_m, 30)
-            days.append(self.get_day_of_week(g1))
-            gdays.append(g1)
-
-        g2 = self.get_gdate(next_m, 1)
-        days.append(self.get_day_of_week(g2))
-        gdays.append(g2)
-
-        text = " & ".join(days) if len(days) == 2 else days[0]
-        return RoshChodesh(mon, text, days, gdays)
+        return self.month_facts(date).rosh_chodesh
 
     def get_shabbos_mevorchim_hebrew_day_of_month(self, date):
-        gdays = self.get_rosh_chodesh_days(date).gdays
-        if not gdays:
-            return None
-        rc = gdays[0]
-        days_back = (rc.weekday() - 5) % 7
-        sat = rc - datetime.timedelta(days=days_back)
-        return HebrewDate.from_gdate(sat).day
+        mevorchim = self.month_facts(date).mevorchim
+        return hebrew_date(mevorchim).day if mevorchim else None
 
     def is_shabbos_mevorchim(self, date) -> bool:
-        if not is_shabbat(date):
-            return False
-        hd = HebrewDate.from_gdate(date).day
-        smd = self.get_shabbos_mevorchim_hebrew_day_of_month(date)
-        month = self.get_numeric_month_year(date)["month"]
-        return (hd == smd) and (month != Months.ELUL.value)
+        return is_shabbat(date) and self.month_facts(date).mevorchim == date
 
     def is_upcoming_shabbos_mevorchim(self, date) -> bool:
         sat = date + datetime.timedelta(days=(5 - date.weekday()) % 7 or 7)
         return self.is_shabbos_mevorchim(sat)
 
     def get_molad(self, date) -> MoladDetails:
-        m = self.get_actual_molad(date)
-        ism = self.is_shabbos_mevorchim(date)
+        facts = self.month_facts(date)
+        ism = is_shabbat(date) and facts.mevorchim == date
         isu = self.is_upcoming_shabbos_mevorchim(date)
-        rc = self.get_rosh_chodesh_days(date)
-        return MoladDetails(m, ism, isu, rc)
+        return MoladDetails(facts.molad, ism, isu, facts.rosh_chodesh)
+
+
 def int_to_hebrew(num: int) -> str:
     """
     Convert an integer (1–400+) into Hebrew letters with geresh/gershayim.
-    E.g. 5 → 'ה׳', 15 → 'טו״', 100 → 'ק׳'
+    E.g. 5 → 'ה׳', 15 → 'ט״ו', 100 → 'ק׳'
     """
     mapping = [
         (400, "ת"), (300, "ש"), (200, "ר"), (100, "ק"),
@@ -170,6 +223,8 @@ def int_to_hebrew(num: int) -> str:
         while num >= value:
             result += letter
             num -= value
+    # 15 and 16 are written ט״ו / ט״ז, never spelling the Name
+    result = result.replace("יה", "טו").replace("יו", "טז")
     # add gershayim for multi-letter, geresh for single
     if len(result) > 1:
         return f"{result[:-1]}\u05F4{result[-1]}"
@@ -0,0 +1,100 @@
+# custom_components/molad_yiddish/molad_lib/holidays.py
+"""
+Holiday, fast-day and custom-period flags.
+
+holiday_flags() answers, for one instant, every flag HolidaySensor exposes
+(the day rolls over at candle-lighting; each rule's boundaries come from
+the rule table, e.g. Erev flags start at alos), and pick_holiday() chooses
+the one shown as the sensor's state.
+"""
+from __future__ import annotations
+
+from collections.abc import Collection
+import datetime
+from datetime import timedelta
+from functools import lru_cache
+
+from astral.sun import sun
+from pyluach.parshios import getparsha_string
+
+from .convert import hebrew_date, pyluach_date
+from .fasts import fast_for_day
+from .options import Options
+from .rules import CANDLE_LIGHTING, DAWN, HOLIDAY_RULES, NO_MUSIC, SUNSET
+from .zmanim import Location
+
+# ─── THE FULL SET of every holiday detected (for attributes) ───
+ALL_HOLIDAYS: tuple[str, ...] = HOLIDAY_RULES.names
+
+# ─── Only these may become the holiday sensor's state, in priority order ───
+ALLOWED_HOLIDAYS: tuple[str, ...] = HOLIDAY_RULES.allowed
+
+
+@lru_cache(maxsize=8)
+def _template(names: frozenset[str] | None) -> dict[str, bool | str | None]:
+    """Every flag of *names* (all when None) cleared, in attribute order."""
+    wanted = ALL_HOLIDAYS if names is None else [n for n in ALL_HOLIDAYS if n in names]
+    attrs: dict[str, bool | str | None] = dict.fromkeys(wanted, False)
+    attrs["מען פאַסט אויס און"] = None
+    attrs["fast_start"] = None
+    attrs["fast_end"] = None
+    return attrs
+
+
+def holiday_flags(
+    now: datetime.datetime,
+    location: Location,
+    options: Options,
+    names: Collection[str] | None = None,
+) -> dict[str, bool | str | None]:
+    """Every holiday flag at *now*, plus the fast start / end timestamps.
+
+    With *names*, only those flags are evaluated and returned.
+    """
+    # 1) Determine "today" in local tz, bump past sunset for candle-lighting
+    tz = location.tz
+    now = now.astimezone(tz)
+    today = now.date()
+    s = sun(location.observer, date=today, tzinfo=tz)
+    if now >= s["sunset"] - timedelta(minutes=options.candle_offset):
+        today += timedelta(days=1)
+
+    # 2) Zmanim bounding the rules within the day
+    dawn = sun(location.observer, date=today, tzinfo=tz)["dawn"]
+    yesterday_sunset = sun(
+        location.observer, date=today - timedelta(days=1), tzinfo=tz
+    )["sunset"]
+    opens = {CANDLE_LIGHTING: True, DAWN: now >= dawn, SUNSET: now >= yesterday_sunset}
+    closes = {CANDLE_LIGHTING: True, DAWN: now < dawn}
+
+    # 3) Build the attrs dict in order
+    attrs = _template(None if names is None else frozenset(names)).copy()
+
+    # 4) Every rule falling on the (effective) day, within its boundaries
+    parsha = None
+    if not HOLIDAY_RULES.parsha_names.isdisjoint(attrs):
+        parsha = (getparsha_string(pyluach_date(today)) or "").upper()
+    for rule in HOLIDAY_RULES.matches(today, hebrew_date(today), parsha):
+        if rule.name in attrs and opens[rule.start] and closes[rule.end]:
+            attrs[rule.name] = True
+
+    # ── Fast start / end as timestamps, fixed for the whole fast ──
+    fast = fast_for_day(today, location, options.candle_offset, options.havdalah_offset)
+    attrs["מען פאַסט אויס און"] = fast.end.isoformat() if fast else None
+    attrs["fast_start"] = fast.start.isoformat() if fast else None
+    attrs["fast_end"] = fast.end.isoformat() if fast else None
+
+    return attrs
+
+
+def pick_holiday(flags: dict[str, bool | str | None]) -> str:
+    """The first allowed holiday that is set, or ""."""
+    for name in ALLOWED_HOLIDAYS:
+        if flags.get(name) is True:
+            return name
+    return ""
+
+
+def is_no_music(day: datetime.date) -> bool:
+    """Sefirah (except Lag BaOmer) and the Three Weeks."""
+    return any(HOLIDAY_RULES.matches(day, hebrew_date(day), tag=NO_MUSIC))
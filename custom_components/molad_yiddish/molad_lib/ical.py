@@ -0,0 +1,322 @@
+# custom_components/molad_yiddish/molad_lib/ical.py
+"""
+iCalendar (.ics) export of the luach.
+
+Holidays (consecutive days of one holiday become one event), special
+Shabbosos and candle-lighting / havdalah times of one location are turned
+into VEVENTs through a chain of generators, one Gregorian year at a time
+(a holiday running over New Year is finished by the year it starts in):
+
+    luach rows of a year → events → folded .ics lines
+
+Each year is written as a fragment into a cache directory together with a
+content hash of its inputs (location, offsets, year).  An export only
+regenerates the years whose hash changed and then streams the fragments
+into the final file, so a 20-year export never holds more than one year in
+memory and re-exporting after a change of offsets is a rebuild, otherwise a
+copy.  From custom_components/molad_yiddish:
+
+    python -m molad_lib.ical 40.6782 -73.9442 America/New_York luach.ics \\
+        --start-year 2025 --years 20 --candle-offset 18
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+from datetime import timedelta
+import hashlib
+from itertools import groupby
+import json
+import os
+from pathlib import Path
+import sys
+from collections.abc import Iterable, Iterator
+from typing import NamedTuple
+
+from .luach import LuachLocation, luach_rows
+from .options import Options
+from .zmanim import Location
+
+# Bumped whenever the generated events change, so cached years are rebuilt
+ICAL_VERSION = 4
+
+DEFAULT_CALENDAR_NAME = "Molad Yiddish"
+
+_PRODID = "-//molad_yiddish//luach//YI"
+_MANIFEST = "manifest.json"
+# RFC 5545: lines longer than 75 octets are folded
+_MAX_LINE_OCTETS = 75
+
+CANDLE_LIGHTING_SUMMARY = "הדלקת נרות"
+HAVDALAH_SUMMARY = "הבדלה"
+
+
+class Event(NamedTuple):
+    """One VEVENT; all-day when *start* / *end* are dates (end exclusive)."""
+
+    uid: str
+    summary: str
+    start: datetime.date | datetime.datetime
+    end: datetime.date | datetime.datetime
+    category: str
+
+
+class ExportResult(NamedTuple):
+    path: str
+    years: list[int]
+    regenerated: list[int]
+
+
+# ─── Pipeline ───────────────────────────────────────────────────────────────
+
+# Longer than any run of one holiday
+_MAX_RUN_DAYS = 14
+
+
+def _fragment_start(where: LuachLocation, year: int) -> datetime.date:
+    """The first day of *year*'s fragment: Jan 1, past the rest of a holiday
+    run open on Dec 31, which the previous year's fragment finishes."""
+    rows = luach_rows(
+        where,
+        datetime.date(year - 1, 12, 31),
+        datetime.date(year - 1, 12, 31) + timedelta(days=_MAX_RUN_DAYS),
+    )
+    open_run = rows[0]["holiday"]
+    for row in rows[1:]:
+        if not open_run or row["holiday"] != open_run:
+            return datetime.date.fromisoformat(row["date"])
+    return datetime.date.fromisoformat(rows[-1]["date"])
+
+
+def iter_head_rows(where: LuachLocation, year: int) -> Iterator[dict[str, str]]:
+    """The rows of a holiday run crossing into *year*, when an export starts
+    there: from the run's first day up to the year's fragment."""
+    end = _fragment_start(where, year) - timedelta(days=1)
+    if end.year < year:
+        return
+    rows = luach_rows(where, datetime.date(year - 1, 12, 31) - timedelta(days=_MAX_RUN_DAYS), end)
+    first = len(rows) - 1
+    while first and rows[first - 1]["holiday"] == rows[-1]["holiday"]:
+        first -= 1
+    yield from rows[first:]
+
+
+def iter_rows(where: LuachLocation, year: int) -> Iterator[dict[str, str]]:
+    """The luach rows of one Gregorian year's fragment.
+
+    A holiday run crossing New Year belongs whole to the year it starts in,
+    so it stays one event.
+    """
+    yield from luach_rows(
+        where,
+        _fragment_start(where, year),
+        _fragment_start(where, year + 1) - timedelta(days=1),
+    )
+
+
+def iter_events(rows: Iterable[dict[str, str]], uid_suffix: str) -> Iterator[Event]:
+    """Holiday runs, special Shabbosos and candle-lighting / havdalah times."""
+    pending: list[Event] = []
+    for holiday, days in groupby(rows, key=lambda row: row["holiday"]):
+        days = list(days)
+        if holiday:
+            first = datetime.date.fromisoformat(days[0]["date"])
+            yield Event(
+                f"{first.isoformat()}-holiday-{uid_suffix}",
+                holiday,
+                first,
+                first + timedelta(days=len(days)),
+                "holiday",
+            )
+        for row in days:
+            day = datetime.date.fromisoformat(row["date"])
+            if row["special_shabbos"]:
+                pending.append(Event(
+                    f"{row['date']}-special-{uid_suffix}",
+                    row["special_shabbos"].replace("-", " · "),
+                    day,
+                    day + timedelta(days=1),
+                    "special_shabbos",
+                ))
+            for key, summary in (("candle_lighting", CANDLE_LIGHTING_SUMMARY),
+                                 ("havdalah", HAVDALAH_SUMMARY)):
+                if row[key]:
+                    when = datetime.datetime.fromisoformat(row[key])
+                    pending.append(Event(
+                        f"{row['date']}-{key}-{uid_suffix}", summary, when, when, key
+                    ))
+        # a holiday run is only complete once the next one starts
+        yield from pending
+        pending.clear()
+
+
+def _escape(text: str) -> str:
+    return (text.replace("\\", "\\\\").replace(";", "\\;")
+            .replace(",", "\\,").replace("\n", "\\n"))
+
+
+def _fold(line: str) -> Iterator[str]:
+    """Split *line* into RFC 5545 continuation lines of at most 75 octets."""
+    limit = _MAX_LINE_OCTETS
+    chunk = ""
+    for char in line:
+        if len((chunk + char).encode("utf-8")) > limit:
+            yield chunk
+            chunk = " "
+            limit = _MAX_LINE_OCTETS
+        chunk += char
+    yield chunk
+
+
+def _day(value: datetime.date | datetime.datetime) -> datetime.date:
+    return value.date() if isinstance(value, datetime.datetime) else value
+
+
+def _format_time(value: datetime.date | datetime.datetime) -> str:
+    if isinstance(value, datetime.datetime):
+        return value.astimezone(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return value.strftime("%Y%m%d")
+
+
+def iter_ics_lines(events: Iterable[Event], stamp: datetime.datetime) -> Iterator[str]:
+    """VEVENT lines, folded and CRLF-terminated."""
+    dtstamp = _format_time(stamp)
+    for event in events:
+        date_param = "" if isinstance(event.start, datetime.datetime) else ";VALUE=DATE"
+        for line in (
+            "BEGIN:VEVENT",
+            f"UID:{event.uid}",
+            f"DTSTAMP:{dtstamp}",
+            f"DTSTART{date_param}:{_format_time(event.start)}",
+            f"DTEND{date_param}:{_format_time(event.end)}",
+            f"SUMMARY:{_escape(event.summary)}",
+            f"CATEGORIES:{event.category}",
+            "TRANSP:TRANSPARENT",
+            "END:VEVENT",
+        ):
+            for part in _fold(line):
+                yield part + "\r\n"
+
+
+# ─── Incremental export ─────────────────────────────────────────────────────
+
+def year_hash(location: Location, options: Options, year: int) -> str:
+    """Content hash of everything one year's fragment depends on."""
+    payload = json.dumps([ICAL_VERSION, list(location), list(options), year])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _uid_suffix(location: Location) -> str:
+    return hashlib.sha1(repr(tuple(location)).encode("utf-8")).hexdigest()[:12] + "@molad_yiddish"
+
+
+def _read_manifest(cache_dir: Path) -> dict[str, str]:
+    try:
+        return json.loads((cache_dir / _MANIFEST).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_atomic(path: Path, lines: Iterable[str]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8", newline="") as fh:
+        fh.writelines(lines)
+    os.replace(tmp, path)
+
+
+def export_ical(
+    path: str | Path,
+    location: Location,
+    options: Options,
+    start_year: int,
+    years: int = 1,
+    cache_dir: str | Path | None = None,
+    name: str = DEFAULT_CALENDAR_NAME,
+) -> ExportResult:
+    """Write the .ics for [start_year, start_year + years), rebuilding only changed years.
+
+    *cache_dir* (default ``<path>.d``) keeps one fragment per year and the
+    manifest of their content hashes.
+    """
+    path = Path(path)
+    cache = Path(cache_dir) if cache_dir is not None else path.with_name(path.name + ".d")
+    cache.mkdir(parents=True, exist_ok=True)
+    manifest = _read_manifest(cache)
+
+    where = LuachLocation(name, location, options)
+    suffix = _uid_suffix(location)
+    stamp = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+    span = list(range(start_year, start_year + years))
+    regenerated = []
+    for year in span:
+        digest = year_hash(location, options, year)
+        fragment = cache / f"{year}.ics"
+        if manifest.get(str(year)) == digest and fragment.exists():
+            continue
+        _write_atomic(fragment, iter_ics_lines(iter_events(iter_rows(where, year), suffix), stamp))
+        manifest[str(year)] = digest
+        regenerated.append(year)
+    if regenerated:
+        _write_atomic(cache / _MANIFEST, [json.dumps(manifest, indent=0, sort_keys=True)])
+
+    def _calendar() -> Iterator[str]:
+        for line in (
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            f"PRODID:{_PRODID}",
+            "CALSCALE:GREGORIAN",
+            f"X-WR-CALNAME:{_escape(name)}",
+            f"X-WR-TIMEZONE:{location.time_zone}",
+        ):
+            yield from (part + "\r\n" for part in _fold(line))
+        # the part of a run from the year before that belongs to this export
+        jan1 = datetime.date(start_year, 1, 1)
+        yield from iter_ics_lines(
+            (event for event in iter_events(iter_head_rows(where, start_year), suffix)
+             if event.category == "holiday" or _day(event.start) >= jan1),
+            stamp,
+        )
+        for year in span:
+            with (cache / f"{year}.ics").open(encoding="utf-8", newline="") as fh:
+                yield from fh
+        yield "END:VCALENDAR\r\n"
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _write_atomic(path, _calendar())
+    return ExportResult(str(path), span, regenerated)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m molad_lib.ical",
+        description="Export holidays, special Shabbosos and zmanim as an .ics calendar.",
+    )
+    parser.add_argument("latitude", type=float)
+    parser.add_argument("longitude", type=float)
+    parser.add_argument("time_zone")
+    parser.add_argument("output", help="the .ics file to write")
+    parser.add_argument("--start-year", type=int, default=datetime.date.today().year)
+    parser.add_argument("--years", type=int, default=1)
+    parser.add_argument("--candle-offset", type=int, default=Options().candle_offset)
+    parser.add_argument("--havdalah-offset", type=int, default=Options().havdalah_offset)
+    parser.add_argument("--israel", action="store_true", help="Israel (one-day Yom Tov)")
+    parser.add_argument("--cache-dir", help="per-year fragments (default: <output>.d)")
+    parser.add_argument("--name", default=DEFAULT_CALENDAR_NAME)
+    args = parser.parse_args(argv)
+
+    result = export_ical(
+        args.output,
+        Location(args.latitude, args.longitude, args.time_zone),
+        Options(args.candle_offset, args.havdalah_offset, diaspora=not args.israel),
+        args.start_year,
+        args.years,
+        args.cache_dir,
+        args.name,
+    )
+    rebuilt = ", ".join(map(str, result.regenerated)) or "none"
+    print(f"{result.path}: {len(result.years)} years, regenerated {rebuilt}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+# custom_components/molad_yiddish/molad_lib/kiddush_levana.py
+"""
+Kiddush Levana window from the absolute molad instant.
+
+The molad is announced in Jerusalem mean time; molad_instant() turns the
+announcement of a Hebrew month into a timezone-aware datetime.  The window
+opens 3 or 7 days after the molad (minhag) and closes at the middle of the
+lunar month, 14 days 18 hours 22 minutes and ½ chelek (1⅔ seconds) after
+it.  Computed once per month, so a sensor only needs timers at the window's
+start and end.
+"""
+from __future__ import annotations
+
+import datetime
+from datetime import timedelta
+from functools import lru_cache
+from typing import NamedTuple
+
+from astral.sun import sun
+from pyluach.hebrewcal import Month as PMonth
+
+from .convert import hebrew_date, to_gregorian
+from .helper import MoladHelper
+from .options import Options
+from .zmanim import Location
+
+# Jerusalem mean time: 35.2354° E
+JERUSALEM_MEAN_TIME = datetime.timezone(timedelta(hours=2, minutes=20, seconds=56.5))
+
+# 1 chelek = 1/1080 hour
+_CHELEK = timedelta(seconds=10 / 3)
+
+# Half of the mean lunar month (29d 12h 793 chalakim)
+HALF_MONTH = timedelta(days=14, hours=18, minutes=22) + _CHELEK / 2
+
+MINHAG_DAYS = (3, 7)
+DEFAULT_MINHAG_DAYS = 3
+
+
+class KiddushLevana(NamedTuple):
+    """The Kiddush Levana window of one Hebrew month."""
+
+    year: int
+    month: int
+    molad: datetime.datetime
+    start: datetime.datetime
+    end: datetime.datetime
+    # havdalah of every Motzei Shabbos inside the window
+    motzei_shabbos: tuple[datetime.datetime, ...]
+
+    def is_open(self, now: datetime.datetime) -> bool:
+        return self.start <= now < self.end
+
+
+@lru_cache(maxsize=32)
+def molad_instant(year: int, month: int) -> datetime.datetime:
+    """The molad of Hebrew (year, month) as an aware datetime (Jerusalem mean time)."""
+    ann = PMonth(year, month).molad_announcement()
+    first = to_gregorian(year, month, 1)
+    # the molad falls within three days of the 1st; its weekday picks the date
+    for offset in range(-3, 4):
+        day = first + timedelta(days=offset)
+        if day.isoweekday() % 7 + 1 == ann["weekday"]:
+            break
+    clock = datetime.datetime.combine(
+        day, datetime.time(ann["hour"], ann["minutes"]), JERUSALEM_MEAN_TIME
+    )
+    return clock + ann["parts"] * _CHELEK
+
+
+def window_for_month(
+    year: int,
+    month: int,
+    location: Location,
+    options: Options,
+) -> KiddushLevana:
+    """The Kiddush Levana window of Hebrew (year, month)."""
+    tz = location.tz
+    # elapsed time, not wall-clock time: add in UTC, then localize
+    molad = molad_instant(year, month).astimezone(datetime.timezone.utc)
+    start = (molad + timedelta(days=options.kiddush_levana_days)).astimezone(tz)
+    end = (molad + HALF_MONTH).astimezone(tz)
+    molad = molad.astimezone(tz)
+
+    motzei = []
+    day = start.date() - timedelta(days=1)
+    last = end.date()
+    day += timedelta(days=(5 - day.weekday()) % 7)
+    while day <= last:
+        havdalah = sun(location.observer, date=day, tzinfo=tz)["sunset"] + timedelta(
+            minutes=options.havdalah_offset
+        )
+        if start <= havdalah < end:
+            motzei.append(havdalah)
+        day += timedelta(days=7)
+    return KiddushLevana(year, month, molad, start, end, tuple(motzei))
+
+
+def kiddush_levana(
+    now: datetime.datetime,
+    location: Location,
+    options: Options,
+) -> KiddushLevana:
+    """The current window, or the next one once this month's has closed."""
+    hd = hebrew_date(now.astimezone(location.tz).date())
+    window = window_for_month(hd.year, hd.month, location, options)
+    if now >= window.end:
+        nxt = MoladHelper._next_month(hd.year, hd.month)
+        window = window_for_month(nxt["year"], nxt["month"], location, options)
+    return window
@@ -0,0 +1,306 @@
+# custom_components/molad_yiddish/molad_lib/learning.py
+"""
+Daily learning cycles: Daf Yomi, Mishnah Yomis and Rambam (3 chapters a day).
+
+Every cycle is a fixed run of units (dafim, mishnayos, chapters) grouped in
+sections (a masechta, a perek, a set of hilchos).  Each table is compiled
+once into arrays: the first unit of every section and, per unit, the
+section it belongs to.  A day's portion is then a subtraction, a modulo and
+two array reads, whatever the date.
+
+* Daf Yomi started 1 Elul 5683 (11 Sep 1923) at 2702 dafim; from the 8th
+  cycle (24 Jun 1975) Shekalim is learned with the Bavli's 22 dafim, 2711.
+  Kinnim, Tamid and Middos follow Meilah on its own pagination.
+* Mishnah Yomis: two mishnayos a day since 20 May 1947.
+* Rambam: three chapters a day since 29 Apr 1984 (27 Nisan 5744); the
+  first 17 "chapters" are the introduction and the count of the mitzvos,
+  kept as one section.
+"""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+import datetime
+from datetime import timedelta
+from typing import NamedTuple
+
+from .helper import int_to_hebrew
+
+DAF_YOMI = "daf_yomi"
+MISHNAH_YOMIS = "mishnah_yomis"
+RAMBAM = "rambam"
+
+CYCLES = (DAF_YOMI, MISHNAH_YOMIS, RAMBAM)
+
+# (masechta, first daf, last daf); Shekalim is cut short before 1975
+_BAVLI = (
+    ("ברכות", 2, 64), ("שבת", 2, 157), ("עירובין", 2, 105), ("פסחים", 2, 121),
+    ("שקלים", 2, 22), ("יומא", 2, 88), ("סוכה", 2, 56), ("ביצה", 2, 40),
+    ("ראש השנה", 2, 35), ("תענית", 2, 31), ("מגילה", 2, 32), ("מועד קטן", 2, 29),
+    ("חגיגה", 2, 27), ("יבמות", 2, 122), ("כתובות", 2, 112), ("נדרים", 2, 91),
+    ("נזיר", 2, 66), ("סוטה", 2, 49), ("גיטין", 2, 90), ("קידושין", 2, 82),
+    ("בבא קמא", 2, 119), ("בבא מציעא", 2, 119), ("בבא בתרא", 2, 176), ("סנהדרין", 2, 113),
+    ("מכות", 2, 24), ("שבועות", 2, 49), ("עבודה זרה", 2, 76), ("הוריות", 2, 14),
+    ("זבחים", 2, 120), ("מנחות", 2, 110), ("חולין", 2, 142), ("בכורות", 2, 61),
+    ("ערכין", 2, 34), ("תמורה", 2, 34), ("כריתות", 2, 28), ("מעילה", 2, 22),
+    ("קינים", 23, 25), ("תמיד", 26, 33), ("מדות", 34, 37), ("נדה", 2, 73),
+)
+_SHEKALIM_BEFORE_1975 = 13
+
+# (masechta, mishnayos in each perek)
+_MISHNAH = (
+    ("ברכות", (5, 8, 6, 7, 5, 8, 5, 8, 5)),
+    ("פאה", (6, 8, 8, 11, 8, 11, 8, 9)),
+    ("דמאי", (4, 5, 6, 7, 11, 12, 8)),
+    ("כלאים", (9, 11, 7, 9, 8, 9, 8, 6, 10)),
+    ("שביעית", (8, 10, 10, 10, 9, 6, 7, 11, 9, 9)),
+    ("תרומות", (10, 6, 9, 13, 9, 6, 7, 12, 7, 12, 10)),
+    ("מעשרות", (8, 8, 10, 6, 8)),
+    ("מעשר שני", (7, 10, 13, 12, 15)),
+    ("חלה", (9, 8, 10, 11)),
+    ("ערלה", (9, 17, 9)),
+    ("ביכורים", (11, 11, 12, 5)),
+    ("שבת", (11, 7, 6, 2, 4, 10, 4, 7, 7, 6, 6, 6, 7, 4, 3, 8, 8, 3, 6, 5, 3, 6, 5, 5)),
+    ("עירובין", (10, 6, 9, 11, 9, 10, 11, 11, 4, 15)),
+    ("פסחים", (7, 8, 8, 9, 10, 6, 13, 8, 11, 9)),
+    ("שקלים", (7, 5, 4, 9, 6, 6, 7, 8)),
+    ("יומא", (8, 7, 11, 6, 7, 8, 5, 9)),
+    ("סוכה", (11, 9, 15, 10, 8)),
+    ("ביצה", (10, 10, 8, 7, 7)),
+    ("ראש השנה", (9, 8, 9, 9)),
+    ("תענית", (7, 10, 9, 8)),
+    ("מגילה", (11, 6, 6, 10)),
+    ("מועד קטן", (10, 5, 9)),
+    ("חגיגה", (8, 7, 8)),
+    ("יבמות", (4, 10, 10, 13, 6, 6, 6, 6, 6, 9, 7, 6, 13, 9, 10, 7)),
+    ("כתובות", (10, 10, 9, 12, 9, 7, 10, 8, 9, 6, 6, 4, 11)),
+    ("נדרים", (4, 5, 11, 8, 6, 10, 9, 7, 10, 8, 12)),
+    ("נזיר", (7, 10, 7, 7, 7, 11, 4, 2, 5)),
+    ("סוטה", (9, 6, 8, 5, 5, 4, 8, 7, 15)),
+    ("גיטין", (6, 7, 8, 9, 9, 7, 9, 10, 10)),
+    ("קידושין", (10, 10, 13, 14)),
+    ("בבא קמא", (4, 6, 11, 9, 7, 6, 7, 7, 12, 10)),
+    ("בבא מציעא", (8, 11, 12, 12, 11, 8, 11, 9, 13, 6)),
+    ("בבא בתרא", (6, 14, 8, 9, 11, 8, 4, 8, 10, 8)),
+    ("סנהדרין", (6, 5, 8, 5, 5, 6, 11, 7, 6, 6, 6)),
+    ("מכות", (10, 8, 16)),
+    ("שבועות", (7, 5, 11, 13, 5, 7, 8, 6)),
+    ("עדיות", (14, 10, 12, 12, 7, 3, 9, 7)),
+    ("עבודה זרה", (9, 7, 10, 12, 12)),
+    ("אבות", (18, 16, 18, 22, 23, 11)),
+    ("הוריות", (5, 7, 8)),
+    ("זבחים", (4, 5, 6, 6, 8, 7, 6, 12, 7, 8, 8, 6, 8, 10)),
+    ("מנחות", (4, 5, 7, 5, 9, 7, 6, 7, 9, 9, 9, 5, 11)),
+    ("חולין", (7, 10, 7, 7, 5, 7, 6, 6, 8, 4, 2, 5)),
+    ("בכורות", (7, 9, 4, 10, 6, 12, 7, 10, 8)),
+    ("ערכין", (4, 6, 5, 4, 6, 5, 5, 7, 8)),
+    ("תמורה", (6, 3, 5, 4, 6, 5, 6)),
+    ("כריתות", (7, 6, 10, 3, 8, 9)),
+    ("מעילה", (4, 9, 8, 6, 5, 6)),
+    ("תמיד", (4, 5, 9, 3, 6, 4, 3)),
+    ("מדות", (9, 6, 8, 7, 4)),
+    ("קינים", (4, 5, 6)),
+    ("כלים", (9, 8, 8, 4, 11, 4, 6, 11, 8, 8, 9, 8, 8, 8, 6, 8, 17, 9, 10, 7,
+              3, 10, 5, 17, 9, 9, 12, 10, 8, 4)),
+    ("אהלות", (8, 7, 7, 3, 7, 7, 6, 6, 16, 7, 9, 8, 6, 7, 10, 5, 5, 10)),
+    ("נגעים", (6, 5, 8, 11, 5, 8, 5, 10, 3, 10, 12, 7, 12, 13)),
+    ("פרה", (4, 5, 11, 4, 9, 5, 12, 11, 9, 6, 9, 11)),
+    ("טהרות", (9, 8, 8, 13, 9, 10, 9, 9, 9, 8)),
+    ("מקואות", (8, 10, 4, 5, 6, 11, 7, 5, 7, 8)),
+    ("נדה", (7, 7, 7, 7, 9, 14, 5, 4, 11, 8)),
+    ("מכשירין", (6, 11, 8, 10, 11, 8)),
+    ("זבים", (6, 4, 3, 7, 12)),
+    ("טבול יום", (5, 8, 6, 7)),
+    ("ידים", (5, 4, 5, 8)),
+    ("עוקצין", (6, 10, 12)),
+)
+
+# (hilchos, chapters)
+_RAMBAM = (
+    ("הקדמה ומנין המצוות", 17),
+    ("הלכות יסודי התורה", 10), ("הלכות דעות", 7), ("הלכות תלמוד תורה", 7),
+    ("הלכות עבודה זרה", 12), ("הלכות תשובה", 10),
+    ("הלכות קריאת שמע", 4), ("הלכות תפילה", 15), ("הלכות תפילין ומזוזה וספר תורה", 10),
+    ("הלכות ציצית", 3), ("הלכות ברכות", 11), ("הלכות מילה", 3),
+    ("הלכות שבת", 30), ("הלכות עירובין", 8), ("הלכות שביתת עשור", 3),
+    ("הלכות שביתת יום טוב", 8), ("הלכות חמץ ומצה", 8), ("הלכות שופר וסוכה ולולב", 8),
+    ("הלכות שקלים", 4), ("הלכות קידוש החודש", 19), ("הלכות תעניות", 5),
+    ("הלכות מגילה וחנוכה", 4),
+    ("הלכות אישות", 25), ("הלכות גירושין", 13), ("הלכות יבום וחליצה", 8),
+    ("הלכות נערה בתולה", 3), ("הלכות סוטה", 4),
+    ("הלכות איסורי ביאה", 22), ("הלכות מאכלות אסורות", 17), ("הלכות שחיטה", 14),
+    ("הלכות שבועות", 12), ("הלכות נדרים", 13), ("הלכות נזירות", 10),
+    ("הלכות ערכין וחרמין", 8),
+    ("הלכות כלאים", 10), ("הלכות מתנות עניים", 10), ("הלכות תרומות", 15),
+    ("הלכות מעשר", 14), ("הלכות מעשר שני ונטע רבעי", 11), ("הלכות ביכורים", 12),
+    ("הלכות שמיטה ויובל", 13),
+    ("הלכות בית הבחירה", 8), ("הלכות כלי המקדש", 10), ("הלכות ביאת המקדש", 9),
+    ("הלכות איסורי מזבח", 7), ("הלכות מעשה הקרבנות", 19), ("הלכות תמידין ומוספין", 10),
+    ("הלכות פסולי המוקדשין", 19), ("הלכות עבודת יום הכפורים", 5), ("הלכות מעילה", 8),
+    ("הלכות קרבן פסח", 10), ("הלכות חגיגה", 3), ("הלכות בכורות", 8),
+    ("הלכות שגגות", 15), ("הלכות מחוסרי כפרה", 5), ("הלכות תמורה", 4),
+    ("הלכות טומאת מת", 25), ("הלכות פרה אדומה", 15), ("הלכות טומאת צרעת", 16),
+    ("הלכות מטמאי משכב ומושב", 13), ("הלכות שאר אבות הטומאות", 20),
+    ("הלכות טומאת אוכלין", 16), ("הלכות כלים", 28), ("הלכות מקואות", 11),
+    ("הלכות נזקי ממון", 14), ("הלכות גניבה", 9), ("הלכות גזילה ואבידה", 18),
+    ("הלכות חובל ומזיק", 8), ("הלכות רוצח ושמירת נפש", 13),
+    ("הלכות מכירה", 30), ("הלכות זכייה ומתנה", 12), ("הלכות שכנים", 14),
+    ("הלכות שלוחין ושותפין", 10), ("הלכות עבדים", 9),
+    ("הלכות שכירות", 13), ("הלכות שאלה ופקדון", 8), ("הלכות מלוה ולוה", 27),
+    ("הלכות טוען ונטען", 16), ("הלכות נחלות", 11),
+    ("הלכות סנהדרין", 26), ("הלכות עדות", 22), ("הלכות ממרים", 7),
+    ("הלכות אבל", 14), ("הלכות מלכים ומלחמות", 12),
+)
+
+
+class Unit(NamedTuple):
+    """One daf, mishnah or chapter."""
+
+    book: str
+    chapter: int  # the perek of a mishnah, 0 when the book has no chapters
+    number: int
+
+
+class Portion(NamedTuple):
+    """What a cycle learns on one day."""
+
+    cycle: str
+    number: int  # which cycle, from 1
+    day: int  # day of the cycle, from 1
+    units: tuple[Unit, ...]
+    text: str
+
+
+class CycleTable:
+    """A learning cycle compiled into flat arrays.
+
+    *sections* are (book, chapter, first unit number, units) in order.
+    """
+
+    def __init__(
+        self,
+        cycle: str,
+        epoch: datetime.date,
+        per_day: int,
+        sections: Iterable[tuple[str, int, int, int]],
+        first_number: int = 1,
+    ) -> None:
+        self.cycle = cycle
+        self.epoch = epoch
+        self.per_day = per_day
+        self.first_number = first_number
+        books: list[str] = []
+        self._book = array("B")
+        self._chapter = array("B")
+        self._first = array("B")
+        self._start = array("H")
+        self._section = array("H")
+        for book, chapter, first, count in sections:
+            if not books or books[-1] != book:
+                books.append(book)
+            self._book.append(len(books) - 1)
+            self._chapter.append(chapter)
+            self._first.append(first)
+            self._start.append(len(self._section))
+            self._section.extend([len(self._start) - 1] * count)
+        self.books = tuple(books)
+        self.units = len(self._section)
+        self.days = -(-self.units // per_day)
+
+    def unit(self, index: int) -> Unit:
+        s = self._section[index]
+        return Unit(
+            self.books[self._book[s]],
+            self._chapter[s],
+            self._first[s] + index - self._start[s],
+        )
+
+    def portion(self, day: datetime.date) -> Portion | None:
+        """The portion of *day*, or None before the first cycle."""
+        offset = (day - self.epoch).days
+        if offset < 0:
+            return None
+        number, index = divmod(offset, self.days)
+        first = index * self.per_day
+        units = tuple(self.unit(i) for i in range(first, min(first + self.per_day, self.units)))
+        return Portion(self.cycle, self.first_number + number, index + 1, units, portion_text(units))
+
+
+def portion_text(units: Iterable[Unit]) -> str:
+    """"ברכות ב׳", "ברכות א׳:א׳-ב׳", "הלכות ציצית ג׳, הלכות ברכות א׳-ב׳"."""
+    groups: list[list[Unit]] = []
+    for unit in units:
+        if groups and groups[-1][0][:2] == unit[:2]:
+            groups[-1].append(unit)
+        else:
+            groups.append([unit])
+    parts = []
+    book = None
+    for group in groups:
+        first, last = group[0], group[-1]
+        numbers = int_to_hebrew(first.number)
+        if last.number != first.number:
+            numbers += f"-{int_to_hebrew(last.number)}"
+        if first.chapter:
+            numbers = f"{int_to_hebrew(first.chapter)}:{numbers}"
+        parts.append(numbers if first.book == book else f"{first.book} {numbers}")
+        book = first.book
+    return ", ".join(parts)
+
+
+def _bavli(shekalim_last: int) -> list[tuple[str, int, int, int]]:
+    return [
+        (name, 0, first, (shekalim_last if name == "שקלים" else last) - first + 1)
+        for name, first, last in _BAVLI
+    ]
+
+
+_TABLES: dict[str, tuple[CycleTable, ...]] = {
+    DAF_YOMI: (
+        CycleTable(DAF_YOMI, datetime.date(1923, 9, 11), 1, _bavli(_SHEKALIM_BEFORE_1975)),
+        CycleTable(DAF_YOMI, datetime.date(1975, 6, 24), 1, _bavli(22), first_number=8),
+    ),
+    MISHNAH_YOMIS: (
+        CycleTable(
+            MISHNAH_YOMIS,
+            datetime.date(1947, 5, 20),
+            2,
+            [
+                (name, chapter, 1, count)
+                for name, perakim in _MISHNAH
+                for chapter, count in enumerate(perakim, 1)
+            ],
+        ),
+    ),
+    RAMBAM: (
+        CycleTable(
+            RAMBAM,
+            datetime.date(1984, 4, 29),
+            3,
+            [(name, 0, 1, chapters) for name, chapters in _RAMBAM],
+        ),
+    ),
+}
+
+
+def learning_portion(cycle: str, day: datetime.date) -> Portion | None:
+    """What *cycle* learns on *day*, or None before it began."""
+    tables = _TABLES[cycle]
+    # the newest table that had started by *day*
+    for table in reversed(tables):
+        if day >= table.epoch:
+            return table.portion(day)
+    return None
+
+
+def learning_schedule(
+    cycle: str, start: datetime.date, days: int
+) -> list[tuple[datetime.date, Portion]]:
+    """The portions of *days* consecutive days from *start* (for printing)."""
+    schedule = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        portion = learning_portion(cycle, day)
+        if portion is not None:
+            schedule.append((day, portion))
+    return schedule
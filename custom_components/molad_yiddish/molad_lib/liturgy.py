@@ -0,0 +1,220 @@
+# custom_components/molad_yiddish/molad_lib/liturgy.py
+"""
+What is said in davening: Tachanun, Hallel, Yaaleh Veyavo, Al HaNissim,
+Mashiv Haruach / Morid HaTal and Tal Umatar (Nusach Ashkenaz).
+
+year_table() computes a whole Hebrew year at once, one Liturgy per day
+packed into a byte, from the Hebrew date conversion and the holiday rule
+table; a sensor only looks its day up and asks next_change() when the
+next differing day begins, so it is written at that sunset and nowhere in
+between.
+
+The liturgical day starts at sunset.  On the days the winter / summer
+insertions switch (Shemini Atzeres, first day of Pesach) the day shows the
+text said from Mussaf on.
+"""
+from __future__ import annotations
+
+import calendar
+import datetime
+from datetime import timedelta
+from functools import lru_cache
+from typing import NamedTuple
+
+from astral.sun import sun
+
+from .convert import hebrew_date, to_gregorian
+from .options import Options
+from .rules import ADAR, ADAR_I, HOLIDAY_RULES, month_key
+from .zmanim import Location
+
+HALLEL_FULL = "full"
+HALLEL_HALF = "half"
+HALLEL_NONE = "none"
+
+# Yiddish state of each insertion: (said, not said)
+TEXTS: dict[str, tuple[str, str]] = {
+    "tachanun":       ("מען זאגט תחנון", "מען זאגט נישט תחנון"),
+    "yaaleh_veyavo":  ("מען זאגט יעלה ויבוא", "מען זאגט נישט יעלה ויבוא"),
+    "al_hanissim":    ("מען זאגט על הניסים", "מען זאגט נישט על הניסים"),
+    "mashiv_haruach": ("משיב הרוח ומוריד הגשם", "מוריד הטל"),
+    "tal_umatar":     ("ותן טל ומטר לברכה", "ותן ברכה"),
+}
+HALLEL_TEXTS: dict[str, str] = {
+    HALLEL_FULL: "גאנץ הלל",
+    HALLEL_HALF: "האלב הלל",
+    HALLEL_NONE: "מען זאגט נישט הלל",
+}
+
+# How far next_change() looks ahead; no insertion stays the same longer
+_SEARCH_DAYS = 400
+
+
+class Liturgy(NamedTuple):
+    """The insertions of one liturgical day."""
+
+    tachanun: bool
+    hallel: str
+    yaaleh_veyavo: bool
+    al_hanissim: bool
+    mashiv_haruach: bool  # False: Morid HaTal
+    tal_umatar: bool
+
+
+_HALLEL = (HALLEL_NONE, HALLEL_HALF, HALLEL_FULL)
+
+
+def _encode(value: Liturgy) -> int:
+    """*value* as one byte: hallel in the low two bits, one bit per flag above."""
+    return (
+        _HALLEL.index(value.hallel)
+        | value.tachanun << 2
+        | value.yaaleh_veyavo << 3
+        | value.al_hanissim << 4
+        | value.mashiv_haruach << 5
+        | value.tal_umatar << 6
+    )
+
+
+# every Liturgy by its byte
+_DECODE: dict[int, Liturgy] = {
+    code: Liturgy(
+        tachanun=bool(code & 4),
+        hallel=_HALLEL[code & 3],
+        yaaleh_veyavo=bool(code & 8),
+        al_hanissim=bool(code & 16),
+        mashiv_haruach=bool(code & 32),
+        tal_umatar=bool(code & 64),
+    )
+    for code in range(128)
+    if code & 3 < len(_HALLEL)
+}
+
+
+class YearTable(NamedTuple):
+    """The Liturgy of every day of a Hebrew year from its Rosh Hashana, one byte per day."""
+
+    first: datetime.date
+    codes: bytes
+
+    def get(self, day: datetime.date) -> Liturgy | None:
+        index = (day - self.first).days
+        return _DECODE[self.codes[index]] if 0 <= index < len(self.codes) else None
+
+
+def tal_umatar_start(year: int, diaspora: bool = True) -> datetime.date:
+    """First liturgical day of Tal Umatar in the rainy season of Hebrew *year*.
+
+    In Israel from 7 Cheshvan; in the diaspora from Maariv of 4 December
+    (5 December before a Gregorian leap year), i.e. the day after.
+    """
+    if not diaspora:
+        return to_gregorian(year, 8, 7)
+    december = to_gregorian(year, 7, 1).year
+    return datetime.date(december, 12, 5 + calendar.isleap(december + 1))
+
+
+def _liturgy(day: datetime.date, diaspora: bool, tal_from: datetime.date) -> Liturgy:
+    hd = hebrew_date(day)
+    month, mday = month_key(hd.month, hd.leap), hd.day
+    flags = {rule.name for rule in HOLIDAY_RULES.matches(day, hd)}
+
+    chanukah = "חנוכה" in flags
+    purim = "פורים" in flags
+    rosh_chodesh = "ראש חודש" in flags and not (month == 7 and mday == 1)
+    extra = 1 if diaspora else 0  # the second day of Yom Tov outside Israel
+
+    sukkos = month == 7 and 15 <= mday <= 22 + extra
+    pesach = month == 1 and 15 <= mday <= 21 + extra
+    shavuos = month == 3 and 6 <= mday <= 6 + extra
+    high_holidays = month == 7 and mday in (1, 2, 10)
+
+    if sukkos or chanukah or (pesach and mday <= 15 + extra) or shavuos:
+        hallel = HALLEL_FULL
+    elif pesach or rosh_chodesh:
+        hallel = HALLEL_HALF
+    else:
+        hallel = HALLEL_NONE
+
+    no_tachanun = (
+        day.weekday() == 5
+        or rosh_chodesh
+        or chanukah
+        or month == 1
+        or (month == 2 and mday in (14, 18))          # Pesach Sheni, Lag BaOmer
+        or (month == 3 and mday <= 12)                # through the days of tashlumin
+        or "תשעה באב" in flags or "תשעה באב נדחה" in flags
+        or (month == 5 and mday == 15)
+        or (month == 6 and mday == 29)
+        or (month == 7 and not 3 <= mday <= 8)        # Yom Kippur through Tishrei
+        or (month == 11 and mday == 15)
+        or (month in (ADAR, ADAR_I) and mday in (14, 15))
+    )
+
+    # the rainy season: Shemini Atzeres until the first day of Pesach
+    rainy = (month == 7 and mday >= 22) or month not in range(1, 8) or (month == 1 and mday < 15)
+
+    return Liturgy(
+        tachanun=not no_tachanun,
+        hallel=hallel,
+        yaaleh_veyavo=rosh_chodesh or sukkos or pesach or shavuos or high_holidays,
+        al_hanissim=chanukah or purim,
+        mashiv_haruach=rainy,
+        tal_umatar=rainy and day >= tal_from,
+    )
+
+
+@lru_cache(maxsize=4)
+def year_table(year: int, diaspora: bool = True) -> YearTable:
+    """The Liturgy of every day of Hebrew *year* (Tishrei to Elul)."""
+    first = to_gregorian(year, 7, 1)
+    last = to_gregorian(year + 1, 7, 1)
+    tal_from = tal_umatar_start(year, diaspora)
+    codes = bytearray()
+    day = first
+    while day < last:
+        codes.append(_encode(_liturgy(day, diaspora, tal_from)))
+        day += timedelta(days=1)
+    return YearTable(first, bytes(codes))
+
+
+def liturgy_for(day: datetime.date, diaspora: bool = True) -> Liturgy:
+    """The Liturgy of the liturgical day that is daytime on *day*."""
+    return year_table(hebrew_date(day).year, diaspora).get(day)
+
+
+def liturgical_day(now: datetime.datetime, location: Location) -> datetime.date:
+    """The date whose daytime the liturgical day at *now* belongs to."""
+    tz = location.tz
+    now = now.astimezone(tz)
+    if now >= sun(location.observer, date=now.date(), tzinfo=tz)["sunset"]:
+        return now.date() + timedelta(days=1)
+    return now.date()
+
+
+def liturgy(now: datetime.datetime, location: Location, options: Options) -> Liturgy:
+    """The Liturgy at *now*."""
+    return liturgy_for(liturgical_day(now, location), options.diaspora)
+
+
+def liturgy_texts(value: Liturgy) -> dict[str, str]:
+    """The Yiddish state of each insertion of *value*, keyed by Liturgy field."""
+    texts = {key: TEXTS[key][0 if getattr(value, key) else 1] for key in TEXTS}
+    texts["hallel"] = HALLEL_TEXTS[value.hallel]
+    return texts
+
+
+def next_change(
+    now: datetime.datetime,
+    location: Location,
+    options: Options,
+) -> datetime.datetime | None:
+    """The sunset beginning the next day whose Liturgy differs from now's."""
+    day = liturgical_day(now, location)
+    current = liturgy_for(day, options.diaspora)
+    for offset in range(1, _SEARCH_DAYS):
+        candidate = day + timedelta(days=offset)
+        if liturgy_for(candidate, options.diaspora) != current:
+            eve = candidate - timedelta(days=1)
+            return sun(location.observer, date=eve, tzinfo=location.tz)["sunset"]
+    return None
@@ -0,0 +1,86 @@
+# custom_components/molad_yiddish/molad_lib/lookup.py
+"""
+Memoized per-date answers for template functions.
+
+Dashboards ask the same few questions (the Hebrew date, Yom Tov, the
+parsha, the Omer count, a month's molad) for the same few dates on every
+render.  Each answer here is computed once on top of the conversion caches
+in convert and kept in a bounded LRU cache, so a repeated call is a
+dictionary lookup.
+
+These take a plain date: the Hebrew date of the daytime, with no sunset
+flip (that needs a location and the user's offsets).
+"""
+from __future__ import annotations
+
+import datetime
+from functools import lru_cache
+
+from pyluach.hebrewcal import Month as PMonth
+
+from .convert import date_info
+from .sfirah_helper import _raw_omer_day
+from .weekly import parsha_name
+from .yiddish import DAY_MAPPING, TIME_OF_DAY, hebrew_date_text
+
+_CACHE_SIZE = 1024
+
+_DAY_NAMES = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Shabbos"]
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def is_yom_tov(day: datetime.date, diaspora: bool = True) -> bool:
+    """Whether *day* is a Yom Tov (Yom Kippur included)."""
+    return date_info(day, diaspora).is_yom_tov
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def parsha(day: datetime.date) -> str:
+    """The parsha of the Shabbos on or after *day* (see weekly.parsha_name)."""
+    return parsha_name(day)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def omer_day(day: datetime.date) -> int:
+    """The Omer count of the daytime of *day*, 0 outside the Omer."""
+    return _raw_omer_day(day)
+
+
+@lru_cache(maxsize=64)
+def molad(year: int, month: int) -> str:
+    """The Yiddish announcement of the molad of Hebrew (year, month)."""
+    ann = PMonth(year, month).molad_announcement()
+    h, mi, chal = ann["hour"], ann["minutes"], ann["parts"]
+    day = DAY_MAPPING[_DAY_NAMES[ann["weekday"] - 1]]
+    tod = TIME_OF_DAY["am" if h < 12 else "pm"](h)
+    chal_txt = "חלק" if chal == 1 else "חלקים"
+    return f"מולד {day} {tod}, {mi} מינוט און {chal} {chal_txt} נאך {h % 12 or 12}"
+
+
+_CACHED = {
+    "hebrew_date": hebrew_date_text,
+    "is_yom_tov": is_yom_tov,
+    "parsha": parsha,
+    "omer_day": omer_day,
+    "molad": molad,
+}
+
+
+def cache_stats() -> dict[str, dict[str, int]]:
+    """Return hit/miss statistics of every lookup cache."""
+    stats = {}
+    for name, func in _CACHED.items():
+        info = func.cache_info()
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+        }
+    return stats
+
+
+def cache_clear() -> None:
+    """Drop every cached answer."""
+    for func in _CACHED.values():
+        func.cache_clear()
@@ -0,0 +1,317 @@
+# custom_components/molad_yiddish/molad_lib/luach.py
+"""
+Batch luach generator for many locations.
+
+Reads a list of locations (name, latitude, longitude, time_zone and
+optionally candle_offset, havdalah_offset, diaspora) from a CSV or JSON
+file and writes one row per location and day with the Hebrew date, day
+label, parsha, special Shabbos, holiday, molad (on Shabbos Mevorchim) and
+candle-lighting / havdalah times.
+
+Every location-year is one task for a process pool.  Tasks are submitted
+through a bounded window and written in order as they complete, so memory
+stays flat however many location-years are requested.  From
+custom_components/molad_yiddish:
+
+    python -m molad_lib.luach locations.csv 2025-01-01 2025-12-31 --format csv
+    python -m molad_lib.luach locations.json 2025-01-01 2030-12-31 \\
+        --output-dir luach/ --workers 8
+"""
+from __future__ import annotations
+
+import argparse
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+import csv
+import datetime
+from datetime import timedelta
+import json
+import os
+from pathlib import Path
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import IO, Any, NamedTuple
+
+from .holidays import holiday_flags, pick_holiday
+from .melacha import build_spans, candle_lightings
+from .options import Options
+from .specials import get_special_shabbos_name
+from .weekly import parsha_name
+from .yiddish import day_label, molad_announcement, molad_details, yiddish_date
+from .zmanim import Location
+
+FIELDS = (
+    "location",
+    "date",
+    "hebrew_date",
+    "day",
+    "parsha",
+    "special_shabbos",
+    "holiday",
+    "molad",
+    "candle_lighting",
+    "havdalah",
+)
+
+FORMATS = ("json", "csv")
+
+# Tasks in flight per worker; bounds the results waiting to be written
+_WINDOW_PER_WORKER = 2
+
+
+class LuachLocation(NamedTuple):
+    """One community: where it is and its own offsets."""
+
+    name: str
+    location: Location
+    options: Options
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "y")
+    return bool(value)
+
+
+def _parse_location(raw: dict[str, Any]) -> LuachLocation:
+    defaults = Options()
+
+    def opt(key: str, default: Any) -> Any:
+        value = raw.get(key)
+        return default if value in (None, "") else value
+
+    return LuachLocation(
+        str(raw["name"]),
+        Location(float(raw["latitude"]), float(raw["longitude"]), str(raw["time_zone"])),
+        Options(
+            candle_offset=int(opt("candle_offset", defaults.candle_offset)),
+            havdalah_offset=int(opt("havdalah_offset", defaults.havdalah_offset)),
+            diaspora=_to_bool(opt("diaspora", defaults.diaspora)),
+        ),
+    )
+
+
+def load_locations(path: str | Path) -> list[LuachLocation]:
+    """Read locations from a .json (list of objects) or .csv (header row) file."""
+    path = Path(path)
+    with path.open(encoding="utf-8", newline="") as fh:
+        if path.suffix.lower() == ".json":
+            rows = json.load(fh)
+        else:
+            rows = list(csv.DictReader(fh))
+    return [_parse_location(row) for row in rows]
+
+
+def _minutes(when: datetime.datetime, up: bool) -> str:
+    """ISO time to the minute: candle-lighting rounded down, havdalah up."""
+    if up and (when.second or when.microsecond):
+        when += timedelta(minutes=1)
+    return when.replace(second=0, microsecond=0).isoformat(timespec="minutes")
+
+
+def luach_rows(
+    where: LuachLocation,
+    start: datetime.date,
+    end: datetime.date,
+) -> list[dict[str, str]]:
+    """One row per day in [start, end] for one location."""
+    location, options = where.location, where.options
+    tz = location.tz
+
+    # candle-lighting on the eve of each Shabbos / Yom Tov span and every
+    # night inside it, havdalah on its last day
+    candles: dict[datetime.date, datetime.datetime] = {}
+    havdalahs: dict[datetime.date, datetime.datetime] = {}
+    for span in build_spans(
+        start - timedelta(days=4), end + timedelta(days=4), location, tz,
+        options.candle_offset, options.havdalah_offset, options.diaspora,
+    ):
+        for when in candle_lightings(
+            span, location, tz, options.candle_offset, options.havdalah_offset,
+        ):
+            candles[when.date()] = when
+        havdalahs[span.last_day] = span.end
+
+    rows = []
+    day = start
+    while day <= end:
+        noon = datetime.datetime.combine(day, datetime.time(12), tz)
+        is_shabbos = day.weekday() == 5
+        parsha = special = molad = ""
+        if is_shabbos:
+            parsha = parsha_name(day)
+            parsha = "" if parsha == "none" else parsha
+            special = get_special_shabbos_name(day)
+            if molad_details(day).is_shabbos_mevorchim:
+                molad = molad_announcement(noon, location, options)[0]
+        candle = candles.get(day)
+        havdalah = havdalahs.get(day)
+        rows.append({
+            "location": where.name,
+            "date": day.isoformat(),
+            "hebrew_date": yiddish_date(noon, location, options),
+            "day": day_label(noon, location, options),
+            "parsha": parsha,
+            "special_shabbos": special,
+            "holiday": pick_holiday(holiday_flags(noon, location, options)),
+            "molad": molad,
+            "candle_lighting": _minutes(candle, up=False) if candle else "",
+            "havdalah": _minutes(havdalah, up=True) if havdalah else "",
+        })
+        day += timedelta(days=1)
+    return rows
+
+
+def _luach_task(args: tuple[LuachLocation, int, int]) -> tuple[str, list[dict[str, str]]]:
+    where, first, last = args
+    return where.name, luach_rows(
+        where, datetime.date.fromordinal(first), datetime.date.fromordinal(last)
+    )
+
+
+def _tasks(
+    locations: Iterable[LuachLocation],
+    start: datetime.date,
+    end: datetime.date,
+) -> Iterator[tuple[LuachLocation, int, int]]:
+    """(location, first ordinal, last ordinal) per location and Gregorian year."""
+    for where in locations:
+        for year in range(start.year, end.year + 1):
+            first = max(start, datetime.date(year, 1, 1))
+            last = min(end, datetime.date(year, 12, 31))
+            yield where, first.toordinal(), last.toordinal()
+
+
+def _bounded_map(
+    pool: Executor,
+    fn: Callable,
+    items: Iterable,
+    window: int,
+) -> Iterator:
+    """Like pool.map, in order, but with at most *window* tasks submitted at once."""
+    pending: deque = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+class _Writer:
+    """Streams rows as a JSON array or CSV into one open file."""
+
+    def __init__(self, fh: IO[str], fmt: str) -> None:
+        self._fh = fh
+        self._fmt = fmt
+        self._first = True
+        if fmt == "csv":
+            self._csv = csv.DictWriter(fh, fieldnames=FIELDS)
+            self._csv.writeheader()
+        else:
+            fh.write("[")
+
+    def write(self, rows: list[dict[str, str]]) -> None:
+        if self._fmt == "csv":
+            self._csv.writerows(rows)
+        else:
+            for row in rows:
+                self._fh.write("\n" if self._first else ",\n")
+                self._fh.write(json.dumps(row, ensure_ascii=False))
+                self._first = False
+        self._fh.flush()
+
+    def close(self) -> None:
+        if self._fmt == "json":
+            self._fh.write("\n]\n")
+        self._fh.flush()
+
+
+def _safe_filename(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in name) or "location"
+
+
+def write_luach(
+    locations: list[LuachLocation],
+    start: datetime.date,
+    end: datetime.date,
+    fmt: str = "json",
+    output: IO[str] | None = None,
+    output_dir: str | Path | None = None,
+    workers: int | None = None,
+) -> int:
+    """Compute and write the luach; returns the number of rows written.
+
+    With *output_dir* every location goes to its own ``<name>.<fmt>``
+    file, closed as soon as its last year is written; otherwise all rows
+    are streamed into *output* (stdout by default).
+    """
+    workers = workers or os.cpu_count() or 1
+    written = 0
+    current: str | None = None
+    writer: _Writer | None = None
+    fh: IO[str] | None = None
+
+    def close_current() -> None:
+        if writer is not None:
+            writer.close()
+        if output_dir is not None and fh is not None:
+            fh.close()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = _bounded_map(
+            pool, _luach_task, _tasks(locations, start, end), workers * _WINDOW_PER_WORKER
+        )
+        for name, rows in results:
+            if output_dir is not None and name != current:
+                close_current()
+                path = Path(output_dir) / f"{_safe_filename(name)}.{fmt}"
+                fh = path.open("w", encoding="utf-8", newline="")
+                writer = _Writer(fh, fmt)
+            elif writer is None:
+                fh = output or sys.stdout
+                writer = _Writer(fh, fmt)
+            current = name
+            writer.write(rows)
+            written += len(rows)
+
+    if writer is None and output_dir is None:
+        # nothing to compute: still emit a well-formed empty document
+        writer = _Writer(output or sys.stdout, fmt)
+    close_current()
+    return written
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m molad_lib.luach",
+        description="Write a luach (dates, parsha, holidays, zmanim) for many locations.",
+    )
+    parser.add_argument("locations", help="CSV or JSON file of locations")
+    parser.add_argument("start", type=datetime.date.fromisoformat)
+    parser.add_argument("end", type=datetime.date.fromisoformat)
+    parser.add_argument("--format", choices=FORMATS, default="json")
+    parser.add_argument("--output", "-o", help="output file (default: stdout)")
+    parser.add_argument("--output-dir", help="write one file per location into this directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    if args.end < args.start:
+        parser.error("end is before start")
+    locations = load_locations(args.locations)
+
+    if args.output_dir:
+        Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+        write_luach(locations, args.start, args.end, args.format,
+                    output_dir=args.output_dir, workers=args.workers)
+    elif args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as fh:
+            write_luach(locations, args.start, args.end, args.format,
+                        output=fh, workers=args.workers)
+    else:
+        write_luach(locations, args.start, args.end, args.format, workers=args.workers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
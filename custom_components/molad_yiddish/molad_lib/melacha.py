@@ -0,0 +1,233 @@
+# custom_components/molad_yiddish/molad_lib/melacha.py
+"""
+Precomputed table of melacha-prohibited windows.
+
+Every Shabbos and Yom Tov day of a Gregorian year (plus a margin on both
+sides) is merged into continuous spans, so Shabbos next to Yom Tov becomes
+one issur-melacha window.  Each span carries its candle-lighting start and
+havdalah end, computed once from the configured offsets; lookups are a
+single bisect.  MelachaTable keeps the year's spans as integer arrays.
+"""
+from __future__ import annotations
+
+from array import array
+import datetime
+from bisect import bisect_right
+from datetime import timedelta
+
+from astral import LocationInfo
+from astral.sun import sun
+
+from .convert import date_info
+
+# Days before Jan 1 / after Dec 31 covered so spans crossing the year are whole
+# and there is always a "next" window.
+_MARGIN_BEFORE = 7
+_MARGIN_AFTER = 21
+
+
+class MelachaSpan:
+    """One continuous melacha-prohibited window."""
+
+    __slots__ = ("first_day", "last_day", "name", "is_yomtov", "start", "end",
+                 "sunset_eve", "sunset_final", "yomtov_start")
+
+    def __init__(
+        self,
+        first_day: datetime.date,
+        last_day: datetime.date,
+        name: str,
+        is_yomtov: bool,
+        sunset_eve: datetime.datetime,
+        sunset_final: datetime.datetime,
+        candle_offset: int,
+        havdalah_offset: int,
+        yomtov_start: datetime.datetime | None = None,
+    ) -> None:
+        self.first_day = first_day
+        self.last_day = last_day
+        self.name = name
+        self.is_yomtov = is_yomtov
+        self.sunset_eve = sunset_eve
+        self.sunset_final = sunset_final
+        self.start = sunset_eve - timedelta(minutes=candle_offset)
+        self.end = sunset_final + timedelta(minutes=havdalah_offset)
+        # When the first Yom Tov day begins: candle-lighting, or havdalah of
+        # the Shabbos it follows
+        self.yomtov_start = yomtov_start or (self.start if is_yomtov else None)
+
+    @property
+    def eve(self) -> datetime.date:
+        """The Gregorian day on which candles are lit."""
+        return self.first_day - timedelta(days=1)
+
+
+def candle_lightings(
+    span: MelachaSpan,
+    loc: LocationInfo,
+    tz: datetime.tzinfo,
+    candle_offset: int,
+    havdalah_offset: int,
+) -> list[datetime.datetime]:
+    """Every candle-lighting of *span*, one per night it covers.
+
+    The first is the span's start.  A later night is lit from tzeis (the
+    havdalah offset) after the day before, so Yom Tov after Shabbos is lit
+    at its yomtov_start, except the night of a Shabbos, lit before sunset
+    as on any Erev Shabbos.
+    """
+    lightings = [span.start]
+    day = span.first_day + timedelta(days=1)
+    while day <= span.last_day:
+        sunset = sun(loc.observer, date=day - timedelta(days=1), tzinfo=tz)["sunset"]
+        if day.weekday() == 5:
+            lightings.append(sunset - timedelta(minutes=candle_offset))
+        else:
+            lightings.append(sunset + timedelta(minutes=havdalah_offset))
+        day += timedelta(days=1)
+    return lightings
+
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+# _yomtov_start of a span without its own
+_NO_TIME = -1
+
+
+def _to_us(moment: datetime.datetime) -> int:
+    return (moment - _EPOCH) // _MICROSECOND
+
+
+class MelachaTable:
+    """Merged Shabbos / Yom Tov spans of one Gregorian year, answered by bisect.
+
+    The spans are kept as integer arrays (day ordinals, microseconds since
+    the epoch, an index into the year's names); lookup() rebuilds the two
+    MelachaSpans it returns.
+    """
+
+    def __init__(
+        self,
+        year: int,
+        loc: LocationInfo,
+        tz: datetime.tzinfo,
+        candle_offset: int,
+        havdalah_offset: int,
+        diaspora: bool = True,
+    ) -> None:
+        self.year = year
+        self._tz = tz
+        self._candle_offset = candle_offset
+        self._havdalah_offset = havdalah_offset
+        spans = build_spans(
+            datetime.date(year, 1, 1) - timedelta(days=_MARGIN_BEFORE),
+            datetime.date(year, 12, 31) + timedelta(days=_MARGIN_AFTER),
+            loc, tz, candle_offset, havdalah_offset, diaspora,
+        )
+        names: dict[str, int] = {}
+        self._first_day = array("l", (span.first_day.toordinal() for span in spans))
+        self._days = bytes((span.last_day - span.first_day).days for span in spans)
+        self._name = bytes(names.setdefault(span.name, len(names)) for span in spans)
+        self._names = tuple(names)
+        self._is_yomtov = bytes(span.is_yomtov for span in spans)
+        self._sunset_eve = array("q", (_to_us(span.sunset_eve) for span in spans))
+        self._sunset_final = array("q", (_to_us(span.sunset_final) for span in spans))
+        # only a Yom Tov beginning at a Shabbos' havdalah has its own
+        self._yomtov_start = array("q", (
+            _to_us(span.yomtov_start)
+            if span.yomtov_start is not None and span.yomtov_start != span.start
+            else _NO_TIME
+            for span in spans
+        ))
+        self._starts = array("q", (_to_us(span.start) for span in spans))
+        self._ends = array("q", (_to_us(span.end) for span in spans))
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def _time(self, us: int) -> datetime.datetime:
+        return (_EPOCH + us * _MICROSECOND).astimezone(self._tz)
+
+    def span(self, i: int) -> MelachaSpan:
+        """The *i*-th span of the year, in time order."""
+        first_day = datetime.date.fromordinal(self._first_day[i])
+        yomtov_start = self._yomtov_start[i]
+        return MelachaSpan(
+            first_day,
+            first_day + timedelta(days=self._days[i]),
+            self._names[self._name[i]],
+            bool(self._is_yomtov[i]),
+            self._time(self._sunset_eve[i]),
+            self._time(self._sunset_final[i]),
+            self._candle_offset,
+            self._havdalah_offset,
+            None if yomtov_start == _NO_TIME else self._time(yomtov_start),
+        )
+
+    def lookup(
+        self, now: datetime.datetime
+    ) -> tuple[MelachaSpan | None, MelachaSpan | None]:
+        """Return (span containing *now* or None, next span starting after *now*)."""
+        now_us = _to_us(now)
+        i = bisect_right(self._starts, now_us) - 1
+        current = self.span(i) if i >= 0 and now_us < self._ends[i] else None
+        nxt = self.span(i + 1) if i + 1 < len(self._starts) else None
+        return current, nxt
+
+    def next_change(self, now: datetime.datetime) -> datetime.datetime | None:
+        """The next window boundary after *now*: the current window's end or
+        the next one's start (None past the table's last span)."""
+        now_us = _to_us(now)
+        i = bisect_right(self._starts, now_us) - 1
+        if i >= 0 and now_us < self._ends[i]:
+            return self._time(self._ends[i])
+        return self._time(self._starts[i + 1]) if i + 1 < len(self._starts) else None
+
+
+def build_spans(
+    first: datetime.date,
+    last: datetime.date,
+    loc: LocationInfo,
+    tz: datetime.tzinfo,
+    candle_offset: int,
+    havdalah_offset: int,
+    diaspora: bool = True,
+) -> list[MelachaSpan]:
+    """Merge every Shabbos / Yom Tov day in [first, last] into MelachaSpans."""
+    runs: list[list] = []  # [first_day, last_day, yomtov_names, first_yomtov_day]
+    day = first
+    while day <= last:
+        info = date_info(day, diaspora)
+        is_yomtov = info.is_yom_tov
+        if is_yomtov or day.weekday() == 5:
+            names = [info.holidays[0].name] if is_yomtov and info.holidays else []
+            if runs and runs[-1][1] == day - timedelta(days=1):
+                runs[-1][1] = day
+                runs[-1][2].extend(names)
+            else:
+                runs.append([day, day, names, None])
+            if is_yomtov and runs[-1][3] is None:
+                runs[-1][3] = day
+        day += timedelta(days=1)
+
+    spans = []
+    for first_day, last_day, names, yomtov_day in runs:
+        s_eve = sun(loc.observer, date=first_day - timedelta(days=1), tzinfo=tz)["sunset"]
+        s_final = sun(loc.observer, date=last_day, tzinfo=tz)["sunset"]
+        yomtov_start = None
+        if yomtov_day is not None and yomtov_day != first_day:
+            # Yom Tov right after Shabbos begins at that Shabbos' havdalah
+            s_shabbos = sun(loc.observer, date=yomtov_day - timedelta(days=1), tzinfo=tz)["sunset"]
+            yomtov_start = s_shabbos + timedelta(minutes=havdalah_offset)
+        spans.append(MelachaSpan(
+            first_day,
+            last_day,
+            names[0] if names else "Shabbos",
+            bool(names),
+            s_eve,
+            s_final,
+            candle_offset,
+            havdalah_offset,
+            yomtov_start,
+        ))
+    return spans
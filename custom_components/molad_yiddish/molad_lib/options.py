@@ -0,0 +1,28 @@
+# custom_components/molad_yiddish/molad_lib/options.py
+"""
+Options shared by every molad_lib computation.
+
+The public functions of molad_lib take an explicit ``(now, location,
+options)``: a timezone-aware instant, a zmanim.Location and an Options.
+Both are hashable, so results can be memoized per location / options.
+"""
+from __future__ import annotations
+
+from typing import NamedTuple
+
+
+class Options(NamedTuple):
+    """User-configurable offsets and preferences."""
+
+    candle_offset: int = 15
+    havdalah_offset: int = 72
+    diaspora: bool = True
+    strip_nikud: bool = False
+    # days after the molad Kiddush Levana may be said from (3 or 7)
+    kiddush_levana_days: int = 3
+
+    def with_offsets(self, other: Options) -> Options:
+        """These options with *other*'s candle-lighting and havdalah offsets."""
+        return self._replace(
+            candle_offset=other.candle_offset, havdalah_offset=other.havdalah_offset
+        )
@@ -0,0 +1,68 @@
+# custom_components/molad_yiddish/molad_lib/profiles.py
+"""
+Update profiles: how often the interval-refreshed sensors update and how
+much they publish.
+
+"precise" refreshes the display and holiday sensors every minute;
+"balanced" and "low_power" trade their latency for fewer wake-ups and
+recorder rows on constrained hosts (e.g. a Raspberry Pi running off an SD
+card).  The Erev and melacha binary sensors, which automations watch, are
+not on an interval: a timer flips them at the exact boundary in every
+profile.
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+
+PROFILE_PRECISE = "precise"
+PROFILE_BALANCED = "balanced"
+PROFILE_LOW_POWER = "low_power"
+
+DEFAULT_PROFILE = PROFILE_PRECISE
+
+
+class Profile:
+    """Refresh intervals and publishing policy of one performance profile."""
+
+    __slots__ = (
+        "name",
+        "minute_interval",
+        "hourly_interval",
+        "lean_attributes",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        minute_interval: timedelta,
+        hourly_interval: timedelta,
+        lean_attributes: bool,
+    ) -> None:
+        self.name = name
+        # refresh of the sensors that used to tick every minute
+        self.minute_interval = minute_interval
+        # refresh of the sensors that used to tick every hour
+        self.hourly_interval = hourly_interval
+        # publish only the set holiday flags instead of every flag
+        self.lean_attributes = lean_attributes
+
+
+PROFILES: dict[str, Profile] = {
+    PROFILE_PRECISE: Profile(
+        PROFILE_PRECISE, timedelta(minutes=1), timedelta(hours=1),
+        lean_attributes=False,
+    ),
+    PROFILE_BALANCED: Profile(
+        PROFILE_BALANCED, timedelta(minutes=5), timedelta(hours=1),
+        lean_attributes=False,
+    ),
+    PROFILE_LOW_POWER: Profile(
+        PROFILE_LOW_POWER, timedelta(minutes=15), timedelta(hours=3),
+        lean_attributes=True,
+    ),
+}
+
+
+def get_profile(name: str | None) -> Profile:
+    """The Profile called *name*, falling back to the default."""
+    return PROFILES.get(name or DEFAULT_PROFILE, PROFILES[DEFAULT_PROFILE])
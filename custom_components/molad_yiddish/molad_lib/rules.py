@@ -0,0 +1,270 @@
+# custom_components/molad_yiddish/molad_lib/rules.py
+"""
+Declarative holiday rule table.
+
+Every holiday flag, Erev day and custom period is one HolidayRule: its name
+and entity slug, its rank as the holiday sensor's state, the Hebrew date
+(or weekly parsha) it falls on, an optional weekday predicate, what happens
+when it falls on Shabbos, and the zmanim that bound it within the day.
+
+compile_rules() turns the table into dicts keyed by (month, day), by day
+of any month, by parsha, plus a table of the fasts moved off Shabbos, so
+evaluating a date is a handful of dict lookups.  HOLIDAY_RULES is the
+compiled RULES that holidays, schedule and the sensors consume; adding a
+minhag is one line here.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+import datetime
+from typing import NamedTuple
+
+from .convert import HebDate, to_gregorian
+
+# Day boundaries.  The Hebrew day rolls over at candle-lighting, so a rule
+# bounded by candle-lighting on both ends lasts the whole (Hebrew) day.
+DAWN = "dawn"                        # alos of the day
+SUNSET = "sunset"                    # sunset of the evening before
+CANDLE_LIGHTING = "candle_lighting"  # start / end of the Hebrew day
+
+# Month numbers (pyluach): Purim's Adar is ADAR, i.e. Adar II in a leap year;
+# the first Adar of a leap year is ADAR_I.
+ADAR = 12
+ADAR_I = 0
+
+# Tags
+EREV = "erev"
+NO_MUSIC = "no_music"
+
+_SHABBOS = 5
+_ALL_WEEKDAYS = frozenset(range(7))
+
+
+class HolidayRule(NamedTuple):
+    """One holiday flag, Erev day or custom period."""
+
+    name: str
+    slug: str
+    # rank as the holiday sensor's state (lower wins); None = attribute only
+    priority: int | None
+    # Hebrew month (pyluach numbering, see ADAR); None = every month
+    month: int | None
+    days: tuple[int, ...] = ()
+    # Python weekdays (Monday=0) the day must fall on
+    weekdays: tuple[int, ...] | None = None
+    start: str = CANDLE_LIGHTING
+    end: str = CANDLE_LIGHTING
+    # consecutive days from days[0], running into the next month if needed
+    length: int = 1
+    # on Shabbos: 0 = kept, None = dropped, ±n = moved n days
+    shabbos: int | None = 0
+    # weekly-parsha predicate, matched instead of a date
+    parshios: tuple[str, ...] = ()
+    leap_only: bool = False
+    tags: frozenset[str] = frozenset()
+    # exposed as a holiday flag attribute / binary sensor
+    attribute: bool = True
+
+
+def _r(name, slug, priority, month, *days, **kw) -> HolidayRule:
+    return HolidayRule(name, slug, priority, month, days, **kw)
+
+
+_SHOVAVIM = ("SHEMOT", "VAERA", "BO", "BESHALACH", "YITRO", "MISHPATIM")
+
+# In attribute order; priority is the order of the holiday sensor's whitelist
+RULES: tuple[HolidayRule, ...] = (
+    _r("א׳ סליחות", "alef_selichot", 1, 6, *range(21, 27), weekdays=(6,)),
+    _r("ערב ראש השנה", "erev_rosh_hashana", 2, 6, 29, start=DAWN, tags=frozenset({EREV})),
+    _r("ראש השנה א׳", "rosh_hashana_1", 3, 7, 1),
+    _r("ראש השנה ב׳", "rosh_hashana_2", 4, 7, 2),
+    _r("ראש השנה א׳ וב׳", "rosh_hashana_1_2", None, 7, 1, 2),
+    _r("צום גדליה", "tzom_gedalia", 5, 7, 3, shabbos=1),
+    _r("שלוש עשרה מדות", "shlosha_asar_midot", 6, 7, 8, weekdays=(0, 1, 3)),
+    _r("שלוש עשרה מדות", "shlosha_asar_midot", 6, 7, 6, weekdays=(3,)),
+    _r("ערב יום כיפור", "erev_yom_kippur", 7, 7, 9, start=DAWN, tags=frozenset({EREV})),
+    _r("יום הכיפורים", "yom_kippur", 8, 7, 10),
+    _r("ערב סוכות", "erev_sukkot", 9, 7, 14, start=DAWN, tags=frozenset({EREV})),
+    _r("סוכות א׳", "sukkot_1", 10, 7, 15),
+    _r("סוכות ב׳", "sukkot_2", 11, 7, 16),
+    _r("סוכות א׳ וב׳", "sukkot_1_2", None, 7, 15, 16),
+    _r("א׳ דחול המועד סוכות", "chol_hamoed_sukkot_1", 12, 7, 17),
+    _r("ב׳ דחול המועד סוכות", "chol_hamoed_sukkot_2", 13, 7, 18),
+    _r("ג׳ דחול המועד סוכות", "chol_hamoed_sukkot_3", 14, 7, 19),
+    _r("ד׳ דחול המועד סוכות", "chol_hamoed_sukkot_4", 15, 7, 20),
+    _r("חול המועד סוכות", "chol_hamoed_sukkot", None, 7, 17, 18, 19, 20),
+    _r("הושענא רבה", "hoshanah_rabbah", 16, 7, 21, tags=frozenset({EREV})),
+    _r("שמיני עצרת", "shemini_atzeret", 17, 7, 22),
+    _r("שמחת תורה", "simchat_torah", 18, 7, 23),
+    _r("ערב חנוכה", "erev_chanukah", 19, 9, 24, start=DAWN, tags=frozenset({EREV})),
+    _r("חנוכה", "chanukah", 20, 9, 25, length=8),
+    _r("שובבים", "shovavim", None, None, parshios=_SHOVAVIM),
+    _r("שובבים ת\"ת", "shovavim_tet", None, None,
+       parshios=_SHOVAVIM + ("TERUMAH", "TETZAVEH"), leap_only=True),
+    _r("צום עשרה בטבת", "tzom_asara_betevet", 21, 10, 10),
+    _r("ט\"ו בשבט", "tu_bishvat", 22, 11, 15),
+    _r("תענית אסתר", "taanit_esther", 23, ADAR, 13, shabbos=-2),
+    _r("פורים", "purim", 24, ADAR, 14),
+    _r("שושן פורים", "shushan_purim", 25, ADAR, 15),
+    _r("ליל בדיקת חמץ", "leil_bedikat_chametz", 26, 1, 14, start=SUNSET, end=DAWN, shabbos=-1),
+    _r("ערב פסח", "erev_pesach", 27, 1, 14, start=DAWN, tags=frozenset({EREV})),
+    _r("פסח א׳", "pesach_1", 28, 1, 15),
+    _r("פסח ב׳", "pesach_2", 29, 1, 16),
+    _r("פסח א׳ וב׳", "pesach_1_2", None, 1, 15, 16),
+    _r("חול המועד פסח", "chol_hamoed_pesach", 30, 1, 17, 18, 19, 20),
+    _r("שביעי של פסח", "pesach_seventh", 31, 1, 21),
+    _r("אחרון של פסח", "pesach_last", 32, 1, 22),
+    _r("ל\"ג בעומר", "lag_baomer", 33, 2, 18),
+    _r("ערב שבועות", "erev_shavuot", 34, 3, 5, start=DAWN, tags=frozenset({EREV})),
+    _r("שבועות א׳", "shavuot_1", 35, 3, 6),
+    _r("שבועות ב׳", "shavuot_2", 36, 3, 7),
+    _r("שבועות א׳ וב׳", "shavuot_1_2", None, 3, 6, 7),
+    _r("צום שבעה עשר בתמוז", "tzom_17_tammuz", 37, 4, 17, shabbos=1),
+    _r("תשעה באב", "tzom_9_av", 38, 5, 9, shabbos=None),
+    _r("תשעה באב נדחה", "tzom_9_av_deferred", 39, 5, 10, weekdays=(6,)),
+    _r("ראש חודש", "rosh_chodesh", None, None, 1, 30),
+    # Periods without a flag of their own
+    _r("ספירת העומר", "sefirat_haomer", None, 1, *range(16, 31),
+       tags=frozenset({NO_MUSIC}), attribute=False),
+    _r("ספירת העומר", "sefirat_haomer", None, 2, *range(1, 18), *range(19, 30),
+       tags=frozenset({NO_MUSIC}), attribute=False),
+    _r("ספירת העומר", "sefirat_haomer", None, 3, *range(1, 6),
+       tags=frozenset({NO_MUSIC}), attribute=False),
+    _r("בין המצרים", "bein_hametzarim", None, 4, *range(17, 30),
+       tags=frozenset({NO_MUSIC}), attribute=False),
+    _r("בין המצרים", "bein_hametzarim", None, 5, *range(1, 10),
+       tags=frozenset({NO_MUSIC}), attribute=False),
+)
+
+
+class _Entry(NamedTuple):
+    rule: HolidayRule
+    weekdays: frozenset[int]
+    # past the first month of a multi-day rule: whether it still runs depends
+    # on that month's length
+    check_span: bool = False
+
+
+def month_key(month: int, leap: bool) -> int:
+    """The rule-table month of a pyluach month number (see ADAR / ADAR_I)."""
+    if month == 13 or (month == 12 and not leap):
+        return ADAR
+    if month == 12:
+        return ADAR_I
+    return month
+
+
+class RuleTable:
+    """RULES compiled into lookup tables."""
+
+    def __init__(self, rules: Iterable[HolidayRule]) -> None:
+        self.rules = tuple(rules)
+        by_date: defaultdict[tuple[int, int], list[_Entry]] = defaultdict(list)
+        by_day: defaultdict[int, list[_Entry]] = defaultdict(list)
+        by_parsha: defaultdict[str, list[_Entry]] = defaultdict(list)
+        moved: defaultdict[tuple[int, int], list[_Entry]] = defaultdict(list)
+        erev: set[tuple[int, int]] = set()
+
+        for rule in self.rules:
+            weekdays = frozenset(rule.weekdays) if rule.weekdays else _ALL_WEEKDAYS
+            if rule.shabbos != 0:
+                weekdays -= {_SHABBOS}
+            if rule.parshios:
+                for parsha in rule.parshios:
+                    by_parsha[parsha].append(_Entry(rule, weekdays))
+                continue
+            if rule.month is None:
+                for day in rule.days:
+                    by_day[day].append(_Entry(rule, weekdays))
+                continue
+
+            for key, check in self._dates(rule):
+                by_date[key].append(_Entry(rule, weekdays, check))
+                if EREV in rule.tags:
+                    erev.add(key)
+            if rule.shabbos:
+                # a fast moved off Shabbos is observed on the weekday it lands on
+                for day in rule.days:
+                    moved_day = day + rule.shabbos
+                    if not 1 <= moved_day <= 29:
+                        raise ValueError(f"{rule.name}: cannot move {day} by {rule.shabbos}")
+                    landing = frozenset({(_SHABBOS + rule.shabbos) % 7})
+                    moved[(rule.month, moved_day)].append(_Entry(rule, landing))
+
+        freeze = lambda table: {key: tuple(entries) for key, entries in table.items()}
+        self.by_date = freeze(by_date)
+        self.by_day = freeze(by_day)
+        self.by_parsha = freeze(by_parsha)
+        self.moved = freeze(moved)
+        self.erev_dates = frozenset(erev)
+        # the flags needing the weekly parsha
+        self.parsha_names = frozenset(
+            entry.rule.name for entries in self.by_parsha.values() for entry in entries
+        )
+
+        names = dict.fromkeys(rule.name for rule in self.rules if rule.attribute)
+        self.names: tuple[str, ...] = tuple(names)
+        self.slugs: dict[str, str] = {
+            rule.name: rule.slug for rule in self.rules if rule.attribute
+        }
+        ranked = sorted(
+            {rule.name: rule.priority for rule in self.rules
+             if rule.attribute and rule.priority is not None}.items(),
+            key=lambda item: item[1],
+        )
+        self.allowed: tuple[str, ...] = tuple(name for name, _ in ranked)
+
+    @staticmethod
+    def _dates(rule: HolidayRule) -> Iterator[tuple[tuple[int, int], bool]]:
+        if rule.length == 1:
+            for day in rule.days:
+                yield (rule.month, day), False
+            return
+        first = rule.days[0]
+        spill: set[int] = set()
+        for offset in range(rule.length):
+            day = first + offset
+            if day <= 30:
+                yield (rule.month, day), False
+            # into the next month after a 29- or a 30-day month
+            for month_length in (29, 30):
+                if day > month_length:
+                    spill.add(day - month_length)
+        if spill and rule.month in (6, 12, 13, ADAR_I):
+            raise ValueError(f"{rule.name}: cannot run past the end of month {rule.month}")
+        for day in sorted(spill):
+            yield (rule.month + 1, day), True
+
+    def matches(
+        self,
+        day: datetime.date,
+        hd: HebDate,
+        parsha: str | None = None,
+        tag: str | None = None,
+    ) -> Iterator[HolidayRule]:
+        """Rules falling on Gregorian *day* (Hebrew date *hd*, weekly *parsha*)."""
+        weekday = day.weekday()
+        key = (month_key(hd.month, hd.leap), hd.day)
+        candidates = (
+            self.by_date.get(key, ())
+            + self.moved.get(key, ())
+            + self.by_day.get(hd.day, ())
+            + (self.by_parsha.get(parsha, ()) if parsha else ())
+        )
+        for entry in candidates:
+            rule = entry.rule
+            if weekday not in entry.weekdays:
+                continue
+            if tag is not None and tag not in rule.tags:
+                continue
+            if rule.leap_only and not hd.leap:
+                continue
+            if entry.check_span:
+                start = to_gregorian(hd.year, rule.month, rule.days[0])
+                if not 0 <= (day - start).days < rule.length:
+                    continue
+            yield rule
+
+
+HOLIDAY_RULES = RuleTable(RULES)
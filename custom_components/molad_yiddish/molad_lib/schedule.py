@@ -0,0 +1,140 @@
+# custom_components/molad_yiddish/molad_lib/schedule.py
+"""
+Forward-looking schedule of Shabbos / Yom Tov transitions.
+
+Built once for a span of days from the merged melacha spans and the Erev
+days; each kind of event is a sorted list of instants, so "what is the next
+candle-lighting after now" is one bisect.
+"""
+from __future__ import annotations
+
+import datetime
+from bisect import bisect_right
+from datetime import timedelta
+
+from astral.sun import sun
+
+from .convert import hebrew_date
+from .melacha import build_spans, candle_lightings
+from .rules import HOLIDAY_RULES
+
+# (Hebrew month, day) of Erev‐Yom‐Tov dates (pyluach numbering): the rules
+# tagged EREV, including Hoshana Rabba
+EREV_DATES = HOLIDAY_RULES.erev_dates
+
+CANDLE_LIGHTING = "candle_lighting"
+HAVDALAH = "havdalah"
+EREV_START = "erev_start"
+YOM_TOV_START = "yom_tov_start"
+
+EVENT_KINDS = (CANDLE_LIGHTING, HAVDALAH, EREV_START, YOM_TOV_START)
+
+# Days covered by a freshly built schedule
+DEFAULT_HORIZON_DAYS = 60
+
+
+def is_erev(day: datetime.date) -> bool:
+    """True on Erev Shabbos and on the Erev days in EREV_DATES."""
+    hd = hebrew_date(day)
+    return day.weekday() == 4 or (hd.month, hd.day) in EREV_DATES
+
+
+def erev_state(
+    now: datetime.datetime,
+    location,
+    options,
+) -> tuple[bool, dict[str, bool | str]]:
+    """Whether *now* is in an Erev window (alos until candle-lighting), with its details."""
+    tz = location.tz
+    now = now.astimezone(tz)
+    today = now.date()
+
+    s = sun(location.observer, date=today, tzinfo=tz)
+    alos = s["dawn"]
+    candle_time = s["sunset"] - timedelta(minutes=options.candle_offset)
+
+    # holiday vs Shabbos
+    hd = hebrew_date(today)
+    is_erev_holiday = (hd.month, hd.day) in EREV_DATES
+    is_erev_shabbos = (today.weekday() == 4) and (now < candle_time)
+
+    return (is_erev_holiday or is_erev_shabbos) and (alos <= now < candle_time), {
+        "is_erev_holiday": is_erev_holiday,
+        "is_erev_shabbos": is_erev_shabbos,
+        "alos": alos.isoformat(),
+        "candle_time": candle_time.isoformat(),
+        "window_start": alos.isoformat(),
+        "window_end": candle_time.isoformat(),
+    }
+
+
+def next_erev_change(
+    now: datetime.datetime,
+    location,
+    options,
+) -> datetime.datetime:
+    """The next instant erev_state() changes: alos or candle-lighting of an
+    Erev day, else the next midnight (where its per-day attributes change)."""
+    tz = location.tz
+    now = now.astimezone(tz)
+    today = now.date()
+    midnight = datetime.datetime.combine(today + timedelta(days=1), datetime.time(), tz)
+    if not is_erev(today):
+        return midnight
+    s = sun(location.observer, date=today, tzinfo=tz)
+    for boundary in (s["dawn"], s["sunset"] - timedelta(minutes=options.candle_offset)):
+        if boundary > now:
+            return boundary
+    return midnight
+
+
+class Schedule:
+    """Sorted instants per event kind, valid until *horizon*."""
+
+    def __init__(self, events: dict[str, list[datetime.datetime]], horizon: datetime.date) -> None:
+        self.events = {kind: sorted(times) for kind, times in events.items()}
+        self.horizon = horizon
+
+    def next(self, kind: str, now: datetime.datetime) -> datetime.datetime | None:
+        """The first *kind* event strictly after *now*, or None past the horizon."""
+        times = self.events[kind]
+        i = bisect_right(times, now)
+        return times[i] if i < len(times) else None
+
+    def next_any(self, now: datetime.datetime) -> datetime.datetime | None:
+        """The first event of any kind strictly after *now*."""
+        upcoming = [t for t in (self.next(kind, now) for kind in self.events) if t]
+        return min(upcoming) if upcoming else None
+
+
+def build_schedule(
+    start: datetime.date,
+    location,
+    candle_offset: int,
+    havdalah_offset: int,
+    days: int = DEFAULT_HORIZON_DAYS,
+    diaspora: bool = True,
+) -> Schedule:
+    """Build the event schedule for [start, start + days]."""
+    tz = location.tz
+    last = start + timedelta(days=days)
+    # start a few days back so a Yom Tov chain already under way is whole
+    spans = build_spans(
+        start - timedelta(days=4), last, location, tz, candle_offset, havdalah_offset, diaspora
+    )
+    events: dict[str, list[datetime.datetime]] = {kind: [] for kind in EVENT_KINDS}
+    for span in spans:
+        events[CANDLE_LIGHTING].extend(
+            candle_lightings(span, location, tz, candle_offset, havdalah_offset)
+        )
+        events[HAVDALAH].append(span.end)
+        if span.yomtov_start is not None:
+            events[YOM_TOV_START].append(span.yomtov_start)
+
+    day = start
+    while day <= last:
+        if is_erev(day):
+            events[EREV_START].append(sun(location.observer, date=day, tzinfo=tz)["dawn"])
+        day += timedelta(days=1)
+
+    return Schedule(events, last)
@@ -1,15 +1,14 @@
 # /config/custom_components/molad_yiddish/molad_lib/sfirah_helper.py
 
 import logging
+import unicodedata
 from datetime import timedelta, date, datetime
 
-from astral import LocationInfo
 from astral.sun import sun
-from homeassistant.core import HomeAssistant
-from homeassistant.util import dt as dt_util
 
-from hdate.converters import gdate_to_jdn
-from hdate.hebrew_date import HebrewDate
+from .convert import hebrew_date
+from .options import Options
+from .zmanim import Location
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -121,65 +120,82 @@ SEFIRA_MIDDOS = [
   "מַלְכוּת שֶׁבְּמַלְכוּת"
 ]
 
+def _strip_nikud(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text)
+    return "".join(ch for ch in text if unicodedata.category(ch)[0] != "M")
+
+
+def _raw_omer_day(for_date: date) -> int:
+    """Calculate raw Omer day (1–49) based on the Hebrew date."""
+    heb = hebrew_date(for_date)
+    month = heb.month
+    day = heb.day
+    # Nisan 16–30 → 1–15
+    if month == 1 and day >= 16:
+        return day - 15
+    # Iyar 1–29 → 16–44
+    if month == 2:
+        return 15 + day
+    # Sivan 1–5 → 45–49
+    if month == 3 and day <= 5:
+        return 44 + day
+    return 0
+
+
+def omer_day(now: datetime, location: Location, options: Options) -> int:
+    """
+    Compute the final Omer day, bumping by one after sunset + user-defined Havdalah.
+    Returns an integer 0–49 (0 means before Omer).
+    """
+    tz = location.tz
+    now = now.astimezone(tz)
+    today = now.date()
+    raw = _raw_omer_day(today)
+    threshold = sun(location.observer, date=today, tzinfo=tz)["sunset"] + timedelta(
+        minutes=options.havdalah_offset
+    )
+    if now >= threshold:
+        raw += 1
+    return max(0, min(raw, len(SEFIRA_TEXTS) - 1))
+
+
+def sefirah_text(now: datetime, location: Location, options: Options) -> str:
+    """Return the Hebrew Omer text for *now*."""
+    text = SEFIRA_TEXTS[omer_day(now, location, options)]
+    return _strip_nikud(text) if options.strip_nikud else text
+
+
+def middos_text(now: datetime, location: Location, options: Options) -> str:
+    """Return the Hebrew Middot text for the Omer day at *now*."""
+    text = SEFIRA_MIDDOS[omer_day(now, location, options)]
+    return _strip_nikud(text) if options.strip_nikud else text
+
+
 class SfirahHelper:
     """
     Compute Omer count and corresponding Hebrew texts based on Hebrew date
-    and sunset + user-defined Havdalah offset.
+    and sunset + user-defined Havdalah offset, for a fixed location.
     """
 
-    def __init__(self, hass: HomeAssistant, havdalah_offset: int):
-        self.hass = hass
-        self.latitude = hass.config.latitude
-        self.longitude = hass.config.longitude
-        self.time_zone = hass.config.time_zone
+    def __init__(self, location: Location, havdalah_offset: int):
+        self.location = location
         # Store the user’s offset instead of hard-coding 72
-        self._havdalah_offset = havdalah_offset
-
-    def _get_threshold(self, for_date: date) -> datetime:
-        """Return the datetime of sunset + user-defined offset for the given date."""
-        loc = LocationInfo(
-            name="",
-            region="",
-            timezone=self.time_zone,
-            latitude=self.latitude,
-            longitude=self.longitude,
-        )
-        s = sun(loc.observer, date=for_date, tzinfo=dt_util.DEFAULT_TIME_ZONE)
-        return s["sunset"] + timedelta(minutes=self._havdalah_offset)
-
-    def _get_raw_omer_day(self, for_date: date) -> int:
-        """Calculate raw Omer day (1–49) based on the Hebrew date."""
-        jdn = gdate_to_jdn(for_date)
-        heb = HebrewDate.from_jdn(jdn)
-        month_name = str(heb.month)
-        day = heb.day
-        # Nisan 16–30 → 1–15
-        if month_name == "ניסן" and day >= 16:
-            return day - 15
-        # Iyar 1–29 → 16–44
-        if month_name == "אייר":
-            return 15 + day
-        # Sivan 1–5 → 45–49
-        if month_name == "סיון" and day <= 5:
-            return 44 + day
-        return 0
+        self._options = Options(havdalah_offset=havdalah_offset)
+
+    def set_havdalah_offset(self, havdalah_offset: int) -> None:
+        self._options = self._options._replace(havdalah_offset=havdalah_offset)
+
+    def _now(self) -> datetime:
+        return datetime.now(self.location.tz)
 
     def get_effective_omer_day(self) -> int:
-        """
-        Compute the final Omer day, bumping by one after sunset + user-defined Havdalah.
-        Returns an integer 0–49 (0 means before Omer).
-        """
-        today = dt_util.now().date()
-        raw = self._get_raw_omer_day(today)
-        # Use the new, configurable threshold
-        if dt_util.now() >= self._get_threshold(today):
-            raw += 1
-        return max(0, min(raw, len(SEFIRA_TEXTS) - 1))
+        """The Omer day right now (0 means before Omer)."""
+        return omer_day(self._now(), self.location, self._options)
 
     def get_sefirah_text(self) -> str:
         """Return the Hebrew Omer text for the current day."""
-        return SEFIRA_TEXTS[self.get_effective_omer_day()]
+        return sefirah_text(self._now(), self.location, self._options)
 
     def get_middos_text(self) -> str:
         """Return the Hebrew Middot text for the current Omer day."""
-        return SEFIRA_MIDDOS[self.get_effective_omer_day()]
+        return middos_text(self._now(), self.location, self._options)
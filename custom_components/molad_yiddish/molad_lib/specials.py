@@ -1,5 +1,7 @@
 from datetime import date, timedelta
-from pyluach import dates, parshios, hebrewcal
+from pyluach import dates, parshios
+
+from .convert import hebrew_date, is_leap_year, to_gregorian
 
 def get_special_shabbos_name(today: date = None) -> str:
     if today is None:
@@ -14,47 +16,44 @@ def get_special_shabbos_name(today: date = None) -> str:
         else:
             raise ValueError("Unsupported date type for 'today'")
 
-    greg_today = dates.GregorianDate.from_pydate(today_date)
-    next_shabbat = greg_today.shabbos()
-    shabbat_date = next_shabbat.to_pydate()
-    shabbat_heb = next_shabbat.to_heb()
+    shabbat_date = today_date + timedelta(days=(5 - today_date.weekday()) % 7)
+    shabbat_heb = hebrew_date(shabbat_date)
 
     events = []
     Y = shabbat_heb.year
 
-    adar_month = 13 if hebrewcal.Year(Y).leap else 12
-    rc_adar = dates.HebrewDate(Y, adar_month, 1).to_pydate()
+    adar_month = 13 if shabbat_heb.leap else 12
+    rc_adar = to_gregorian(Y, adar_month, 1)
     delta_days = (rc_adar - shabbat_date).days
     if 0 <= delta_days <= 6:
         events.append("שבת שקלים")
 
-    purim = dates.HebrewDate(Y, adar_month, 14).to_pydate()
+    purim = to_gregorian(Y, adar_month, 14)
     delta_days = (purim - shabbat_date).days
     if 1 <= delta_days <= 6:
         events.append("שבת זכור")
 
-    rc_nisan = dates.HebrewDate(Y, 1, 1).to_pydate()
+    rc_nisan = to_gregorian(Y, 1, 1)
     delta_days = (rc_nisan - shabbat_date).days
     if 0 <= delta_days <= 6:
         events.append("שבת החודש")
 
     next_week_date = shabbat_date + timedelta(days=7)
-    next_shabbat2 = dates.GregorianDate.from_pydate(next_week_date)
-    next_shabbat2_heb = next_shabbat2.to_heb()
-    rc_nisan2 = dates.HebrewDate(next_shabbat2_heb.year, 1, 1).to_pydate()
+    next_shabbat2_heb = hebrew_date(next_week_date)
+    rc_nisan2 = to_gregorian(next_shabbat2_heb.year, 1, 1)
     delta_next = (rc_nisan2 - next_week_date).days
     if 0 <= delta_next <= 6 and "שבת החודש" not in events:
         events.append("שבת פרה")
 
-    pesach = dates.HebrewDate(Y, 1, 15).to_pydate()
+    pesach = to_gregorian(Y, 1, 15)
     delta_days = (pesach - shabbat_date).days
-    if 0 < delta_days <= 8:
+    if 1 <= delta_days <= 7:
         events.append("שבת הגדול")
 
     if shabbat_heb.month == 7 and 3 <= shabbat_heb.day <= 9:
         events.append("שבת שובה")
 
-    tisha_bav = dates.HebrewDate(Y, 5, 9).to_pydate()
+    tisha_bav = to_gregorian(Y, 5, 9)
     delta_days = (tisha_bav - shabbat_date).days
     if 0 <= delta_days <= 6:
         events.append("שבת חזון")
@@ -62,27 +61,30 @@ def get_special_shabbos_name(today: date = None) -> str:
     if shabbat_heb.month == 5 and 10 <= shabbat_heb.day <= 16:
         events.append("שבת נחמו")
 
-    parsha_indices = parshios.getparsha(next_shabbat)
+    parsha_indices = parshios.getparsha(dates.GregorianDate.from_pydate(shabbat_date))
     chazak_ports = {11, 22, 32, 42}
     if parsha_indices and any(idx in chazak_ports for idx in parsha_indices):
         events.append("שבת חזק")
 
-    if ((not hebrewcal.Year(Y).leap and shabbat_heb.month == 12 and shabbat_heb.day == 15) or
-        (hebrewcal.Year(Y).leap and shabbat_heb.month == 13 and shabbat_heb.day == 15)):
+    if ((not shabbat_heb.leap and shabbat_heb.month == 12 and shabbat_heb.day == 15) or
+        (shabbat_heb.leap and shabbat_heb.month == 13 and shabbat_heb.day == 15)):
         events.append("פורים משולש")
 
-    if shabbat_heb.month == 13 or (shabbat_heb.month == 12 and not hebrewcal.Year(shabbat_heb.year).leap):
+    if shabbat_heb.month == 13 or (shabbat_heb.month == 12 and not shabbat_heb.leap):
         next_month_num = 1
-        next_month_year = shabbat_heb.year + 1
+        next_month_year = shabbat_heb.year
     else:
         next_month_num = shabbat_heb.month + 1
         next_month_year = shabbat_heb.year
 
-    next_rc_date = dates.HebrewDate(next_month_year, next_month_num, 1).to_pydate()
+    next_rc_date = to_gregorian(next_month_year, next_month_num, 1)
+    if hebrew_date(next_rc_date - timedelta(days=1)).day == 30:
+        # two-day Rosh Chodesh: announced before its first day, the 30th
+        next_rc_date -= timedelta(days=1)
     delta_days = (next_rc_date - shabbat_date).days
     if 1 <= delta_days <= 7 and next_month_num != 7:
         if next_month_num == 12:
-            month_name = "אדר א׳" if hebrewcal.Year(next_month_year).leap else "אדר"
+            month_name = "אדר א׳" if is_leap_year(next_month_year) else "אדר"
         elif next_month_num == 13:
             month_name = "אדר ב׳"
         else:
@@ -0,0 +1,461 @@
+# custom_components/molad_yiddish/molad_lib/validate.py
+"""
+Golden-data validation of the calendar engine.
+
+Splits a Gregorian date range across a process pool and, for every date,
+compares what the integration computes (hdate, pyluach, MoladHelper and
+specials) with an independent arithmetic reference calendar:
+
+    * Hebrew date (hdate, pyluach and the _HD2PY month-name mapping)
+    * molad announcement of the coming month
+    * Rosh Chodesh days
+    * Shabbos Mevorchim / upcoming Shabbos Mevorchim flags
+    * special Shabbos names
+    * Yom Tov flags (hdate and pyluach, diaspora)
+    * holiday flags of the rule table at noon in New York (pyluach
+      festival() / fast_day(), diaspora)
+
+Runs offline and its output is deterministic for a given range.  From
+custom_components/molad_yiddish:
+
+    python -m molad_lib.validate 1800-01-01 2200-12-31 --workers 8
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import hdate
+import hdate.converters
+from hdate.hebrew_date import HebrewDate as HHebrewDate
+from pyluach import dates as pdates
+from pyluach import parshios
+
+from . import specials
+from .helper import _HD2PY, MoladHelper
+from .holidays import holiday_flags
+from .options import Options
+from .zmanim import Location
+
+# ─── Reference calendar (pyluach month numbering: 1=Nissan … 13=Adar II) ────
+
+# R.D. ordinal of 1 Tishrei AM 1 (same numbering as datetime.date.toordinal)
+_HEBREW_EPOCH = -1373427
+_PARTS_PER_DAY = 25920
+_PARTS_PER_MONTH = 29 * _PARTS_PER_DAY + 12 * 1080 + 793
+# Molad of Tishrei AM 1 (BaHaRaD), counted from Sunday 18:00
+_MOLAD_BAHARAD = 1 * _PARTS_PER_DAY + 5 * 1080 + 204
+
+_DAY_NAMES = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Shabbos"]
+
+_MONTH_NAMES = {
+    1: "ניסן", 2: "אייר", 3: "סיון", 4: "תמוז", 5: "אב", 6: "אלול",
+    7: "תשרי", 8: "חשון", 9: "כסלו", 10: "טבת", 11: "שבט",
+}
+
+# (month, day) of the diaspora Yamim Tovim, including Yom Kippur
+_YOM_TOV_DAYS = {
+    (7, 1), (7, 2), (7, 10), (7, 15), (7, 16), (7, 22), (7, 23),
+    (1, 15), (1, 16), (1, 21), (1, 22),
+    (3, 6), (3, 7),
+}
+
+# pyluach parsha indices that close a book of the Torah
+_CHAZAK_PARSHIOS = {11, 22, 32, 42}
+
+# Holiday flag → the pyluach festival() / fast_day() name it matches
+_FLAG_FESTIVALS = {
+    "ראש השנה א׳ וב׳": "Rosh Hashana",
+    "צום גדליה": "Tzom Gedalia",
+    "יום הכיפורים": "Yom Kippur",
+    "סוכות א׳ וב׳": "Succos",
+    "חול המועד סוכות": "Succos",
+    "הושענא רבה": "Succos",
+    "שמיני עצרת": "Shmini Atzeres",
+    "שמחת תורה": "Simchas Torah",
+    "חנוכה": "Chanuka",
+    "צום עשרה בטבת": "10 of Teves",
+    "ט\"ו בשבט": "Tu B'shvat",
+    "תענית אסתר": "Taanis Esther",
+    "פורים": "Purim",
+    "שושן פורים": "Shushan Purim",
+    "פסח א׳ וב׳": "Pesach",
+    "חול המועד פסח": "Pesach",
+    "שביעי של פסח": "Pesach",
+    "אחרון של פסח": "Pesach",
+    "ל\"ג בעומר": "Lag Ba'omer",
+    "שבועות א׳ וב׳": "Shavuos",
+    "צום שבעה עשר בתמוז": "17 of Tamuz",
+    "תשעה באב": "9 of Av",
+    "תשעה באב נדחה": "9 of Av",
+}
+_FESTIVALS = frozenset(_FLAG_FESTIVALS.values())
+
+# Where the holiday flags are evaluated (noon, when every day rule is open)
+_FLAGS_LOCATION = Location(40.7128, -74.0060, "America/New_York")
+
+
+def _is_leap(year: int) -> bool:
+    return (7 * year + 1) % 19 < 7
+
+
+def _months_elapsed(year: int) -> int:
+    """Months from the epoch to 1 Tishrei of *year*."""
+    return (235 * year - 234) // 19
+
+
+@lru_cache(maxsize=None)
+def _elapsed_days(year: int) -> int:
+    months = _months_elapsed(year)
+    parts = 12084 + 13753 * months
+    day = 29 * months + parts // _PARTS_PER_DAY
+    if (3 * (day + 1)) % 7 < 3:
+        day += 1
+    return day
+
+
+@lru_cache(maxsize=None)
+def _new_year(year: int) -> int:
+    """Ordinal of 1 Tishrei of *year*, including the dechiyos."""
+    ny0, ny1, ny2 = _elapsed_days(year - 1), _elapsed_days(year), _elapsed_days(year + 1)
+    if ny2 - ny1 == 356:
+        correction = 2
+    elif ny1 - ny0 == 382:
+        correction = 1
+    else:
+        correction = 0
+    return _HEBREW_EPOCH + ny1 + correction
+
+
+def _month_length(year: int, month: int) -> int:
+    days = _new_year(year + 1) - _new_year(year)
+    if month == 8:
+        return 30 if days % 10 == 5 else 29
+    if month == 9:
+        return 29 if days % 10 == 3 else 30
+    if month == 12:
+        return 30 if _is_leap(year) else 29
+    return 30 if month in (1, 3, 5, 7, 11) else 29
+
+
+@lru_cache(maxsize=None)
+def _year_months(year: int) -> tuple[tuple[int, int, int], ...]:
+    """(month, first ordinal, length) for every month of *year*, Tishrei first."""
+    order = [7, 8, 9, 10, 11, 12] + ([13] if _is_leap(year) else []) + [1, 2, 3, 4, 5, 6]
+    result, start = [], _new_year(year)
+    for month in order:
+        length = _month_length(year, month)
+        result.append((month, start, length))
+        start += length
+    return tuple(result)
+
+
+def _hebrew_from_ordinal(ordinal: int) -> tuple[int, int, int]:
+    year = (ordinal - _HEBREW_EPOCH) * 98496 // 35975351 + 1
+    while _new_year(year + 1) <= ordinal:
+        year += 1
+    while _new_year(year) > ordinal:
+        year -= 1
+    for month, start, length in _year_months(year):
+        if start <= ordinal < start + length:
+            return year, month, ordinal - start + 1
+    raise ValueError(f"ordinal {ordinal} outside year {year}")
+
+
+def _ordinal_from_hebrew(year: int, month: int, day: int) -> int:
+    for m, start, _length in _year_months(year):
+        if m == month:
+            return start + day - 1
+    raise ValueError(f"month {month} not in year {year}")
+
+
+def _next_month(year: int, month: int) -> tuple[int, int]:
+    if month == 6:
+        return year + 1, 7
+    if month == 12 and not _is_leap(year) or month == 13:
+        return year, 1
+    if month == 12:
+        return year, 13
+    return year, month % 13 + 1
+
+
+def _molad(year: int, month: int) -> tuple[str, int, int, str, int]:
+    """Molad announcement of (year, month): day name, h12, minutes, am/pm, chalakim."""
+    months = _months_elapsed(year)
+    for m, _start, _length in _year_months(year):
+        if m == month:
+            break
+        months += 1
+    total = _MOLAD_BAHARAD + months * _PARTS_PER_MONTH
+    weekday = (total // _PARTS_PER_DAY) % 7
+    hours = (total % _PARTS_PER_DAY) // 1080
+    parts = total % 1080
+    clock = hours + 18
+    if clock < 24:
+        weekday = (weekday - 1) % 7
+    else:
+        clock -= 24
+    return (
+        _DAY_NAMES[weekday],
+        clock % 12 or 12,
+        parts // 18,
+        "am" if clock < 12 else "pm",
+        parts % 18,
+    )
+
+
+def _rc_ordinals(year: int, month: int) -> list[int]:
+    """Rosh Chodesh ordinals of (year, month): 30th of the prior month if any, then the 1st."""
+    first = _ordinal_from_hebrew(year, month, 1)
+    prev = _hebrew_from_ordinal(first - 1)
+    return [first - 1, first] if prev[2] == 30 else [first]
+
+
+def _ref_next_rc(ordinal: int) -> tuple[int, int, list[int]]:
+    """The next Rosh Chodesh whose first day is strictly after *ordinal*."""
+    y, m, _d = _hebrew_from_ordinal(ordinal)
+    y, m = _next_month(y, m)
+    rc = _rc_ordinals(y, m)
+    if rc[0] <= ordinal:
+        y, m = _next_month(y, m)
+        rc = _rc_ordinals(y, m)
+    return y, m, rc
+
+
+def _ref_mevorchim(g: datetime.date) -> bool:
+    if g.weekday() != 5:
+        return False
+    ordinal = g.toordinal()
+    _y, month, rc = _ref_next_rc(ordinal)
+    return month != 7 and 1 <= rc[0] - ordinal <= 7
+
+
+def _ref_special_shabbos(g: datetime.date) -> set[str]:
+    shabbos = g + datetime.timedelta(days=(5 - g.weekday()) % 7)
+    s = shabbos.toordinal()
+    year, month, day = _hebrew_from_ordinal(s)
+    adar = 13 if _is_leap(year) else 12
+    events: set[str] = set()
+
+    def delta(m: int, d: int, y: int = year) -> int:
+        return _ordinal_from_hebrew(y, m, d) - s
+
+    if 0 <= delta(adar, 1) <= 6:
+        events.add("שבת שקלים")
+    if 1 <= delta(adar, 14) <= 7:
+        events.add("שבת זכור")
+    if 0 <= delta(1, 1) <= 6:
+        events.add("שבת החודש")
+    next_year = _hebrew_from_ordinal(s + 7)[0]
+    if 0 <= delta(1, 1, next_year) - 7 <= 6:
+        events.add("שבת פרה")
+    if 1 <= delta(1, 15) <= 7:
+        events.add("שבת הגדול")
+    if month == 7 and 3 <= day <= 9:
+        events.add("שבת שובה")
+    if 0 <= delta(5, 9) <= 6:
+        events.add("שבת חזון")
+    if month == 5 and 10 <= day <= 16:
+        events.add("שבת נחמו")
+    if month == adar and day == 15:
+        events.add("פורים משולש")
+
+    parsha = parshios.getparsha(pdates.GregorianDate.from_pydate(shabbos))
+    if parsha and any(idx in _CHAZAK_PARSHIOS for idx in parsha):
+        events.add("שבת חזק")
+
+    if _ref_mevorchim(shabbos):
+        rc_year, rc_month, _rc = _ref_next_rc(s)
+        if rc_month == 12:
+            name = "אדר א׳" if _is_leap(rc_year) else "אדר"
+        elif rc_month == 13:
+            name = "אדר ב׳"
+        else:
+            name = _MONTH_NAMES[rc_month]
+        events.add(f"מברכים חודש {name}")
+    return events
+
+
+# ─── Per-date checks ─────────────────────────────────────────────────────────
+
+class _Day:
+    """One date under test plus its reference Hebrew date."""
+
+    __slots__ = ("g", "ordinal", "ref", "next_month", "helper", "special_cache")
+
+    def __init__(self, g: datetime.date, helper: MoladHelper, special_cache: dict) -> None:
+        self.g = g
+        self.ordinal = g.toordinal()
+        self.ref = _hebrew_from_ordinal(self.ordinal)
+        self.next_month = _next_month(self.ref[0], self.ref[1])
+        self.helper = helper
+        self.special_cache = special_cache
+
+
+def _check_hebrew_date_hdate(day: _Day):
+    hd = HHebrewDate.from_jdn(hdate.converters.gdate_to_jdn(day.g))
+    return day.ref, (hd.year, hd.month.biblical_order, hd.day)
+
+
+def _check_hebrew_date_pyluach(day: _Day):
+    pd = pdates.HebrewDate.from_pydate(day.g)
+    return day.ref, (pd.year, pd.month, pd.day)
+
+
+def _check_month_map(day: _Day):
+    hd = HHebrewDate.from_jdn(hdate.converters.gdate_to_jdn(day.g))
+    return day.ref[1], _HD2PY.get(hd.month.name)
+
+
+def _check_molad(day: _Day):
+    m = day.helper.get_actual_molad(day.g)
+    return _molad(*day.next_month), (m.day, m.hours, m.minutes, m.am_or_pm, m.chalakim)
+
+
+def _check_rosh_chodesh(day: _Day):
+    expected = tuple(datetime.date.fromordinal(o) for o in _rc_ordinals(*day.next_month))
+    return expected, day.helper.get_rosh_chodesh_days(day.g).gdays
+
+
+def _check_shabbos_mevorchim(day: _Day):
+    return _ref_mevorchim(day.g), day.helper.is_shabbos_mevorchim(day.g)
+
+
+def _check_upcoming_shabbos_mevorchim(day: _Day):
+    upcoming = day.g + datetime.timedelta(days=(5 - day.g.weekday()) % 7 or 7)
+    return _ref_mevorchim(upcoming), day.helper.is_upcoming_shabbos_mevorchim(day.g)
+
+
+def _check_special_shabbos(day: _Day):
+    shabbos = day.g + datetime.timedelta(days=(5 - day.g.weekday()) % 7)
+    if shabbos not in day.special_cache:
+        day.special_cache[shabbos] = _ref_special_shabbos(day.g)
+    actual = specials.get_special_shabbos_name(day.g)
+    return day.special_cache[shabbos], set(actual.split("-")) if actual else set()
+
+
+def _check_yom_tov_hdate(day: _Day):
+    expected = (day.ref[1], day.ref[2]) in _YOM_TOV_DAYS
+    return expected, hdate.HDateInfo(day.g, diaspora=True).is_yom_tov
+
+
+def _check_yom_tov_pyluach(day: _Day):
+    expected = (day.ref[1], day.ref[2]) in _YOM_TOV_DAYS
+    pd = pdates.HebrewDate.from_pydate(day.g)
+    return expected, pd.festival(israel=False, include_working_days=False) is not None
+
+
+def _check_holiday_flags(day: _Day):
+    pd = pdates.HebrewDate.from_pydate(day.g)
+    names = {pd.festival(israel=False, include_working_days=True), pd.fast_day()}
+    noon = datetime.datetime.combine(day.g, datetime.time(12), _FLAGS_LOCATION.tz)
+    flags = holiday_flags(noon, _FLAGS_LOCATION, Options(), _FLAG_FESTIVALS)
+    return names & _FESTIVALS, {_FLAG_FESTIVALS[name] for name in _FLAG_FESTIVALS if flags[name]}
+
+
+CHECKS = {
+    "hebrew_date_hdate": _check_hebrew_date_hdate,
+    "hebrew_date_pyluach": _check_hebrew_date_pyluach,
+    "month_map": _check_month_map,
+    "molad": _check_molad,
+    "rosh_chodesh": _check_rosh_chodesh,
+    "shabbos_mevorchim": _check_shabbos_mevorchim,
+    "upcoming_shabbos_mevorchim": _check_upcoming_shabbos_mevorchim,
+    "special_shabbos": _check_special_shabbos,
+    "yom_tov_hdate": _check_yom_tov_hdate,
+    "yom_tov_pyluach": _check_yom_tov_pyluach,
+    "holiday_flags": _check_holiday_flags,
+}
+
+
+def _validate_chunk(args: tuple[int, int, int]) -> dict[str, list]:
+    """Validate the ordinals [first, last] and return {check: [checked, mismatches, examples]}."""
+    first, last, examples = args
+    helper = MoladHelper(None)
+    special_cache: dict = {}
+    result = {name: [0, 0, []] for name in CHECKS}
+
+    for ordinal in range(first, last + 1):
+        day = _Day(datetime.date.fromordinal(ordinal), helper, special_cache)
+        for name, check in CHECKS.items():
+            try:
+                expected, actual = check(day)
+            except Exception as err:  # an exception is reported as a mismatch
+                expected, actual = "no error", f"{type(err).__name__}: {err}"
+            entry = result[name]
+            entry[0] += 1
+            if expected != actual:
+                entry[1] += 1
+                if len(entry[2]) < examples:
+                    entry[2].append((day.g.isoformat(), _fmt(expected), _fmt(actual)))
+    return result
+
+
+def _fmt(value) -> str:
+    if isinstance(value, set):
+        return "-".join(sorted(value)) or "''"
+    if isinstance(value, list):
+        return ",".join(v.isoformat() if isinstance(v, datetime.date) else str(v) for v in value)
+    return str(value)
+
+
+def validate(
+    start: datetime.date,
+    end: datetime.date,
+    workers: int | None = None,
+    chunk_days: int = 366,
+    examples: int = 3,
+) -> dict[str, list]:
+    """Validate every date in [start, end] and return the merged per-check summary."""
+    first, last = start.toordinal(), end.toordinal()
+    chunks = [
+        (lo, min(lo + chunk_days - 1, last), examples)
+        for lo in range(first, last + 1, chunk_days)
+    ]
+    summary = {name: [0, 0, []] for name in CHECKS}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() yields in submission order, keeping the output deterministic
+        for result in pool.map(_validate_chunk, chunks):
+            for name, (checked, mismatches, found) in result.items():
+                entry = summary[name]
+                entry[0] += checked
+                entry[1] += mismatches
+                entry[2].extend(found[: examples - len(entry[2])])
+    return summary
+
+
+def format_summary(start: datetime.date, end: datetime.date, summary: dict[str, list]) -> str:
+    lines = [f"Calendar validation {start.isoformat()} .. {end.isoformat()}"]
+    lines.append(f"{'check':<28}{'checked':>9}{'mismatch':>10}")
+    for name in CHECKS:
+        checked, mismatches, found = summary[name]
+        lines.append(f"{name:<28}{checked:>9}{mismatches:>10}")
+        for when, expected, actual in found:
+            lines.append(f"    {when}  expected {expected}  got {actual}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m molad_lib.validate",
+        description="Compare the calendar engine against a reference calendar.",
+    )
+    parser.add_argument("start", type=datetime.date.fromisoformat)
+    parser.add_argument("end", type=datetime.date.fromisoformat)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-days", type=int, default=366)
+    parser.add_argument("--examples", type=int, default=3,
+                        help="mismatches to print per check")
+    args = parser.parse_args(argv)
+
+    summary = validate(args.start, args.end, args.workers, args.chunk_days, args.examples)
+    print(format_summary(args.start, args.end, summary))
+    return 1 if any(entry[1] for entry in summary.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+# custom_components/molad_yiddish/molad_lib/weekly.py
+"""
+Weekly readings: the parsha of the coming Shabbos and the Pirkei Avos
+chapter, for an explicit day.
+"""
+from __future__ import annotations
+
+import datetime
+from datetime import timedelta
+
+from pyluach import dates, parshios
+
+from .convert import hebrew_date, to_gregorian
+from .helper import int_to_hebrew
+
+NO_PEREK = "נישט אין די צייט פון פרקי אבות"
+
+
+def parsha_name(day: datetime.date) -> str:
+    """The parsha of the Shabbos on or after *day*, or "none" on a Yom Tov Shabbos."""
+    shabbat = day + timedelta(days=(5 - day.weekday()) % 7)
+    greg = dates.GregorianDate(shabbat.year, shabbat.month, shabbat.day)
+    if not parshios.getparsha(greg):
+        return "none"
+    heb = parshios.getparsha_string(greg, hebrew=True)
+    return f"פרשת {heb.replace(', ', '-')}"
+
+
+def perek_avot(day: datetime.date) -> str:
+    """Which פרק of Pirkei Avos is read the week of *day* (Pesach until Sukkos)."""
+    hd = hebrew_date(day)
+
+    # 1) Pesach – 15 ניסן of this Hebrew year
+    pesach = to_gregorian(hd.year, 1, 15)
+
+    # 2) First Shabbos after Pesach
+    offset = (5 - pesach.weekday()) % 7 or 7
+    first_shabbat = pesach + timedelta(days=offset)
+
+    # 3) Sukkos – 15 תשרי of next Hebrew year
+    sukkot = to_gregorian(hd.year + 1, 7, 15)
+
+    # 4) If today is between those two, cycle chapters 1–6
+    if first_shabbat <= day <= sukkot:
+        weeks_since = ((day - first_shabbat).days // 7) + 1
+        chap = ((weeks_since - 1) % 6) + 1
+        return f"פרק {int_to_hebrew(chap)}"
+    return NO_PEREK
@@ -0,0 +1,163 @@
+# custom_components/molad_yiddish/molad_lib/yahrzeit.py
+"""
+Yahrzeits, Hebrew birthdays and bar / bas mitzvahs.
+
+anniversary_date() applies the observance rules (after Calendrical
+Calculations' hebrew-yahrzeit / hebrew-birthday):
+
+* a yahrzeit of 30 Cheshvan / 30 Kislev falls on the 29th when the year
+  after the death had no 30th, else on the 1st of the next month when this
+  year has none;
+* a death in Adar of a plain year is observed in Adar I, one in Adar II in
+  the last Adar, and 30 Adar I is 30 Shevat in a plain year;
+* a birthday in the last Adar stays in the last Adar; a 30th missing this
+  year moves to the 1st of the next month.
+
+AnniversaryIndex computes every entry's date once for two Hebrew years and
+keeps them sorted, so "the next N" and "this week" are a bisect each.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+import datetime
+from datetime import timedelta
+from functools import lru_cache
+from typing import NamedTuple
+
+from .convert import hebrew_date, is_leap_year, to_gregorian
+
+YAHRZEIT = "yahrzeit"
+BIRTHDAY = "birthday"
+BAR_MITZVAH = "bar_mitzvah"
+BAS_MITZVAH = "bas_mitzvah"
+
+KINDS = (YAHRZEIT, BIRTHDAY, BAR_MITZVAH, BAS_MITZVAH)
+
+# Age of a one-time celebration, in Hebrew years
+_ONE_TIME = {BAR_MITZVAH: 13, BAS_MITZVAH: 12}
+
+_CHESHVAN, _KISLEV, _TEVES, _SHEVAT, _ADAR, _ADAR_II = 8, 9, 10, 11, 12, 13
+
+
+class Anniversary(NamedTuple):
+    """One tracked Hebrew date: the original (year, month, day) and its kind."""
+
+    name: str
+    year: int
+    month: int  # pyluach numbering: 12 = Adar (Adar I in a leap year), 13 = Adar II
+    day: int
+    kind: str = YAHRZEIT
+
+    @classmethod
+    def from_gregorian(
+        cls, name: str, day: datetime.date, after_sunset: bool = False, kind: str = YAHRZEIT
+    ) -> Anniversary:
+        """The anniversary of Gregorian *day* (the next Hebrew day if after sunset)."""
+        hd = hebrew_date(day + timedelta(days=1) if after_sunset else day)
+        return cls(name, hd.year, hd.month, hd.day, kind)
+
+    @classmethod
+    def from_hebrew(
+        cls, name: str, year: int, month: int, day: int, kind: str = YAHRZEIT
+    ) -> Anniversary:
+        """The anniversary of Hebrew (year, month, day); ValueError if that
+        date does not exist (Adar II of a common year, a missing 30th)."""
+        starts = _month_starts(year)
+        if month not in starts or month == 0:
+            raise ValueError(f"Hebrew year {year} has no month {month}")
+        if not 1 <= day <= _month_length(year, month):
+            raise ValueError(f"Month {month} of Hebrew year {year} has no day {day}")
+        return cls(name, year, month, day, kind)
+
+
+@lru_cache(maxsize=8)
+def _month_starts(year: int) -> dict[int, datetime.date]:
+    """First day of every month of Hebrew *year*, plus 0 → next Rosh Hashana."""
+    months = list(range(7, 13)) + ([13] if is_leap_year(year) else []) + list(range(1, 7))
+    starts = {month: to_gregorian(year, month, 1) for month in months}
+    starts[0] = to_gregorian(year + 1, 7, 1)
+    return starts
+
+
+def _month_length(year: int, month: int) -> int:
+    starts = _month_starts(year)
+    following = [d for d in starts.values() if d > starts[month]]
+    return (min(following) - starts[month]).days
+
+
+def _fixed(year: int, month: int, day: int) -> datetime.date:
+    """Hebrew (year, month, day), a missing 30th rolling into the next month."""
+    return _month_starts(year)[month] + timedelta(days=day - 1)
+
+
+def _last_adar(year: int) -> int:
+    return _ADAR_II if is_leap_year(year) else _ADAR
+
+
+def anniversary_date(anniversary: Anniversary, year: int) -> datetime.date | None:
+    """The Gregorian date *anniversary* is observed on in Hebrew *year*, if any."""
+    a = anniversary
+    if year <= a.year:
+        return None
+    if a.kind in _ONE_TIME:
+        if year != a.year + _ONE_TIME[a.kind]:
+            return None
+        return _birthday(a, year)
+    if a.kind == YAHRZEIT:
+        return _yahrzeit(a, year)
+    return _birthday(a, year)
+
+
+def _birthday(a: Anniversary, year: int) -> datetime.date:
+    if a.month in (_ADAR_II, _last_adar(a.year)):
+        return _fixed(year, _last_adar(year), a.day)
+    return _fixed(year, a.month, a.day)
+
+
+def _yahrzeit(a: Anniversary, year: int) -> datetime.date:
+    if a.month == _CHESHVAN and a.day == 30 and _month_length(a.year + 1, _CHESHVAN) == 29:
+        return _fixed(year, _KISLEV, 1) - timedelta(days=1)
+    if a.month == _KISLEV and a.day == 30 and _month_length(a.year + 1, _KISLEV) == 29:
+        return _fixed(year, _TEVES, 1) - timedelta(days=1)
+    if a.month == _ADAR_II:
+        return _fixed(year, _last_adar(year), a.day)
+    if a.month == _ADAR and a.day == 30 and not is_leap_year(year):
+        # 30 Adar I
+        return _fixed(year, _SHEVAT, 30)
+    return _fixed(year, a.month, a.day)
+
+
+class AnniversaryIndex:
+    """Every anniversary's dates in Hebrew *year* and the next, sorted."""
+
+    def __init__(self, anniversaries: Iterable[Anniversary], year: int) -> None:
+        self.year = year
+        entries = []
+        for anniversary in anniversaries:
+            for y in (year, year + 1):
+                day = anniversary_date(anniversary, y)
+                if day is not None:
+                    entries.append((day, anniversary))
+        entries.sort(key=lambda entry: entry[0])
+        self._days = [day for day, _ in entries]
+        self._entries = entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def next(self, day: datetime.date, count: int = 1) -> list[tuple[datetime.date, Anniversary]]:
+        """The first *count* anniversaries on or after *day*."""
+        i = bisect_left(self._days, day)
+        return self._entries[i:i + count]
+
+    def between(
+        self, first: datetime.date, last: datetime.date
+    ) -> list[tuple[datetime.date, Anniversary]]:
+        """The anniversaries from *first* through *last*."""
+        return self._entries[bisect_left(self._days, first):bisect_right(self._days, last)]
+
+
+def build_index(anniversaries: Iterable[Anniversary], day: datetime.date) -> AnniversaryIndex:
+    """The index covering the Hebrew year of *day* and the next one."""
+    return AnniversaryIndex(anniversaries, hebrew_date(day).year)
@@ -0,0 +1,245 @@
+# custom_components/molad_yiddish/molad_lib/yiddish.py
+"""
+Yiddish renderings: the molad announcement, the day label and the Hebrew
+date, each computed for an explicit (now, location, options).
+"""
+from __future__ import annotations
+
+import datetime
+from datetime import timedelta
+from functools import lru_cache
+from typing import Any
+
+from astral.sun import sun
+
+from .convert import hebrew_date, is_leap_year, pyluach_date
+from .helper import MoladDetails, MoladHelper, int_to_hebrew
+from .options import Options
+from .zmanim import Location
+
+DAY_MAPPING = {
+    "Sunday": "זונטאג",
+    "Monday": "מאנטאג",
+    "Tuesday": "דינסטאג",
+    "Wednesday": "מיטוואך",
+    "Thursday": "דאנערשטאג",
+    "Friday": "פרייטאג",
+    "Shabbos": "שבת",
+}
+
+MONTH_MAPPING = {
+    "Tishri": "תשרי", "Cheshvan": "חשון", "Kislev": "כסלו",
+    "Tevet": "טבת", "Shvat": "שבט", "Adar": "אדר",
+    "Adar I": "אדר א", "Adar II": "אדר ב", "Nissan": "ניסן",
+    "Iyar": "אייר", "Sivan": "סיון", "Tammuz": "תמוז",
+    "Av": "אב", "Elul": "אלול",
+}
+
+TIME_OF_DAY = {
+    "am": lambda h: "פארטאגס" if h < 6 else "צופרי",
+    "pm": lambda h: "נאכמיטאג" if h < 18 else "ביינאכט",
+}
+
+# Python weekday (Monday=0) → Yiddish day name
+_WEEKDAYS = ["מאנטאג", "דינסטאג", "מיטוואך", "דאנערשטאג", "פרייטאג", "שבת", "זונטאג"]
+
+_MOLAD_HELPER = MoladHelper(None)
+
+
+def hebrew_month_name(month: int, year: int) -> str:
+    """
+    Map Pyluach month-numbers to Hebrew month names, handling leap years.
+    """
+    if month == 12:
+        return "אדר א׳" if is_leap_year(year) else "אדר"
+    if month == 13:
+        return "אדר ב׳"
+    return {
+        1:  "ניסן", 2:  "אייר", 3:  "סיון", 4:  "תמוז",
+        5:  "אב",   6:  "אלול", 7:  "תשרי", 8:  "חשון",
+        9:  "כסלו", 10: "טבת",  11: "שבט",
+    }.get(month, "")
+
+
+def molad_details(day: datetime.date) -> MoladDetails:
+    """The molad shown on *day*: last month's until the 3rd of the month."""
+    base = day - timedelta(days=15) if hebrew_date(day).day < 3 else day
+    return _MOLAD_HELPER.get_molad(base)
+
+
+def molad_announcement(
+    now: datetime.datetime,
+    location: Location,
+    options: Options,
+) -> tuple[str, dict[str, Any]]:
+    """The Yiddish molad announcement and its attributes at *now*."""
+    tz = location.tz
+    now = now.astimezone(tz)
+    details = molad_details(now.date())
+
+    m = details.molad
+    h, mi = m.hours, m.minutes
+    # TIME_OF_DAY splits the day on the 24-hour clock
+    tod = TIME_OF_DAY[m.am_or_pm](h % 12 + (12 if m.am_or_pm == "pm" else 0))
+    chal = m.chalakim
+    chal_txt = "חלק" if chal == 1 else "חלקים"
+    hh12 = h % 12 or 12
+
+    # Determine if it's Motzaei Shabbos
+    motzei = False
+    if m.day == "Shabbos":
+        sd = sun(location.observer, date=now.date(), tzinfo=tz)
+        motzei_start = sd["sunset"] + timedelta(minutes=options.havdalah_offset)
+        next_mid = (now.replace(hour=0, minute=0) + timedelta(days=1)).replace(tzinfo=tz)
+        motzei = motzei_start <= now < next_mid
+
+    if motzei:
+        day_yd = 'מוצש"ק'
+        state = f"מולד {day_yd}, {mi} מינוט און {chal} {chal_txt} נאך {hh12}"
+    else:
+        day_yd = DAY_MAPPING.get(m.day, m.day)
+        state = f"מולד {day_yd} {tod}, {mi} מינוט און {chal} {chal_txt} נאך {hh12}"
+
+    # Rosh Chodesh attributes
+    rc = details.rosh_chodesh
+    rc_mid = [f"{gd.isoformat()}T00:00:00Z" for gd in rc.gdays]
+    rc_night = [nf.isoformat() for nf in _nightfalls(rc.gdays, location, options)]
+
+    rc_days = [DAY_MAPPING.get(d, d) for d in rc.days]
+    rc_text = rc_days[0] if len(rc_days) == 1 else " & ".join(rc_days)
+
+    return state, {
+        "day": day_yd,
+        "hours": h,
+        "minutes": mi,
+        "time_of_day": tod,
+        "chalakim": chal,
+        "friendly": state,
+        "rosh_chodesh_midnight": rc_mid,
+        "rosh_chodesh_nightfall": rc_night,
+        "rosh_chodesh": rc_text,
+        "rosh_chodesh_days": rc_days,
+        "is_shabbos_mevorchim": details.is_shabbos_mevorchim,
+        "is_upcoming_shabbos_mevorchim": details.is_upcoming_shabbos_mevorchim,
+        "month_name": MONTH_MAPPING.get(rc.month, rc.month),
+    }
+
+
+def _nightfalls(
+    gdays: tuple[datetime.date, ...],
+    location: Location,
+    options: Options,
+) -> list[datetime.datetime]:
+    tz = location.tz
+    return [
+        sun(location.observer, date=gd - timedelta(days=1), tzinfo=tz)["sunset"]
+        + timedelta(minutes=options.havdalah_offset)
+        for gd in gdays
+    ]
+
+
+def rosh_chodesh_nightfalls(
+    now: datetime.datetime,
+    location: Location,
+    options: Options,
+) -> list[datetime.datetime]:
+    """When each day of the Rosh Chodesh announced at *now* begins (nightfall before it)."""
+    details = molad_details(now.astimezone(location.tz).date())
+    return _nightfalls(details.rosh_chodesh.gdays, location, options)
+
+
+def rosh_chodesh_label(
+    now: datetime.datetime,
+    nightfalls: list[datetime.datetime],
+    month: str,
+) -> str:
+    """The Rosh Chodesh label while *now* is in one of its *nightfalls* days."""
+    active_index: int | None = None
+    for i, start in enumerate(nightfalls):
+        end = nightfalls[i + 1] if i + 1 < len(nightfalls) else start + timedelta(days=1)
+        if start <= now < end:
+            active_index = i
+            break
+
+    if active_index is None:
+        return "Not Rosh Chodesh Today"
+    if len(nightfalls) == 1:
+        return f"ראש חודש {month}"
+    prefix = ("א", "ב")[active_index] + "׳"
+    return f"{prefix} ד׳ראש חודש {month}"
+
+
+def day_label(
+    now: datetime.datetime,
+    location: Location,
+    options: Options,
+) -> str:
+    """שבת קודש / יום טוב / ערש"ק / מוצש"ק, else the Yiddish weekday."""
+    tz = location.tz
+    current = now.astimezone(tz)
+    s = sun(location.observer, date=current.date(), tzinfo=tz)
+    candle = s["sunset"] - timedelta(minutes=options.candle_offset)
+    havdalah = s["sunset"] + timedelta(minutes=options.havdalah_offset)
+
+    # Hebrew date
+    hdate = pyluach_date(current.date())
+    if current >= s["sunset"]:
+        hdate = pyluach_date(current.date() + timedelta(days=1))
+
+    # Holiday
+    is_tov = bool(hdate.festival(israel=not options.diaspora, include_working_days=False))
+
+    # Shabbos
+    wd = current.weekday()
+    is_shab = (wd == 4 and current >= candle) or (wd == 5 and current < havdalah)
+
+    if is_shab:
+        return "שבת קודש"
+    if is_tov:
+        return "יום טוב"
+    if wd == 4 and current.hour >= 12:
+        return 'ערש"ק'
+    if wd == 5 and current >= havdalah:
+        return 'מוצש"ק'
+    return _WEEKDAYS[wd]
+
+
+def yiddish_date(
+    now: datetime.datetime,
+    location: Location,
+    options: Options,
+) -> str:
+    """Today's Hebrew date in Yiddish formatting, flipping at sunset + havdalah offset."""
+    tz = location.tz
+    now = now.astimezone(tz)
+    s = sun(location.observer, date=now.date(), tzinfo=tz)
+    switch_time = s["sunset"] + timedelta(minutes=options.havdalah_offset)
+
+    py_date = now.date() + timedelta(days=1) if now >= switch_time else now.date()
+    return hebrew_date_text(py_date)
+
+
+@lru_cache(maxsize=1024)
+def hebrew_date_text(day: datetime.date) -> str:
+    """The Hebrew date of *day* in Yiddish formatting, e.g. כ"ה תשרי תשפ"ו."""
+    heb = hebrew_date(day)
+    day_heb = int_to_hebrew(heb.day)
+    month_heb = hebrew_month_name(heb.month, heb.year)
+    year_heb = int_to_hebrew(heb.year % 1000)
+
+    state = f"{day_heb} {month_heb} {year_heb}"
+    return state.replace("\u05F4", '"').replace("\u05F3", "'")
+
+
+def in_mevorchim_window(
+    now: datetime.datetime,
+    location: Location,
+    options: Options,
+) -> bool:
+    """Between sunset + candle offset and sunset + havdalah offset (ShabbosMevorchimSensor)."""
+    tz = location.tz
+    now = now.astimezone(tz)
+    s = sun(location.observer, date=now.date(), tzinfo=tz)
+    on_time = s["sunset"] + timedelta(minutes=options.candle_offset)
+    off_time = s["sunset"] + timedelta(minutes=options.havdalah_offset)
+    return on_time <= now < off_time
@@ -0,0 +1,122 @@
+# custom_components/molad_yiddish/molad_lib/zmanim.py
+"""
+Daily zmanim computed in one batch per day.
+
+Sha'os zmaniyos follow the GRA (netz → shkia) and, for sof zman krias
+shema, the Magen Avraham (72 minutes before netz → 72 minutes after shkia).
+Alos is astral dawn, as used by the Erev and fast-day sensors; tzeis and
+candle-lighting follow the configured havdalah / candle-lighting offsets.
+"""
+from __future__ import annotations
+
+import datetime
+from datetime import timedelta
+from functools import lru_cache
+from typing import NamedTuple
+from zoneinfo import ZoneInfo
+
+from astral import Observer
+from astral.sun import sun
+
+_MGA_MINUTES = 72
+
+# Every zman exposed as a sensor, in the order of the day
+ZMANIM = (
+    "alos",
+    "netz",
+    "sof_zman_shema_mga",
+    "sof_zman_shema_gra",
+    "sof_zman_tefillah",
+    "chatzos",
+    "mincha_gedola",
+    "mincha_ketana",
+    "plag_hamincha",
+    "shkia",
+    "tzeis",
+)
+
+
+class Location(NamedTuple):
+    """Where zmanim are computed; hashable so results can be memoized."""
+
+    latitude: float
+    longitude: float
+    time_zone: str
+
+    @property
+    def tz(self) -> ZoneInfo:
+        return ZoneInfo(self.time_zone)
+
+    @property
+    def observer(self) -> Observer:
+        return Observer(latitude=self.latitude, longitude=self.longitude)
+
+
+class Zmanim:
+    """All zmanim of one Gregorian day as timezone-aware datetimes."""
+
+    __slots__ = ("day",) + ZMANIM + ("candle_lighting",)
+
+    def __init__(self, day: datetime.date, **times: datetime.datetime) -> None:
+        self.day = day
+        for name in ZMANIM + ("candle_lighting",):
+            setattr(self, name, times[name])
+
+    def as_dict(self) -> dict[str, str]:
+        """ISO strings keyed by zman name (for service responses)."""
+        return {name: getattr(self, name).isoformat() for name in ZMANIM + ("candle_lighting",)}
+
+
+def compute_zmanim(
+    day: datetime.date,
+    location: Location,
+    candle_offset: int,
+    havdalah_offset: int,
+) -> Zmanim:
+    """Compute every zman of *day* with a single astral call."""
+    s = sun(location.observer, date=day, tzinfo=location.tz)
+    netz, shkia = s["sunrise"], s["sunset"]
+    hour_gra = (shkia - netz) / 12
+    mga_start = netz - timedelta(minutes=_MGA_MINUTES)
+    hour_mga = (shkia + timedelta(minutes=_MGA_MINUTES) - mga_start) / 12
+
+    return Zmanim(
+        day,
+        alos=s["dawn"],
+        netz=netz,
+        sof_zman_shema_mga=mga_start + 3 * hour_mga,
+        sof_zman_shema_gra=netz + 3 * hour_gra,
+        sof_zman_tefillah=netz + 4 * hour_gra,
+        chatzos=netz + 6 * hour_gra,
+        mincha_gedola=netz + 6.5 * hour_gra,
+        mincha_ketana=netz + 9.5 * hour_gra,
+        plag_hamincha=netz + 10.75 * hour_gra,
+        shkia=shkia,
+        tzeis=shkia + timedelta(minutes=havdalah_offset),
+        candle_lighting=shkia - timedelta(minutes=candle_offset),
+    )
+
+
+@lru_cache(maxsize=64)
+def zmanim_for_day(
+    day: datetime.date,
+    location: Location,
+    candle_offset: int,
+    havdalah_offset: int,
+) -> Zmanim:
+    """Memoized compute_zmanim; each day is computed once per location/offsets."""
+    return compute_zmanim(day, location, candle_offset, havdalah_offset)
+
+
+def zmanim_for_days(
+    start: datetime.date,
+    days: int,
+    location: Location,
+    candle_offset: int,
+    havdalah_offset: int,
+) -> list[Zmanim]:
+    """Zmanim of *days* consecutive days starting at *start* (e.g. the week ahead)."""
+    return [
+        zmanim_for_day(start + timedelta(days=i), location, candle_offset, havdalah_offset)
+        for i in range(days)
+    ]
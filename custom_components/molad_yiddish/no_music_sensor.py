@@ -6,19 +6,23 @@ Binary sensor for "נישט הערן מוזיק":
 - Activates at candle-lighting time, and deactivates at havdalah.
 """
 
-from datetime import timedelta
-from zoneinfo import ZoneInfo
 from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.const import STATE_ON
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.event import async_track_time_interval
-from pyluach.hebrewcal import HebrewDate
+from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.util import dt as dt_util
 
-class NoMusicSensor(BinarySensorEntity):
+from .molad_lib.holidays import is_no_music
+from .molad_lib.profiles import Profile
+from .refresh import async_track_refresh
+
+class NoMusicSensor(RestoreEntity, BinarySensorEntity):
     _attr_name = "Molad Yiddish No Music"
     _attr_unique_id = "molad_yiddish_no_music"
     _attr_icon = "mdi:music-off"
+    _attr_should_poll = False
 
-    def __init__(self, hass: HomeAssistant, candle: int, havdalah: int) -> None:
+    def __init__(self, hass: HomeAssistant, candle: int, havdalah: int, profile: Profile) -> None:
         super().__init__()
         self.hass = hass
         self._attr_is_on = False
@@ -26,39 +30,20 @@ class NoMusicSensor(BinarySensorEntity):
         self._candle = candle
         self._havdalah = havdalah
 
-        # Regular hourly updates
-        async_track_time_interval(hass, self.async_update, timedelta(hours=1))
+        # Regular updates at the profile's hourly interval
+        self._refresh_interval = profile.hourly_interval
 
     async def async_added_to_hass(self) -> None:
+        # Restore the last state; the first computation runs once HA has started
+        await super().async_added_to_hass()
+        self.async_on_remove(async_track_refresh(self.hass, self, self._refresh_interval))
+        last = await self.async_get_last_state()
+        if last:
+            self._attr_is_on = last.state == STATE_ON
         self._added = True
-        await self.async_update()
 
     async def async_update(self, now=None) -> None:
-        from datetime import datetime
-
-        tz = ZoneInfo(self.hass.config.time_zone)
-        now = now or datetime.now(tz)
-        today = now.date()
-        hd = HebrewDate.from_pydate(today)
-
-        # Count Omer (Nisan 16 - Sivan 5), except Lag B'Omer
-        omer = 0
-        if hd.month == 1 and hd.day >= 16:
-            omer = hd.day - 15
-        elif hd.month == 2:
-            omer = 15 + hd.day
-        elif hd.month == 3 and hd.day <= 5:
-            omer = 45 + hd.day
-
-        in_omer = omer and omer != 33
-
-        # Three Weeks: 17 Tammuz (4) – 9 Av (5)
-        in_three_weeks = (
-            (hd.month == 4 and hd.day >= 17) or
-            (hd.month == 5 and hd.day <= 9)
-        )
-
-        self._attr_is_on = in_omer or in_three_weeks
+        self._attr_is_on = is_no_music(dt_util.now().date())
 
         if self._added:
             self.async_write_ha_state()
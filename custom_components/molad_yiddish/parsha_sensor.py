@@ -1,26 +1,34 @@
 # custom_components/molad_yiddish/parsha_sensor.py
 from __future__ import annotations
-from datetime import date, timedelta
+from datetime import date
 
 from homeassistant.components.sensor import SensorEntity
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
 from homeassistant.helpers.event import async_track_time_change
-from pyluach import dates, parshios
+from homeassistant.helpers.restore_state import RestoreEntity
 
-class ParshaYiddishSensor(SensorEntity):
+from .model import PARSHA, EntryModel
+from .molad_lib.weekly import parsha_name
+
+class ParshaYiddishSensor(RestoreEntity, SensorEntity):
     """Offline Parsha sensor using pyluach for weekly readings."""
 
     _attr_name = "Molad Yiddish Parsha"
     _attr_icon = "mdi:book-open-page-variant"
     _attr_unique_id = "molad_yiddish_parsha"
 
-    def __init__(self, hass) -> None:
+    def __init__(self, hass, model: EntryModel) -> None:
         super().__init__()
         self.hass = hass
+        self._model = model
         self._state: str | None = None
 
     async def async_added_to_hass(self) -> None:
-        # Initial update
-        await self._update_state()
+        # Restore the last state; the first computation runs once HA has started
+        await super().async_added_to_hass()
+        last = await self.async_get_last_state()
+        if last and last.state not in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+            self._state = last.state
 
         # Schedule daily update at 12:00:05 AM
         async_track_time_change(
@@ -39,21 +47,7 @@ class ParshaYiddishSensor(SensorEntity):
         return self._state or "none"
 
     async def _update_state(self) -> None:
-        # Calculate the upcoming Shabbat (Saturday)
-        today = date.today()
-        offset = (5 - today.weekday()) % 7
-        shabbat = today + timedelta(days=offset)
-
-        # Get Parsha from pyluach
-        greg = dates.GregorianDate(shabbat.year, shabbat.month, shabbat.day)
-        parsha_indices = parshios.getparsha(greg)
-
-        if parsha_indices:
-            heb = parshios.getparsha_string(greg, hebrew=True)
-            combined = heb.replace(", ", "-")
-            self._state = f"פרשת {combined}"
-        else:
-            self._state = "none"
-
+        # Parsha of the upcoming Shabbat (Saturday)
+        self._state = parsha_name(date.today())
+        self._model.async_set(PARSHA, self._state)
         self.async_write_ha_state()
-        
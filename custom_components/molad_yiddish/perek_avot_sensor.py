@@ -1,40 +1,41 @@
 from __future__ import annotations
-from datetime import date, timedelta
+from datetime import date
 
 from homeassistant.components.sensor import SensorEntity
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.event import (
-    async_track_time_interval,
-    async_track_time_change,
-)
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.restore_state import RestoreEntity
 
-import pyluach.dates as pdates
-from .molad_lib.helper import int_to_hebrew
+from .molad_lib.weekly import NO_PEREK, perek_avot
+from .molad_lib.profiles import Profile
+from .refresh import async_track_refresh
 
 
-class PerekAvotSensor(SensorEntity):
+class PerekAvotSensor(RestoreEntity, SensorEntity):
     """Which פרק of Pirkei Avot is read each week (from Pesach until Sukkot)."""
 
     _attr_name = "Perek Avos"
     _attr_unique_id = "molad_yiddish_perek_avot"
     _attr_icon = "mdi:book-open-page-variant"
+    _attr_should_poll = False
 
-    def __init__(self, hass: HomeAssistant) -> None:
+    def __init__(self, hass: HomeAssistant, profile: Profile) -> None:
         self.hass = hass
-        self._attr_native_value = "נישט אין די צייט פון פרקי אבות"
+        self._profile = profile
+        self._attr_native_value = NO_PEREK
 
     async def async_added_to_hass(self) -> None:
-        # 1) Do an immediate population
-        await self._update_state()
+        # 1) Restore the last state; the first computation runs once HA has started
+        await super().async_added_to_hass()
+        last = await self.async_get_last_state()
+        if last and last.state not in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+            self._attr_native_value = last.state
 
         # 2) Define a coroutine listener for midnight updates
         async def _midnight_update(now):
             await self._update_state()
 
-        # 3) Define a coroutine listener for periodic backups
-        async def _periodic_update(now):
-            await self._update_state()
-
         # 4) Schedule the midnight update at 00:00:05 every day
         async_track_time_change(
             self.hass,
@@ -44,38 +45,18 @@ class PerekAvotSensor(SensorEntity):
             second=5,
         )
 
-        # 5) Schedule the periodic update every hour
-        async_track_time_interval(
-            self.hass,
-            _periodic_update,
-            timedelta(hours=1),
+        # 5) Schedule the periodic backup update at the profile's hourly interval
+        self.async_on_remove(
+            async_track_refresh(
+                self.hass,
+                self,
+                self._profile.hourly_interval,
+                lambda now: self._update_state(),
+            )
         )
 
     async def _update_state(self) -> None:
         """Compute which Pirkei Avot chapter should be the sensor state today."""
-        today_py = date.today()
-        today_hd = pdates.HebrewDate.from_pydate(today_py)
-
-        # 1) Pesach – 15 ניסן of this Hebrew year
-        pesach_hd = pdates.HebrewDate(today_hd.year, 1, 15)
-        pesach_py = pesach_hd.to_pydate()
-
-        # 2) First Shabbos after Pesach
-        offset = (5 - pesach_py.weekday()) % 7 or 7
-        first_shabbat = pesach_py + timedelta(days=offset)
-
-        # 3) Sukkos – 15 תשרי of next Hebrew year
-        sukkot_hd = pdates.HebrewDate(today_hd.year + 1, 7, 15)
-        sukkot_py = sukkot_hd.to_pydate()
-
-        # 4) If today is between those two, cycle chapters 1–6
-        if first_shabbat <= today_py <= sukkot_py:
-            weeks_since = ((today_py - first_shabbat).days // 7) + 1
-            chap = ((weeks_since - 1) % 6) + 1
-            state = f"פרק {int_to_hebrew(chap)}"
-        else:
-            state = "נישט אין די צייט פון פרקי אבות"
-
-        self._attr_native_value = state
+        self._attr_native_value = perek_avot(date.today())
         # Write the updated state back to HA
         self.async_write_ha_state()
@@ -0,0 +1,249 @@
+# custom_components/molad_yiddish/refresh.py
+"""
+Refresh helpers shared by the sensors.
+
+Interval refreshes honour the performance profile's intervals.  Polling is
+off, so the refresh timer writes the state itself (and HA skips the write
+when nothing changed).
+
+Entities refreshing at the same interval share one timer (_RefreshGroup):
+it computes them one after the other, yielding to the event loop between
+them, and hands their writes to the batched writer (_StateWriter), which
+writes at most _WRITES_PER_ITERATION states per loop iteration.  Composite
+entities following the entry model write through it too, so a holiday
+sensor publishing new flags does not write every binary sensor in the same
+iteration.  `python -m molad_lib.benchmark --loop-stall` measures the
+longest loop stall of a minute tick with and without this.
+
+The first computation of every entity is deferred until Home Assistant has
+started and run as one batch; until then entities show their restored state.
+
+Live option changes (offsets, nikud) go the same way: every holder takes
+the new Options and drops what it cached under the old ones, then only the
+entities whose inputs changed are recomputed, again in one batch.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+import datetime
+from datetime import timedelta
+from itertools import islice
+import logging
+
+from homeassistant.components.sensor import ATTR_OPTIONS, ATTR_STATE_CLASS
+from homeassistant.const import (
+    ATTR_ASSUMED_STATE,
+    ATTR_ATTRIBUTION,
+    ATTR_DEVICE_CLASS,
+    ATTR_ENTITY_PICTURE,
+    ATTR_FRIENDLY_NAME,
+    ATTR_ICON,
+    ATTR_SUPPORTED_FEATURES,
+    ATTR_UNIT_OF_MEASUREMENT,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, State, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.start import async_at_started
+
+from .const import DATA_REFRESH, SIGNAL_OPTIONS_UPDATED
+from .molad_lib.options import Options
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# State writes made per event-loop iteration by the batched writer
+_WRITES_PER_ITERATION = 8
+
+# Attributes HA derives from the entity itself rather than its extra state
+_STANDARD_ATTRIBUTES = frozenset({
+    ATTR_ASSUMED_STATE,
+    ATTR_ATTRIBUTION,
+    ATTR_DEVICE_CLASS,
+    ATTR_ENTITY_PICTURE,
+    ATTR_FRIENDLY_NAME,
+    ATTR_ICON,
+    ATTR_OPTIONS,
+    ATTR_STATE_CLASS,
+    ATTR_SUPPORTED_FEATURES,
+    ATTR_UNIT_OF_MEASUREMENT,
+})
+
+
+class _StateWriter:
+    """Writes queued entity states, at most _WRITES_PER_ITERATION per iteration."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        # insertion-ordered set; an entity queued twice is written once
+        self._pending: dict[Entity, None] = {}
+        self._task: asyncio.Task | None = None
+
+    @callback
+    def async_schedule(self, entity: Entity) -> None:
+        self._pending[entity] = None
+        if self._task is None:
+            self._task = self.hass.async_create_task(self._async_drain())
+
+    async def _async_drain(self) -> None:
+        try:
+            while self._pending:
+                for entity in list(islice(self._pending, _WRITES_PER_ITERATION)):
+                    del self._pending[entity]
+                    if entity.hass is not None and entity.platform is not None:
+                        entity.async_write_ha_state()
+                await asyncio.sleep(0)
+        finally:
+            self._task = None
+
+
+class _RefreshGroup:
+    """One timer refreshing every entity of one interval."""
+
+    def __init__(self, hass: HomeAssistant, interval: timedelta, writer: _StateWriter) -> None:
+        self.hass = hass
+        self.interval = interval
+        self._writer = writer
+        self._members: dict[Entity, Callable[[datetime.datetime], Awaitable[None]]] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_add(
+        self, entity: Entity, update: Callable[[datetime.datetime], Awaitable[None]]
+    ) -> CALLBACK_TYPE:
+        self._members[entity] = update
+        if self._unsub is None:
+            self._unsub = async_track_time_interval(self.hass, self._async_refresh, self.interval)
+
+        @callback
+        def _remove() -> None:
+            self._members.pop(entity, None)
+            if not self._members and self._unsub is not None:
+                self._unsub()
+                self._unsub = None
+
+        return _remove
+
+    async def _async_refresh(self, now: datetime.datetime) -> None:
+        for entity, update in list(self._members.items()):
+            try:
+                await update(now)
+            except Exception:  # keep the rest of the group going
+                _LOGGER.exception("Refresh of %s failed", entity.entity_id)
+                continue
+            self._writer.async_schedule(entity)
+            # one entity's work per loop iteration
+            await asyncio.sleep(0)
+
+
+def _writer(hass: HomeAssistant) -> _StateWriter:
+    data = hass.data.setdefault(DATA_REFRESH, {})
+    if "writer" not in data:
+        data["writer"] = _StateWriter(hass)
+    return data["writer"]
+
+
+@callback
+def async_write_batched(entity: Entity) -> None:
+    """Queue a write of *entity*'s state with the batched writer."""
+    _writer(entity.hass).async_schedule(entity)
+
+
+@callback
+def async_track_refresh(
+    hass: HomeAssistant,
+    entity: Entity,
+    interval: timedelta,
+    update: Callable[[datetime.datetime], Awaitable[None]] | None = None,
+) -> CALLBACK_TYPE:
+    """Run *update* (default: entity.async_update) every *interval*.
+
+    Call it once the entity is added and pass the result to async_on_remove:
+    the entity leaves its interval's group (and the last one out stops the
+    timer) when it is removed.
+    """
+    groups = hass.data.setdefault(DATA_REFRESH, {}).setdefault("groups", {})
+    if interval not in groups:
+        groups[interval] = _RefreshGroup(hass, interval, _writer(hass))
+    return groups[interval].async_add(entity, update or entity.async_update)
+
+
+def restored_attributes(state: State) -> dict:
+    """The extra state attributes of a restored *state*.
+
+    Drops the standard attributes HA adds to every state, so a restored
+    friendly_name or icon does not shadow the entity's own.
+    """
+    return {
+        key: value for key, value in state.attributes.items()
+        if key not in _STANDARD_ATTRIBUTES
+    }
+
+
+@callback
+def async_refresh_when_started(
+    hass: HomeAssistant,
+    entities: Iterable[Entity],
+    starters: Iterable[Callable[[], Awaitable[None] | None]] = (),
+) -> CALLBACK_TYPE:
+    """Run *starters*, then compute every entity once, after HA has started.
+
+    Starters are coroutine functions or callbacks (e.g. the shared zmanim /
+    transition / fast managers, which push their own sensors).
+
+    Entities refreshing through their own ``_update_state`` coroutine write
+    their state themselves; the others go through async_update_ha_state.
+    """
+    entities = list(entities)
+    starters = list(starters)
+
+    async def _refresh(_hass: HomeAssistant) -> None:
+        for start in starters:
+            result = start()
+            if result is not None:
+                await result
+        await _async_update_entities(entities)
+
+    return async_at_started(hass, _refresh)
+
+
+@callback
+def async_refresh_on_options(
+    hass: HomeAssistant, entry_id: str, holders: Iterable[object]
+) -> CALLBACK_TYPE:
+    """Apply live option changes of the entry to *holders*, then recompute once.
+
+    Holders (entities and the managers owning shared timers) that depend on
+    the options implement ``async_apply_options(options)``, returning whether
+    their inputs changed; the others are skipped.  A manager re-arms and
+    pushes its own sensors there; the changed entities are recomputed
+    afterwards in one batch.
+    """
+    holders = [holder for holder in holders if hasattr(holder, "async_apply_options")]
+
+    async def _apply(options: Options) -> None:
+        changed = []
+        for holder in holders:
+            if await holder.async_apply_options(options) and isinstance(holder, Entity):
+                changed.append(holder)
+        await _async_update_entities(changed)
+
+    return async_dispatcher_connect(hass, f"{SIGNAL_OPTIONS_UPDATED}_{entry_id}", _apply)
+
+
+async def _async_update_entities(entities: Iterable[Entity]) -> None:
+    """Compute and write each entity; a failing one does not stop the rest."""
+    for entity in entities:
+        if entity.platform is None:
+            # removed before Home Assistant finished starting
+            continue
+        try:
+            update = getattr(entity, "_update_state", None)
+            if update is not None:
+                await update()
+            else:
+                await entity.async_update_ha_state(True)
+        except Exception:  # keep the rest of the batch going
+            _LOGGER.exception("Update of %s failed", entity.entity_id)
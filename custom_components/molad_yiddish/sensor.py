@@ -2,30 +2,38 @@
 from __future__ import annotations
 import logging
 from datetime import date, datetime, timedelta
-from zoneinfo import ZoneInfo
-
-from astral import LocationInfo
-from astral.sun import sun
 
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import STATE_ON, STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.event import (
-    async_track_time_interval,
-    async_track_state_change_event,
     async_track_sunset,
     async_track_time_change,
 )
+from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.util import dt as dt_util
 
-from hdate.converters import gdate_to_jdn
-from hdate.hebrew_date import HebrewDate as HHebrewDate
-
-import pyluach.dates as pdates
-from pyluach.hebrewcal import HebrewDate as PHebrewDate
-
-from .molad_lib.helper import MoladHelper, MoladDetails
+from .molad_lib.helper import MoladHelper
+from .molad_lib.options import Options
+from .molad_lib.profiles import Profile, get_profile
 from .molad_lib.sfirah_helper import SfirahHelper
+from .molad_lib.yiddish import (
+    day_label,
+    in_mevorchim_window,
+    molad_announcement,
+    rosh_chodesh_label,
+    rosh_chodesh_nightfalls,
+)
+from .model import (
+    DAY_LABEL,
+    MOLAD,
+    ROSH_CHODESH_TODAY,
+    EntryModel,
+    MoladState,
+    get_model,
+)
 from .sfirah_sensor import SefirahCounterYiddish, SefirahCounterMiddosYiddish
 from .special_shabbos_sensor import SpecialShabbosSensor
 from .parsha_sensor import ParshaYiddishSensor
@@ -34,37 +42,28 @@ from .perek_avot_sensor import PerekAvotSensor
 from .holiday_sensor import HolidaySensor
 from .no_music_sensor import NoMusicSensor
 from .full_yiddish_display_sensor import FullYiddishDisplaySensor
+from .zmanim_sensor import ZMAN_SENSORS, DailyZmanim, ZmanSensor, location_from_hass
+from .transition_sensor import TRANSITION_SENSORS, NextTransitionSensor, UpcomingTransitions
+from .fast_sensor import FAST_SENSORS, FastTimeSensor, UpcomingFast
+from .liturgy_sensor import LITURGY_SENSORS, DailyLiturgy, LiturgySensor
+from .yahrzeit_sensor import UpcomingYahrzeitsSensor
+from .learning_sensor import LEARNING_SENSORS, LearningSensor
+from .day_mode_sensor import DayModeSensor
+from .transition_events import TransitionEvents
+from .refresh import (
+    async_refresh_on_options,
+    async_refresh_when_started,
+    async_track_refresh,
+    async_write_batched,
+    restored_attributes,
+)
 
 
-from .const import DOMAIN
+from .const import CONF_PERFORMANCE_PROFILE, DATA_YAHRZEITS, DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
 
-DAY_MAPPING = {
-    "Sunday": "זונטאג",
-    "Monday": "מאנטאג",
-    "Tuesday": "דינסטאג",
-    "Wednesday": "מיטוואך",
-    "Thursday": "דאנערשטאג",
-    "Friday": "פרייטאג",
-    "Shabbos": "שבת",
-}
-
-MONTH_MAPPING = {
-    "Tishri": "תשרי", "Cheshvan": "חשון", "Kislev": "כסלו",
-    "Tevet": "טבת", "Shvat": "שבט", "Adar": "אדר",
-    "Adar I": "אדר א", "Adar II": "אדר ב", "Nissan": "ניסן",
-    "Iyar": "אייר", "Sivan": "סיון", "Tammuz": "תמוז",
-    "Av": "אב", "Elul": "אלול",
-}
-
-TIME_OF_DAY = {
-    "am": lambda h: "פארטאגס" if h < 6 else "צופרי",
-    "pm": lambda h: "נאכמיטאג" if h < 18 else "ביינאכט",
-}
-
-
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -78,33 +77,96 @@ async def async_setup_entry(
     opts = hass.data[DOMAIN][entry.entry_id]
     candle_offset = opts.get("candlelighting_offset", 15)
     havdalah_offset = opts.get("havdalah_offset", 72)
+    profile = get_profile(opts.get(CONF_PERFORMANCE_PROFILE))
+
+    # Typed results shared by the source and composite entities
+    model = get_model(hass, entry.entry_id)
 
     # Prepare helpers
-    sfirah_helper = SfirahHelper(hass, havdalah_offset)
+    sfirah_helper = SfirahHelper(location_from_hass(hass), havdalah_offset)
     strip_nikud = entry.options.get("strip_nikud", False)
 
-    async_add_entities([
-        MoladYiddishSensor(hass, molad_helper, candle_offset, havdalah_offset),
-        YiddishDayLabelSensor(hass, candle_offset, havdalah_offset),
-        ShabbosMevorchimSensor(hass, molad_helper, candle_offset, havdalah_offset),
-        UpcomingShabbosMevorchimSensor(hass, molad_helper),
-        SpecialShabbosSensor(),
+    # All zmanim are computed in one batch per day and pushed to their sensors
+    daily_zmanim = DailyZmanim(hass, candle_offset, havdalah_offset)
+    entry.async_on_unload(daily_zmanim.async_start())
+
+    # Next candle-lighting / havdalah / Erev / Yom Tov, driven by one timer
+    transitions = UpcomingTransitions(hass, candle_offset, havdalah_offset)
+    entry.async_on_unload(transitions.async_stop)
+
+    # Start / end of the current or next fast, advanced when the fast ends
+    upcoming_fast = UpcomingFast(hass, candle_offset, havdalah_offset)
+    entry.async_on_unload(upcoming_fast.async_stop)
+
+    # Tachanun / Hallel / Yaaleh Veyavo / ..., advanced at the sunset they change
+    daily_liturgy = DailyLiturgy(hass, candle_offset, havdalah_offset)
+    entry.async_on_unload(daily_liturgy.async_stop)
+
+    # molad_yiddish_transition bus events, fired by one timer
+    transition_events = TransitionEvents(hass, candle_offset, havdalah_offset)
+    entry.async_on_unload(transition_events.async_stop)
+
+    entities = [
+        MoladYiddishSensor(hass, molad_helper, candle_offset, havdalah_offset, profile, model),
+        YiddishDayLabelSensor(hass, candle_offset, havdalah_offset, profile, model),
+        ShabbosMevorchimSensor(hass, molad_helper, candle_offset, havdalah_offset, profile),
+        UpcomingShabbosMevorchimSensor(hass, molad_helper, profile),
+        SpecialShabbosSensor(model),
         SefirahCounterYiddish(hass, sfirah_helper, strip_nikud, havdalah_offset),
         SefirahCounterMiddosYiddish(hass, sfirah_helper, strip_nikud, havdalah_offset),
-        RoshChodeshTodaySensor(hass, molad_helper, havdalah_offset),
-        ParshaYiddishSensor(hass),
+        RoshChodeshTodaySensor(hass, molad_helper, havdalah_offset, profile, model),
+        ParshaYiddishSensor(hass, model),
         YiddishDateSensor(hass, havdalah_offset),
-        PerekAvotSensor(hass),
-        HolidaySensor(hass, candle_offset, havdalah_offset),
-        NoMusicSensor(hass, candle_offset, havdalah_offset),
-        FullYiddishDisplaySensor(hass),
-    ], update_before_add=True)
+        PerekAvotSensor(hass, profile),
+        HolidaySensor(hass, candle_offset, havdalah_offset, profile, model),
+        NoMusicSensor(hass, candle_offset, havdalah_offset, profile),
+        FullYiddishDisplaySensor(hass, profile, model),
+        *(ZmanSensor(daily_zmanim, key) for key in ZMAN_SENSORS),
+        *(NextTransitionSensor(transitions, kind) for kind in TRANSITION_SENSORS),
+        *(FastTimeSensor(upcoming_fast, key) for key in FAST_SENSORS),
+        *(LiturgySensor(daily_liturgy, key) for key in LITURGY_SENSORS),
+        UpcomingYahrzeitsSensor(hass.data[DATA_YAHRZEITS]),
+        *(LearningSensor(cycle) for cycle in LEARNING_SENSORS),
+        DayModeSensor(hass, candle_offset, havdalah_offset),
+    ]
+    # Entities come up from their restored state; the first real computation
+    # runs in one batch once Home Assistant has started
+    async_add_entities(entities)
+    entry.async_on_unload(
+        async_refresh_when_started(
+            hass,
+            entities,
+            (
+                daily_zmanim.async_refresh,
+                transitions.async_start,
+                upcoming_fast.async_start,
+                daily_liturgy.async_start,
+                transition_events.async_start,
+            ),
+        )
+    )
+    # Offset and nikud changes are applied to the same entities (see refresh.py)
+    entry.async_on_unload(
+        async_refresh_on_options(
+            hass,
+            entry.entry_id,
+            (
+                daily_zmanim,
+                transitions,
+                upcoming_fast,
+                daily_liturgy,
+                transition_events,
+                *entities,
+            ),
+        )
+    )
 
 
-class MoladYiddishSensor(SensorEntity):
+class MoladYiddishSensor(RestoreEntity, SensorEntity):
     _attr_name = "Molad Yiddish"
     _attr_unique_id = "molad_yiddish"
     _attr_entity_id = "sensor.molad_yiddish"
+    _attr_should_poll = False
 
     def __init__(
         self,
@@ -112,88 +174,45 @@ class MoladYiddishSensor(SensorEntity):
         helper: MoladHelper,
         candle_offset: int,
         havdalah_offset: int,
+        profile: Profile,
+        model: EntryModel,
     ) -> None:
         super().__init__()
         self.hass = hass
         self.helper = helper
-        self._candle_offset = candle_offset
-        self._havdalah_offset = havdalah_offset
+        self._model = model
+        self._options = Options(candle_offset, havdalah_offset)
+        self._location = location_from_hass(hass)
         self._attr_native_value = None
         self._attr_extra_state_attributes: dict[str, any] = {}
-        async_track_time_interval(hass, self.async_update, timedelta(hours=1))
+        self._refresh_interval = profile.hourly_interval
 
-    async def async_update(self, now=None) -> None:
-        today = date.today()
-        jdn = gdate_to_jdn(today)
-        heb = HHebrewDate.from_jdn(jdn)
-        base_date = today - timedelta(days=15) if heb.day < 3 else today
+    async def async_added_to_hass(self) -> None:
+        # Restore last state/attributes until the first computation
+        await super().async_added_to_hass()
+        self.async_on_remove(async_track_refresh(self.hass, self, self._refresh_interval))
+        last = await self.async_get_last_state()
+        if last and last.state not in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+            self._attr_native_value = last.state
+            self._attr_extra_state_attributes = restored_attributes(last)
+
+    async def async_apply_options(self, options: Options) -> bool:
+        old, self._options = self._options, self._options.with_offsets(options)
+        return self._options != old
 
+    async def async_update(self, now=None) -> None:
+        now = now or dt_util.now()
         try:
-            details: MoladDetails = self.helper.get_molad(base_date)
+            state, attrs = molad_announcement(now, self._location, self._options)
+            nightfalls = rosh_chodesh_nightfalls(now, self._location, self._options)
         except Exception as e:
             _LOGGER.error("Molad update failed: %s", e)
             self._attr_native_value = None
             return
 
-        m = details.molad
-        h, mi = m.hours, m.minutes
-        tod = TIME_OF_DAY[m.am_or_pm](h)
-        chal = m.chalakim
-        chal_txt = "חלק" if chal == 1 else "חלקים"
-        hh12 = h % 12 or 12
-
-        tz = ZoneInfo(self.hass.config.time_zone)
-        now_local = now.astimezone(tz) if now else datetime.now(tz)
-        loc = LocationInfo(
-            latitude=self.hass.config.latitude,
-            longitude=self.hass.config.longitude,
-            timezone=self.hass.config.time_zone,
-        )
-
-        # Determine if it's Motzaei Shabbos
-        motzei = False
-        if m.day == "Shabbos":
-            sd = sun(loc.observer, date=now_local.date(), tzinfo=tz)
-            motzei_start = sd["sunset"] + timedelta(minutes=self._havdalah_offset)
-            next_mid = (now_local.replace(hour=0, minute=0) + timedelta(days=1)).replace(tzinfo=tz)
-            motzei = motzei_start <= now_local < next_mid
-
-        if motzei:
-            day_yd = 'מוצש"ק'
-            state = f"מולד {day_yd}, {mi} מינוט און {chal} {chal_txt} נאך {hh12}"
-        else:
-            day_yd = DAY_MAPPING.get(m.day, m.day)
-            state = f"מולד {day_yd} {tod}, {mi} מינוט און {chal} {chal_txt} נאך {hh12}"
-
         self._attr_native_value = state
-
-        # Rosh Chodesh attributes
-        rc = details.rosh_chodesh
-        rc_mid = [f"{gd.isoformat()}T00:00:00Z" for gd in rc.gdays]
-        rc_night = []
-        for gd in rc.gdays:
-            prev = gd - timedelta(days=1)
-            sd = sun(loc.observer, date=prev, tzinfo=tz)
-            rc_night.append((sd["sunset"] + timedelta(minutes=self._havdalah_offset)).isoformat())
-
-        rc_days = [DAY_MAPPING.get(d, d) for d in rc.days]
-        rc_text = rc_days[0] if len(rc_days) == 1 else " & ".join(rc_days)
-
-        self._attr_extra_state_attributes = {
-            "day": day_yd,
-            "hours": h,
-            "minutes": mi,
-            "time_of_day": tod,
-            "chalakim": chal,
-            "friendly": state,
-            "rosh_chodesh_midnight": rc_mid,
-            "rosh_chodesh_nightfall": rc_night,
-            "rosh_chodesh": rc_text,
-            "rosh_chodesh_days": rc_days,
-            "is_shabbos_mevorchim": details.is_shabbos_mevorchim,
-            "is_upcoming_shabbos_mevorchim": details.is_upcoming_shabbos_mevorchim,
-            "month_name": MONTH_MAPPING.get(rc.month, rc.month),
-        }
+        self._attr_extra_state_attributes = attrs
+        self._model.async_set(MOLAD, MoladState(state, attrs["month_name"], tuple(nightfalls)))
 
     def update(self) -> None:
         self.hass.async_create_task(self.async_update())
@@ -203,78 +222,58 @@ class MoladYiddishSensor(SensorEntity):
         return "mdi:calendar-star"
 
 
-class YiddishDayLabelSensor(SensorEntity):
+class YiddishDayLabelSensor(RestoreEntity, SensorEntity):
     """Sensor for standalone Yiddish day label."""
 
     _attr_name = "Yiddish Day Label"
     _attr_unique_id = "yiddish_day_label"
+    _attr_should_poll = False
 
     def __init__(
         self,
         hass: HomeAssistant,
         candle_offset: int,
         havdalah_offset: int,
+        profile: Profile,
+        model: EntryModel,
     ) -> None:
         super().__init__()
         self.hass = hass
-        self._candle = candle_offset
-        self._havdalah = havdalah_offset
+        self._model = model
+        self._options = Options(candle_offset, havdalah_offset)
+        self._location = location_from_hass(hass)
         self._state: str | None = None
-        async_track_time_interval(hass, self.async_update, timedelta(hours=1))
+        self._refresh_interval = profile.hourly_interval
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(async_track_refresh(self.hass, self, self._refresh_interval))
+        last = await self.async_get_last_state()
+        if last and last.state not in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+            self._state = last.state
 
     @property
     def native_value(self) -> str | None:
         return self._state
 
+    async def async_apply_options(self, options: Options) -> bool:
+        old, self._options = self._options, self._options.with_offsets(options)
+        return self._options != old
+
     async def async_update(self, now=None) -> None:
-        tz = ZoneInfo(self.hass.config.time_zone)
-        loc = LocationInfo(
-            latitude=self.hass.config.latitude,
-            longitude=self.hass.config.longitude,
-            timezone=self.hass.config.time_zone,
-        )
-        current = datetime.now(tz)
-        s = sun(loc.observer, date=current.date(), tzinfo=tz)
-        candle = s["sunset"] - timedelta(minutes=self._candle)
-        havdalah = s["sunset"] + timedelta(minutes=self._havdalah)
-
-        # Hebrew date
-        g = pdates.GregorianDate(current.year, current.month, current.day)
-        hdate = g.to_heb()
-        if current >= s["sunset"]:
-            hdate = PHebrewDate(hdate.year, hdate.month, hdate.day) + 1
-
-        # Holiday
-        is_tov = bool(hdate.festival(israel=False, include_working_days=False))
-
-        # Shabbos
-        wd = current.weekday()
-        is_shab = (wd == 4 and current >= candle) or (wd == 5 and current < havdalah)
-
-        if is_shab:
-            lbl = "שבת קודש"
-        elif is_tov:
-            lbl = "יום טוב"
-        elif wd == 4 and current.hour >= 12:
-            lbl = 'ערש\"ק'
-        elif wd == 5 and current >= havdalah:
-            lbl = 'מוצש\"ק'
-        else:
-            days = ["זונטאג","מאנטאג","דינסטאג","מיטוואך","דאנערשטאג","פרייטאג","שבת"]
-            idx = {6:0,0:1,1:2,2:3,3:4,4:5,5:6}[wd]
-            lbl = days[idx]
-
-        self._state = lbl
+        self._state = day_label(dt_util.now(), self._location, self._options)
+        self._model.async_set(DAY_LABEL, self._state)
 
     def update(self) -> None:
         self.hass.async_create_task(self.async_update())
 
 
 
-class ShabbosMevorchimSensor(BinarySensorEntity):
+class ShabbosMevorchimSensor(RestoreEntity, BinarySensorEntity):
     _attr_name = "Shabbos Mevorchim Yiddish"
     _attr_unique_id = "shabbos_mevorchim_yiddish"
     _attr_entity_id = "binary_sensor.shabbos_mevorchim_yiddish"
+    _attr_should_poll = False
 
     def __init__(
         self,
@@ -282,39 +281,36 @@ class ShabbosMevorchimSensor(BinarySensorEntity):
         helper: MoladHelper,
         candle_offset: int,
         havdalah_offset: int,
+        profile: Profile,
     ) -> None:
         super().__init__()
         self.hass = hass
         self.helper = helper
-        self._candle_offset = candle_offset
-        self._havdalah_offset = havdalah_offset        
+        self._options = Options(candle_offset, havdalah_offset)
+        self._location = location_from_hass(hass)
         self._attr_is_on = False
-        async_track_time_interval(hass, self.async_update, timedelta(hours=1))
+        self._refresh_interval = profile.hourly_interval
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(async_track_refresh(self.hass, self, self._refresh_interval))
+        last = await self.async_get_last_state()
+        if last:
+            self._attr_is_on = last.state == STATE_ON
+
+    async def async_apply_options(self, options: Options) -> bool:
+        old, self._options = self._options, self._options.with_offsets(options)
+        return self._options != old
 
     async def async_update(self, now=None) -> None:
         try:
-            # build your location & timezone
-            tz = ZoneInfo(self.hass.config.time_zone)
-            loc = LocationInfo(
-                latitude=self.hass.config.latitude,
-                longitude=self.hass.config.longitude,
-                timezone=self.hass.config.time_zone,
+            self._attr_is_on = in_mevorchim_window(
+                dt_util.now(), self._location, self._options
             )
-            s = sun(loc.observer, date=date.today(), tzinfo=tz)
-
-            # compute on/off times
-            on_time = s["sunset"] + timedelta(minutes=self._candle_offset)
-            off_time = s["sunset"] + timedelta(minutes=self._havdalah_offset)
-
-            # compare to now
-            now_local = datetime.now(tz)
-            self._attr_is_on = (on_time <= now_local < off_time)
-
         except Exception as e:
             _LOGGER.error("Shabbos Mevorchim failed: %s", e)
             self._attr_is_on = False
 
-
     def update(self) -> None:
         self.hass.async_create_task(self.async_update())
 
@@ -323,17 +319,25 @@ class ShabbosMevorchimSensor(BinarySensorEntity):
         return "mdi:star-outline"
 
 
-class UpcomingShabbosMevorchimSensor(BinarySensorEntity):
+class UpcomingShabbosMevorchimSensor(RestoreEntity, BinarySensorEntity):
     _attr_name = "Upcoming Shabbos Mevorchim Yiddish"
     _attr_unique_id = "upcoming_shabbos_mevorchim_yiddish"
     _attr_entity_id = "binary_sensor.upcoming_shabbos_mevorchim_yiddish"
+    _attr_should_poll = False
 
-    def __init__(self, hass: HomeAssistant, helper: MoladHelper) -> None:
+    def __init__(self, hass: HomeAssistant, helper: MoladHelper, profile: Profile) -> None:
         super().__init__()
         self.hass = hass
         self.helper = helper
         self._attr_is_on = False
-        async_track_time_interval(hass, self.async_update, timedelta(hours=1))
+        self._refresh_interval = profile.hourly_interval
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(async_track_refresh(self.hass, self, self._refresh_interval))
+        last = await self.async_get_last_state()
+        if last:
+            self._attr_is_on = last.state == STATE_ON
 
     async def async_update(self, now=None) -> None:
         try:
@@ -351,19 +355,32 @@ class UpcomingShabbosMevorchimSensor(BinarySensorEntity):
 
 
 
-class RoshChodeshTodaySensor(SensorEntity):
+class RoshChodeshTodaySensor(RestoreEntity, SensorEntity):
     """True during each day of Rosh Chodesh; shows א׳/ב׳ when there are two days."""
 
     _attr_name = "Rosh Chodesh Today Yiddish"
     _attr_unique_id = "rosh_chodesh_today_yiddish"
     _attr_icon = "mdi:calendar-star"
+    _attr_should_poll = False
+
+    NOT_ROSH_CHODESH = "Not Rosh Chodesh Today"
 
-    def __init__(self, hass: HomeAssistant, helper: MoladHelper, havdalah_offset: int) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        helper: MoladHelper,
+        havdalah_offset: int,
+        profile: Profile,
+        model: EntryModel,
+    ) -> None:
         super().__init__()
         self.hass = hass
         self.helper = helper
+        self._model = model
         self._havdalah_offset = havdalah_offset
+        self._profile = profile
         self._attr_native_value = None
+        self._unsub_sunset = None
 
     # ──────────────────────────────
     # Set up listeners
@@ -371,78 +388,65 @@ class RoshChodeshTodaySensor(SensorEntity):
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
 
-        # Immediate update
-        await self.async_update()
+        # Restore the last state; the first computation runs once HA has started
+        last = await self.async_get_last_state()
+        if last and last.state not in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+            self._attr_native_value = last.state
 
-        # Hourly refresh (runs on the event loop, so safe)
-        async_track_time_interval(
-            self.hass,
-            lambda now: self.hass.async_create_task(self.async_update()),
-            timedelta(hours=1),
+        # Periodic refresh at the profile's hourly interval
+        self.async_on_remove(
+            async_track_refresh(self.hass, self, self._profile.hourly_interval)
         )
 
-        # Anytime the main molad sensor changes — use the thread-safe scheduler
-        async_track_state_change_event(
-            self.hass,
-            "sensor.molad_yiddish",
-            lambda _event: self.schedule_update_ha_state(),
-        )
+        # Recompute as soon as the molad sensor publishes new Rosh Chodesh days
+        self.async_on_remove(self._model.async_subscribe([MOLAD], self._handle_molad))
+
+        # Sunset + havdalah offset
+        self._track_sunset()
+        self.async_on_remove(lambda: self._unsub_sunset())
 
-        # Sunset + havdalah offset (also safe via create_task)
-        async_track_sunset(
+    @callback
+    def _track_sunset(self) -> None:
+        self._unsub_sunset = async_track_sunset(
             self.hass,
-            lambda now: self.hass.async_create_task(self.async_update()),
+            lambda now: self.async_schedule_update_ha_state(True),
             offset=timedelta(minutes=self._havdalah_offset),
         )
 
+    async def async_apply_options(self, options: Options) -> bool:
+        # the label follows the molad's nightfalls; only the sunset trigger moves
+        if options.havdalah_offset != self._havdalah_offset:
+            self._havdalah_offset = options.havdalah_offset
+            self._unsub_sunset()
+            self._track_sunset()
+        return False
+
+    @callback
+    def _handle_molad(self) -> None:
+        self._compute(dt_util.now())
+        async_write_batched(self)
+
     # ──────────────────────────────
     # Core calculation
     # ──────────────────────────────
-    async def async_update(self, _now: datetime | None = None) -> None:
-        """Compute whether *now* is inside any Rosh-Chodesh interval."""
-        tz = ZoneInfo(self.hass.config.time_zone)
-        now = _now or datetime.now(tz)
-
-        main = self.hass.states.get("sensor.molad_yiddish")
-        attr = main.attributes if main else {}
-        nf_list = attr.get("rosh_chodesh_nightfall") or []
-        month = attr.get("month_name", "")
-
-        # Convert strings → datetime
-        nf_datetimes: list[datetime] = [
-            dt if isinstance(dt, datetime) else datetime.fromisoformat(dt)
-            for dt in nf_list
-        ]
-
-        # Find which Rosh Chodesh period (if any) is active
-        active_index: int | None = None
-        for i, start in enumerate(nf_datetimes):
-            end = (
-                nf_datetimes[i + 1]
-                if i + 1 < len(nf_datetimes)
-                else start + timedelta(days=1)
-            )
-            if start <= now < end:
-                active_index = i
-                break
-
-        # Build the display string
-        if active_index is not None:
-            if len(nf_datetimes) == 1:
-                val = f"ראש חודש {month}"
-            else:
-                prefix = ("א", "ב")[active_index] + "׳"
-                val = f"{prefix} ד׳ראש חודש {month}"
-        else:
-            val = "Not Rosh Chodesh Today"
-
+    @callback
+    def _compute(self, now: datetime) -> None:
+        """Whether *now* is inside any Rosh-Chodesh interval; publishes the label."""
+        molad: MoladState | None = self._model.get(MOLAD)
+        if molad is None:
+            return
+        val = rosh_chodesh_label(now, list(molad.rosh_chodesh_nightfalls), molad.month_name)
         self._attr_native_value = val
+        self._model.async_set(
+            ROSH_CHODESH_TODAY, None if val == self.NOT_ROSH_CHODESH else val
+        )
+
+    async def async_update(self, _now: datetime | None = None) -> None:
+        self._compute(_now or dt_util.now())
 
     # ──────────────────────────────
     # Availability
     # ──────────────────────────────
     @property
     def available(self) -> bool:
-        main = self.hass.states.get("sensor.molad_yiddish")
-        return bool(main and main.attributes.get("rosh_chodesh_nightfall"))
-
+        return self._model.has(MOLAD) or self._attr_native_value is not None
@@ -5,9 +5,12 @@ from datetime import timedelta
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.components.sensor import SensorEntity
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.restore_state import RestoreEntity
 
+from .molad_lib.options import Options
 from .molad_lib.sfirah_helper import SfirahHelper
 from .const import DOMAIN
 
@@ -40,7 +43,7 @@ def async_setup_entry(
     )
 
 
-class BaseSefirahSensor(SensorEntity):
+class BaseSefirahSensor(RestoreEntity, SensorEntity):
     """Base class for Sefirah (Omer) sensors."""
 
     def __init__(
@@ -80,6 +83,16 @@ class BaseSefirahSensor(SensorEntity):
             text = ''.join(ch for ch in text if unicodedata.category(ch)[0] != 'M')
         self._state = text
 
+    async def async_apply_options(self, options: Options) -> bool:
+        """Take the new nikud setting and havdalah offset; True if either changed."""
+        changed = (options.strip_nikud, options.havdalah_offset) != (
+            self._strip, self._havdalah_offset
+        )
+        self._strip = options.strip_nikud
+        self._havdalah_offset = options.havdalah_offset
+        self._helper.set_havdalah_offset(options.havdalah_offset)
+        return changed
+
     @callback
     def _schedule_after_sunset(self) -> None:
         """Schedule an update havdalah_offset minutes after sunset."""
@@ -91,8 +104,11 @@ class BaseSefirahSensor(SensorEntity):
 
     async def async_added_to_hass(self) -> None:
         """Register for sunset event when added to Home Assistant."""
-        # Trigger initial load
-        self.async_schedule_update_ha_state()
+        # Restore the last state; the first computation runs once HA has started
+        await super().async_added_to_hass()
+        last = await self.async_get_last_state()
+        if last and last.state not in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+            self._state = last.state
 
         def _on_sunset(event):
             self._schedule_after_sunset()
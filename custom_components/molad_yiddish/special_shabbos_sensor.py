@@ -1,28 +1,38 @@
 #custom_components/molad_yiddish/special_shabbos_sensor.py
 from homeassistant.components.sensor import SensorEntity
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.helpers.restore_state import RestoreEntity
+from .model import SPECIAL_SHABBOS, EntryModel
 from .molad_lib import specials
 
 async def async_setup_platform(hass, config, add_entities, discovery_info=None):
     """Set up the Special Shabbos Yiddish sensor."""
-    add_entities([SpecialShabbosSensor()], update_before_add=True)
+    add_entities([SpecialShabbosSensor(EntryModel())], update_before_add=True)
 
-class SpecialShabbosSensor(SensorEntity):
+class SpecialShabbosSensor(RestoreEntity, SensorEntity):
     """Sensor that provides the upcoming special Shabbatot (Yiddish integration)."""
 
     _attr_icon = "mdi:calendar-star"  # icon for a special event
     _attr_has_entity_name = True
 
-    def __init__(self):
+    def __init__(self, model: EntryModel):
+        self._model = model
         self._attr_name = "Special Shabbos Yiddish"
         self._attr_unique_id = "molad_yiddish_special_shabbos"
         self._state = None
 
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        last = await self.async_get_last_state()
+        if last and last.state not in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+            self._state = last.state
+
     @property
     def state(self):
         """Return the state of the sensor (Hebrew string of special Shabbatot)."""
         return self._state
 
-    def update(self):
+    async def async_update(self):
         """Update the sensor state by computing the upcoming Shabbat specials."""
         try:
             # Call the rule engine to get the special Shabbat name (or empty string)
@@ -30,3 +40,4 @@ class SpecialShabbosSensor(SensorEntity):
         except Exception as e:
             # In case of any calculation errors, set state to empty
             self._state = ""
+        self._model.async_set(SPECIAL_SHABBOS, self._state)
@@ -0,0 +1,131 @@
+# custom_components/molad_yiddish/templates.py
+"""
+Jinja globals and filters for Hebrew dates.
+
+    {{ hebrew_date(now()) }}          {{ now() | hebrew_date }}
+    {{ is_yom_tov('2025-04-13') }}    {{ parsha(now()) }}
+    {{ omer_day(now()) }}             {{ molad(5786, 7) }}
+
+Each takes a date, a datetime (its local date) or an ISO string and is
+answered from molad_lib.lookup, so a dashboard rendering them on every state
+change costs a cache lookup per call.
+
+Home Assistant has no API for adding template functions, so the functions
+are added to the environments already created and to every one created
+later, by wrapping TemplateEnvironment.__init__; the returned callback
+undoes both (leaving the wrapper idle if another one was added on top).
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+import datetime
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import template as template_helper
+from homeassistant.util import dt as dt_util
+
+from .molad_lib import lookup
+
+# hass.data keys of the cached environments (full, limited, strict)
+_ENVIRONMENT_KEYS = (
+    "template.environment",
+    "template.environment_limited",
+    "template.environment_strict",
+)
+
+
+def _as_date(value: Any) -> datetime.date:
+    """The local date of a date, datetime or ISO string."""
+    if isinstance(value, datetime.datetime):
+        return dt_util.as_local(value).date() if value.tzinfo else value.date()
+    if isinstance(value, datetime.date):
+        return value
+    parsed = dt_util.parse_datetime(str(value))
+    if parsed is not None:
+        return _as_date(parsed)
+    parsed_date = dt_util.parse_date(str(value))
+    if parsed_date is None:
+        raise ValueError(f"Not a date: {value!r}")
+    return parsed_date
+
+
+def _on_date(func: Callable[[datetime.date], Any]) -> Callable[[Any], Any]:
+    def _wrapper(value: Any = None) -> Any:
+        return func(dt_util.now().date() if value is None else _as_date(value))
+
+    return _wrapper
+
+
+def _molad(year: Any, month: Any) -> str:
+    return lookup.molad(int(year), int(month))
+
+
+# name → function; the one-argument ones are filters as well
+TEMPLATE_GLOBALS: dict[str, Callable[..., Any]] = {
+    "hebrew_date": _on_date(lookup.hebrew_date_text),
+    "is_yom_tov": _on_date(lookup.is_yom_tov),
+    "parsha": _on_date(lookup.parsha),
+    "omer_day": _on_date(lookup.omer_day),
+    "molad": _molad,
+}
+TEMPLATE_FILTERS = ("hebrew_date", "is_yom_tov", "parsha", "omer_day")
+
+
+# Whether new environments get the functions.  The __init__ wrapper can
+# outlive an unload when another integration wrapped it afterwards; it then
+# stays in place, idle, and is reused by the next setup.
+_active = False
+_wrapped_init: Callable[..., None] | None = None
+
+
+def _install(env: Any) -> None:
+    if not _active:
+        return
+    for name, func in TEMPLATE_GLOBALS.items():
+        env.globals[name] = func
+        if name in TEMPLATE_FILTERS:
+            env.filters[name] = func
+
+
+def _uninstall(env: Any) -> None:
+    for name, func in TEMPLATE_GLOBALS.items():
+        if env.globals.get(name) is func:
+            del env.globals[name]
+        if env.filters.get(name) is func:
+            del env.filters[name]
+
+
+@callback
+def async_setup_templates(hass: HomeAssistant) -> CALLBACK_TYPE:
+    """Add the template functions; returns the callback that removes them."""
+    global _active, _wrapped_init
+    environment = template_helper.TemplateEnvironment
+    _active = True
+    if _wrapped_init is None:
+        original_init = environment.__init__
+
+        def _init(self, *args: Any, **kwargs: Any) -> None:
+            original_init(self, *args, **kwargs)
+            _install(self)
+
+        _init.original_init = original_init
+        environment.__init__ = _wrapped_init = _init
+    for key in _ENVIRONMENT_KEYS:
+        if (env := hass.data.get(key)) is not None:
+            _install(env)
+
+    @callback
+    def _remove() -> None:
+        global _active, _wrapped_init
+        _active = False
+        # only unwrap while ours is the outermost wrapper: restoring under
+        # another integration's wrapper would silently drop it
+        if environment.__init__ is _wrapped_init:
+            environment.__init__ = _wrapped_init.original_init
+            _wrapped_init = None
+        for key in _ENVIRONMENT_KEYS:
+            if (env := hass.data.get(key)) is not None:
+                _uninstall(env)
+
+    return _remove
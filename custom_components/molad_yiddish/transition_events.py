@@ -0,0 +1,93 @@
+# custom_components/molad_yiddish/transition_events.py
+"""
+molad_yiddish_transition events on the bus at alos, chatzos,
+candle-lighting, havdalah, the start of Rosh Chodesh and each Omer
+nightfall.
+
+TransitionEvents keeps a TransitionSchedule (rebuilt in the executor when
+fewer than _REBUILD_MARGIN remain before its horizon) and arms a single
+point-in-time timer for the next instant.  When it fires, every transition
+since the last one fired is sent, so a late timer drops nothing, and an
+event trigger runs at the exact instant without watching any entity.
+"""
+from __future__ import annotations
+
+import datetime
+from datetime import timedelta
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+from .const import EVENT_TRANSITION
+from .molad_lib.events import TransitionSchedule, build_transitions
+from .molad_lib.options import Options
+from .zmanim_sensor import location_from_hass
+
+_LOGGER = logging.getLogger(__name__)
+
+# Rebuild the schedule once fewer than this many days remain before its horizon
+_REBUILD_MARGIN = timedelta(days=3)
+
+
+class TransitionEvents:
+    """Owns the transition schedule and the one timer firing its events."""
+
+    def __init__(self, hass: HomeAssistant, candle_offset: int, havdalah_offset: int) -> None:
+        self.hass = hass
+        self._location = location_from_hass(hass)
+        self._options = Options(candle_offset, havdalah_offset)
+        self._schedule: TransitionSchedule | None = None
+        self._fired_until: datetime.datetime | None = None
+        self._unsub_timer = None
+
+    async def async_start(self) -> None:
+        # nothing before now is fired
+        self._fired_until = dt_util.now()
+        await self._async_rebuild(self._fired_until)
+        self._arm()
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    async def async_apply_options(self, options: Options) -> bool:
+        """Rebuild the schedule under the new offsets and re-arm from now."""
+        old, self._options = self._options, self._options.with_offsets(options)
+        if self._options == old or self._schedule is None:
+            # unchanged, or not started yet
+            return False
+        self.async_stop()
+        await self.async_start()
+        return True
+
+    async def _async_rebuild(self, now: datetime.datetime) -> None:
+        self._schedule = await self.hass.async_add_executor_job(
+            build_transitions,
+            now.astimezone(self._location.tz).date(),
+            self._location,
+            self._options,
+        )
+
+    @callback
+    def _arm(self) -> None:
+        when = self._schedule.next_time(self._fired_until)
+        if when is None:
+            # nothing left before the horizon: rebuild there
+            when = self._schedule.horizon - _REBUILD_MARGIN
+            if when <= self._fired_until:
+                _LOGGER.warning("No upcoming transitions in the schedule")
+                return
+        self._unsub_timer = async_track_point_in_time(self.hass, self._handle_timer, when)
+
+    async def _handle_timer(self, now: datetime.datetime) -> None:
+        self._unsub_timer = None
+        for transition in self._schedule.between(self._fired_until, now):
+            self.hass.bus.async_fire(EVENT_TRANSITION, transition.as_event())
+        self._fired_until = now
+        if now + _REBUILD_MARGIN >= self._schedule.horizon:
+            await self._async_rebuild(now)
+        self._arm()
@@ -0,0 +1,156 @@
+# custom_components/molad_yiddish/transition_sensor.py
+"""
+Timestamp sensors for the next candle-lighting, havdalah, Erev window and
+Yom Tov start.
+
+UpcomingTransitions keeps a forward-looking Schedule and arms a single
+point-in-time timer for the soonest event; when it fires, only the sensors
+whose next event changed are written, so nothing polls.  Until the schedule
+is first built (after Home Assistant has started) the sensors show their
+restored values.
+"""
+from __future__ import annotations
+
+import datetime
+from datetime import timedelta
+import logging
+
+from homeassistant.components.sensor import RestoreSensor, SensorDeviceClass
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+from .molad_lib.options import Options
+from .molad_lib.schedule import (
+    CANDLE_LIGHTING,
+    EREV_START,
+    HAVDALAH,
+    YOM_TOV_START,
+    Schedule,
+    build_schedule,
+)
+from .zmanim_sensor import location_from_hass
+
+_LOGGER = logging.getLogger(__name__)
+
+# event kind → (entity name, icon)
+TRANSITION_SENSORS: dict[str, tuple[str, str]] = {
+    CANDLE_LIGHTING: ("Next Candle Lighting", "mdi:candle"),
+    HAVDALAH:        ("Next Havdalah",        "mdi:weather-night"),
+    EREV_START:      ("Next Erev Window",     "mdi:weather-sunset-up"),
+    YOM_TOV_START:   ("Next Yom Tov",         "mdi:calendar-star"),
+}
+
+# Rebuild the schedule once fewer than this many days remain before its horizon
+_REBUILD_MARGIN = timedelta(days=14)
+
+
+class UpcomingTransitions:
+    """Owns the schedule and the single timer driving the transition sensors."""
+
+    def __init__(self, hass: HomeAssistant, candle_offset: int, havdalah_offset: int) -> None:
+        self.hass = hass
+        self._location = location_from_hass(hass)
+        self._candle = candle_offset
+        self._havdalah = havdalah_offset
+        self._schedule: Schedule | None = None
+        self._entities: dict[str, NextTransitionSensor] = {}
+        self._unsub_timer = None
+        self.values: dict[str, datetime.datetime | None] = {}
+        self.ready = False
+
+    def register(self, entity: NextTransitionSensor) -> None:
+        self._entities[entity.kind] = entity
+
+    async def async_start(self) -> None:
+        await self._async_rebuild(dt_util.now())
+        self.ready = True
+        self._arm()
+        for entity in self._entities.values():
+            if entity.hass is not None:
+                entity.async_write_ha_state()
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    async def async_apply_options(self, options: Options) -> bool:
+        """Rebuild the schedule under the new offsets and re-arm."""
+        offsets = (options.candle_offset, options.havdalah_offset)
+        if offsets == (self._candle, self._havdalah):
+            return False
+        self._candle, self._havdalah = offsets
+        if self.ready:
+            self.async_stop()
+            await self.async_start()
+        return True
+
+    async def _async_rebuild(self, now: datetime.datetime) -> None:
+        self._schedule = await self.hass.async_add_executor_job(
+            build_schedule,
+            now.astimezone(self._location.tz).date(),
+            self._location,
+            self._candle,
+            self._havdalah,
+        )
+        self.values = {kind: self._schedule.next(kind, now) for kind in TRANSITION_SENSORS}
+
+    @callback
+    def _arm(self) -> None:
+        soonest = self._schedule.next_any(dt_util.now()) if self._schedule else None
+        if soonest is None:
+            _LOGGER.warning("No upcoming transitions in the schedule")
+            return
+        self._unsub_timer = async_track_point_in_time(self.hass, self._handle_event, soonest)
+
+    async def _handle_event(self, now: datetime.datetime) -> None:
+        self._unsub_timer = None
+        if now.date() + _REBUILD_MARGIN >= self._schedule.horizon:
+            old = self.values
+            await self._async_rebuild(now)
+            changed = {k for k in self.values if self.values[k] != old.get(k)}
+        else:
+            changed = set()
+            for kind in TRANSITION_SENSORS:
+                value = self._schedule.next(kind, now)
+                if value != self.values.get(kind):
+                    self.values[kind] = value
+                    changed.add(kind)
+
+        for kind in changed:
+            entity = self._entities.get(kind)
+            if entity is not None and entity.hass is not None:
+                entity.async_write_ha_state()
+        self._arm()
+
+
+class NextTransitionSensor(RestoreSensor):
+    """The next instant of one kind of Shabbos / Yom Tov transition."""
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_should_poll = False
+
+    def __init__(self, transitions: UpcomingTransitions, kind: str) -> None:
+        super().__init__()
+        self._transitions = transitions
+        self.kind = kind
+        name, icon = TRANSITION_SENSORS[kind]
+        self._attr_name = name
+        self._attr_icon = icon
+        self._attr_unique_id = f"molad_yiddish_next_{kind}"
+        self._restored: datetime.datetime | None = None
+        transitions.register(self)
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        last = await self.async_get_last_sensor_data()
+        if last:
+            self._restored = last.native_value
+
+    @property
+    def native_value(self) -> datetime.datetime | None:
+        if not self._transitions.ready:
+            return self._restored
+        return self._transitions.values.get(self.kind)
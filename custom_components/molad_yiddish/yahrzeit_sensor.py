@@ -0,0 +1,182 @@
+# custom_components/molad_yiddish/yahrzeit_sensor.py
+"""
+Yahrzeits, Hebrew birthdays and bar / bas mitzvahs entered by the user.
+
+YahrzeitTracker keeps the list in .storage and a sorted index of every
+entry's next occurrences, rebuilt (in the executor) only when the list
+changes or a new Hebrew year begins.  The "this week" sensor and the
+next_yahrzeit service are bisects into that index, so thousands of
+entries cost nothing per update.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+import datetime
+from datetime import timedelta
+import logging
+from typing import Any
+
+from homeassistant.components.sensor import SensorEntity
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .molad_lib.convert import hebrew_date
+from .molad_lib.helper import int_to_hebrew
+from .molad_lib.yahrzeit import Anniversary, AnniversaryIndex, build_index
+from .molad_lib.yiddish import hebrew_month_name
+from .refresh import restored_attributes
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}_yahrzeits"
+
+# Days shown by the "this week" sensor, today included
+UPCOMING_DAYS = 7
+
+# Seconds to coalesce several additions into one write
+_SAVE_DELAY = 10
+
+
+def occurrence_dict(day: datetime.date, anniversary: Anniversary) -> dict[str, Any]:
+    """One occurrence as plain values (sensor attributes, service responses)."""
+    hd = hebrew_date(day)
+    return {
+        "name": anniversary.name,
+        "kind": anniversary.kind,
+        "date": day.isoformat(),
+        "hebrew_date": f"{int_to_hebrew(hd.day)} {hebrew_month_name(hd.month, hd.year)}",
+        "years": hd.year - anniversary.year,
+    }
+
+
+class YahrzeitTracker:
+    """The stored anniversaries and the index of their next occurrences."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._store: Store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._anniversaries: list[Anniversary] = []
+        self._index: AnniversaryIndex | None = None
+        self._listeners: list[Callable[[], None]] = []
+
+    @property
+    def anniversaries(self) -> list[Anniversary]:
+        return list(self._anniversaries)
+
+    async def async_load(self) -> None:
+        data = await self._store.async_load() or {}
+        self._anniversaries = [Anniversary(**raw) for raw in data.get("anniversaries", [])]
+        await self._async_rebuild(dt_util.now().date())
+
+    async def _async_rebuild(self, today: datetime.date) -> None:
+        self._index = await self.hass.async_add_executor_job(
+            build_index, list(self._anniversaries), today
+        )
+        for notify in list(self._listeners):
+            notify()
+
+    async def async_index(self, today: datetime.date) -> AnniversaryIndex:
+        """The index, rebuilt first when *today* is in a new Hebrew year."""
+        if self._index is None or self._index.year != hebrew_date(today).year:
+            await self._async_rebuild(today)
+        return self._index
+
+    async def async_next(
+        self, day: datetime.date, count: int
+    ) -> list[tuple[datetime.date, Anniversary]]:
+        """The first *count* occurrences on or after *day*."""
+        today = dt_util.now().date()
+        if hebrew_date(day).year == hebrew_date(today).year:
+            index = await self.async_index(today)
+        else:
+            # another year: answer from a throwaway index, keep this year's
+            index = await self.hass.async_add_executor_job(
+                build_index, list(self._anniversaries), day
+            )
+        return index.next(day, count)
+
+    @callback
+    def _async_save(self) -> None:
+        self._store.async_delay_save(
+            lambda: {"anniversaries": [a._asdict() for a in self._anniversaries]},
+            _SAVE_DELAY,
+        )
+
+    async def async_add(self, anniversary: Anniversary) -> None:
+        self._anniversaries.append(anniversary)
+        self._async_save()
+        await self._async_rebuild(dt_util.now().date())
+
+    async def async_remove(self, name: str) -> int:
+        """Remove every anniversary called *name*; returns how many were removed."""
+        kept = [a for a in self._anniversaries if a.name != name]
+        removed = len(self._anniversaries) - len(kept)
+        if removed:
+            self._anniversaries = kept
+            self._async_save()
+            await self._async_rebuild(dt_util.now().date())
+        return removed
+
+    @callback
+    def async_subscribe(self, notify: Callable[[], None]) -> CALLBACK_TYPE:
+        """Call *notify* whenever the index is rebuilt; returns the unsubscribe."""
+        self._listeners.append(notify)
+
+        @callback
+        def _unsubscribe() -> None:
+            self._listeners.remove(notify)
+
+        return _unsubscribe
+
+
+class UpcomingYahrzeitsSensor(RestoreEntity, SensorEntity):
+    """How many anniversaries fall in the coming week, listed in the attributes."""
+
+    _attr_name = "Molad Yiddish Yahrzeits This Week"
+    _attr_unique_id = "molad_yiddish_yahrzeits_this_week"
+    _attr_icon = "mdi:candle"
+    _attr_should_poll = False
+
+    def __init__(self, tracker: YahrzeitTracker) -> None:
+        super().__init__()
+        self._tracker = tracker
+        self._attr_native_value = None
+        self._attr_extra_state_attributes = {}
+
+    async def async_added_to_hass(self) -> None:
+        # restore the last state; the first computation runs once HA has started
+        await super().async_added_to_hass()
+        last = await self.async_get_last_state()
+        if last and last.state not in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+            self._attr_native_value = int(last.state)
+            self._attr_extra_state_attributes = restored_attributes(last)
+        self.async_on_remove(self._tracker.async_subscribe(self._handle_rebuild))
+        self.async_on_remove(
+            async_track_time_change(
+                self.hass, self._handle_midnight, hour=0, minute=0, second=10
+            )
+        )
+
+    @callback
+    def _handle_rebuild(self) -> None:
+        self.hass.async_create_task(self._update_state())
+
+    async def _handle_midnight(self, now: datetime.datetime) -> None:
+        await self._update_state()
+
+    async def _update_state(self) -> None:
+        today = dt_util.now().date()
+        index = await self._tracker.async_index(today)
+        week = index.between(today, today + timedelta(days=UPCOMING_DAYS - 1))
+        self._attr_native_value = len(week)
+        self._attr_extra_state_attributes = {
+            "upcoming": [occurrence_dict(day, a) for day, a in week],
+            "tracked": len(self._tracker.anniversaries),
+        }
+        self.async_write_ha_state()
@@ -1,38 +1,21 @@
 from __future__ import annotations
 import logging
-from datetime import date, datetime, timedelta
-from zoneinfo import ZoneInfo
-
-from astral import LocationInfo
-from astral.sun import sun
+from datetime import timedelta
 
 from homeassistant.const import STATE_UNKNOWN
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.event import async_track_sunset
 from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.util import dt as dt_util
 
-from pyluach.hebrewcal import Year, HebrewDate as PHebrewDate
-from .molad_lib.helper import int_to_hebrew
+from .molad_lib.options import Options
+from .molad_lib.yiddish import yiddish_date
+from .zmanim_sensor import location_from_hass
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def get_hebrew_month_name(month: int, year: int) -> str:
-    """
-    Map Pyluach month-numbers to Hebrew month names, handling leap years.
-    """
-    if month == 12:
-        return "אדר א׳" if Year(year).leap else "אדר"
-    if month == 13:
-        return "אדר ב׳"
-    return {
-        1:  "ניסן", 2:  "אייר", 3:  "סיון", 4:  "תמוז",
-        5:  "אב",   6:  "אלול",7:  "תשרי", 8:  "חשון",
-        9:  "כסלו",10: "טבת",  11: "שבט",
-    }.get(month, "")
-
-
 class YiddishDateSensor(RestoreEntity, SensorEntity):
     """Today’s Hebrew date in Yiddish formatting, flips at sunset+havdalah only."""
 
@@ -45,13 +28,9 @@ class YiddishDateSensor(RestoreEntity, SensorEntity):
         super().__init__()
         self.hass = hass
         self._havdalah_offset = timedelta(minutes=havdalah_offset)
-
-        self._tz = ZoneInfo(hass.config.time_zone)
-        self._loc = LocationInfo(
-            latitude=hass.config.latitude,
-            longitude=hass.config.longitude,
-            timezone=hass.config.time_zone,
-        )
+        self._options = Options(havdalah_offset=havdalah_offset)
+        self._location = location_from_hass(hass)
+        self._unsub_sunset = None
 
         self._state: str | None = None
 
@@ -68,36 +47,32 @@ class YiddishDateSensor(RestoreEntity, SensorEntity):
         if last:
             self._state = last.state
 
-        # 2) immediate first calculation
-        await self._update_state()
+        # 2) schedule daily sunset+offset update
+        self._track_sunset()
+        self.async_on_remove(lambda: self._unsub_sunset())
 
-        # 3) schedule daily sunset+offset update
-        async_track_sunset(
+    def _track_sunset(self) -> None:
+        self._unsub_sunset = async_track_sunset(
             self.hass,
             self._schedule_update,
             offset=self._havdalah_offset,
         )
 
+    async def async_apply_options(self, options: Options) -> bool:
+        """Move the sunset trigger to the new havdalah offset."""
+        if options.havdalah_offset == self._options.havdalah_offset:
+            return False
+        self._options = self._options._replace(havdalah_offset=options.havdalah_offset)
+        self._havdalah_offset = timedelta(minutes=options.havdalah_offset)
+        self._unsub_sunset()
+        self._track_sunset()
+        return True
+
     @property
     def state(self) -> str:
         return self._state or STATE_UNKNOWN
 
     async def _update_state(self) -> None:
         """Recompute Yiddish date based on sunset+offset boundary."""
-        now = datetime.now(self._tz)
-        s = sun(self._loc.observer, date=now.date(), tzinfo=self._tz)
-        switch_time = s["sunset"] + self._havdalah_offset
-
-        py_date = now.date() + timedelta(days=1) if now >= switch_time else now.date()
-
-        heb = PHebrewDate.from_pydate(py_date)
-        day_heb = int_to_hebrew(heb.day)
-        month_heb = get_hebrew_month_name(heb.month, heb.year)
-        year_num = heb.year % 1000
-        year_heb = int_to_hebrew(year_num)
-
-        state = f"{day_heb} {month_heb} {year_heb}"
-        state = state.replace("\u05F4", '"').replace("\u05F3", "'")
-
-        self._state = state
+        self._state = yiddish_date(dt_util.now(), self._location, self._options)
         self.async_write_ha_state()
@@ -0,0 +1,124 @@
+# custom_components/molad_yiddish/zmanim_sensor.py
+"""
+Timestamp sensors for the daily zmanim.
+
+All zmanim of the day are computed in one batch by DailyZmanim, which
+refreshes exactly once after midnight and pushes the new values to every
+zman sensor, so nothing polls.  Until the first computation (after Home
+Assistant has started) the sensors show their restored values.
+"""
+from __future__ import annotations
+
+import datetime
+import logging
+
+from homeassistant.components.sensor import RestoreSensor, SensorDeviceClass
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_change
+
+from .molad_lib.options import Options
+from .molad_lib.zmanim import Location, Zmanim, zmanim_for_day
+
+_LOGGER = logging.getLogger(__name__)
+
+# zman key → (entity name, icon)
+ZMAN_SENSORS: dict[str, tuple[str, str]] = {
+    "alos":               ("Zman Alos Hashachar",       "mdi:weather-sunset-up"),
+    "netz":               ("Zman Netz Hachama",         "mdi:weather-sunny"),
+    "sof_zman_shema_mga": ("Zman Sof Krias Shema MGA",  "mdi:book-open-variant"),
+    "sof_zman_shema_gra": ("Zman Sof Krias Shema GRA",  "mdi:book-open-variant"),
+    "sof_zman_tefillah":  ("Zman Sof Zman Tefillah",    "mdi:hands-pray"),
+    "chatzos":            ("Zman Chatzos",              "mdi:weather-sunny-alert"),
+    "mincha_gedola":      ("Zman Mincha Gedola",        "mdi:clock-outline"),
+    "mincha_ketana":      ("Zman Mincha Ketana",        "mdi:clock-outline"),
+    "plag_hamincha":      ("Zman Plag Hamincha",        "mdi:clock-outline"),
+    "shkia":              ("Zman Shkia",                "mdi:weather-sunset-down"),
+    "tzeis":              ("Zman Tzeis Hakochavim",     "mdi:weather-night"),
+}
+
+
+def location_from_hass(hass: HomeAssistant) -> Location:
+    """Home Assistant's configured location as a molad_lib Location."""
+    return Location(hass.config.latitude, hass.config.longitude, hass.config.time_zone)
+
+
+class DailyZmanim:
+    """Computes today's zmanim once per day and pushes them to its sensors."""
+
+    def __init__(self, hass: HomeAssistant, candle_offset: int, havdalah_offset: int) -> None:
+        self.hass = hass
+        self._location = location_from_hass(hass)
+        self._candle = candle_offset
+        self._havdalah = havdalah_offset
+        self._entities: list[ZmanSensor] = []
+        self.today: Zmanim | None = None
+        self.ready = False
+
+    def _compute(self) -> None:
+        today = datetime.datetime.now(self._location.tz).date()
+        try:
+            self.today = zmanim_for_day(today, self._location, self._candle, self._havdalah)
+        except ValueError as err:
+            # e.g. no sunrise/sunset at polar latitudes
+            _LOGGER.warning("Zmanim unavailable for %s: %s", today, err)
+            self.today = None
+        self.ready = True
+
+    def register(self, entity: ZmanSensor) -> None:
+        self._entities.append(entity)
+
+    async def async_apply_options(self, options: Options) -> bool:
+        """Recompute today's zmanim under the new offsets and push them."""
+        offsets = (options.candle_offset, options.havdalah_offset)
+        if offsets == (self._candle, self._havdalah):
+            return False
+        self._candle, self._havdalah = offsets
+        if self.ready:
+            self.async_refresh()
+        return True
+
+    @callback
+    def async_start(self):
+        """Refresh once just after midnight; returns the unsubscribe callback."""
+        return async_track_time_change(
+            self.hass, self.async_refresh, hour=0, minute=0, second=5
+        )
+
+    @callback
+    def async_refresh(self, now=None) -> None:
+        """Recompute today's zmanim and push them to every registered sensor."""
+        self._compute()
+        for entity in self._entities:
+            if entity.hass is not None:
+                entity.async_write_ha_state()
+
+
+class ZmanSensor(RestoreSensor):
+    """One zman of the day as a timestamp sensor."""
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_should_poll = False
+
+    def __init__(self, daily: DailyZmanim, key: str) -> None:
+        super().__init__()
+        self._daily = daily
+        self._key = key
+        name, icon = ZMAN_SENSORS[key]
+        self._attr_name = name
+        self._attr_icon = icon
+        self._attr_unique_id = f"molad_yiddish_zman_{key}"
+        self._restored: datetime.datetime | None = None
+        daily.register(self)
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        last = await self.async_get_last_sensor_data()
+        if last:
+            self._restored = last.native_value
+
+    @property
+    def native_value(self) -> datetime.datetime | None:
+        if not self._daily.ready:
+            return self._restored
+        today = self._daily.today
+        return getattr(today, self._key) if today else None